@@ -1,5 +1,5 @@
 /*
- * Copyright (c) 2016, Oracle and/or its affiliates. All rights reserved.
+ * Copyright (c) 2016, 2026, Oracle and/or its affiliates. All rights reserved.
  * DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
  *
  * This code is free software; you can redistribute it and/or modify it
@@ -24,24 +24,46 @@
  */
 package com.oracle.mxtool.compilerserver;
 
+import java.io.BufferedInputStream;
+import java.io.BufferedOutputStream;
 import java.io.BufferedReader;
+import java.io.ByteArrayOutputStream;
+import java.io.DataInputStream;
+import java.io.DataOutputStream;
+import java.io.EOFException;
 import java.io.IOException;
 import java.io.InputStreamReader;
 import java.io.OutputStream;
 import java.io.OutputStreamWriter;
 import java.io.PrintStream;
 import java.io.PrintWriter;
+import java.lang.management.ManagementFactory;
 import java.net.InetAddress;
 import java.net.ServerSocket;
 import java.net.Socket;
 import java.net.SocketException;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.Paths;
+import java.nio.file.StandardCopyOption;
+import java.nio.file.attribute.PosixFilePermissions;
+import java.security.MessageDigest;
+import java.security.SecureRandom;
 import java.time.Instant;
+import java.util.ArrayList;
 import java.util.Formatter;
+import java.util.List;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
 import java.util.concurrent.LinkedBlockingQueue;
 import java.util.concurrent.ThreadFactory;
 import java.util.concurrent.ThreadPoolExecutor;
 import java.util.concurrent.TimeUnit;
 import java.util.concurrent.atomic.AtomicInteger;
+import java.util.regex.Matcher;
+import java.util.regex.Pattern;
 
 public abstract class CompilerDaemon {
 
@@ -49,6 +71,34 @@ public abstract class CompilerDaemon {
     public static final String REQUEST_HEADER_COMPILE = "MX DAEMON/COMPILE: ";
     public static final String REQUEST_HEADER_SHUTDOWN = "MX DAEMON/SHUTDOWN";
     public static final String RESPONSE_DONE = "MX DAEMON/DONE:";
+    public static final String REQUEST_HEADER_PING = "MX DAEMON/PING";
+    public static final String RESPONSE_PONG = "MX DAEMON/PONG";
+    /**
+     * The first line sent on every connection to a persistent daemon, followed by the token the
+     * daemon published in its port file. Connections without the token are rejected so that
+     * other users of the machine cannot use the daemon.
+     */
+    public static final String REQUEST_HEADER_AUTH = "MX DAEMON/AUTH: ";
+
+    /**
+     * Switches a connection to the multiplexed protocol. After the daemon acknowledged the switch
+     * with {@link #RESPONSE_MUX}, both sides exchange frames consisting of the payload length (4
+     * bytes), the request id (4 bytes), the frame type (1 byte) and the UTF-8 encoded payload.
+     * Any number of compile requests can be in flight on a multiplexed connection.
+     */
+    public static final String REQUEST_HEADER_MUX = "MX DAEMON/MUX";
+    public static final String RESPONSE_MUX = "MX DAEMON/MUX-OK";
+    /** Compile request, the payload are the compiler arguments separated by NUL characters. */
+    public static final int FRAME_COMPILE = 1;
+    /** A line of output of a compile request. */
+    public static final int FRAME_OUTPUT = 2;
+    /** A diagnostic of a compile request: kind, file, line and message separated by NUL characters. */
+    public static final int FRAME_DIAGNOSTIC = 3;
+    /** The last frame of a compile request, the payload is the exit code of the compiler. */
+    public static final int FRAME_DONE = 4;
+
+    private static final Pattern JAVAC_DIAGNOSTIC = Pattern.compile("(.+\\.java):(\\d+): (error|warning): (.*)");
+    private static final Pattern ECJ_DIAGNOSTIC = Pattern.compile("\\d+\\. (ERROR|WARNING|INFO) in (.+) \\(at line (\\d+)\\)");
 
     /**
      * The deamon will shut down after receiving this many requests with an unrecognized header.
@@ -64,8 +114,20 @@ public abstract class CompilerDaemon {
     private volatile boolean verbose = false;
     private volatile boolean running;
     private ServerSocket serverSocket;
+    private ExecutorService threadPool;
     private final AtomicInteger unrecognizedRequests = new AtomicInteger();
 
+    /**
+     * If non-null, the daemon is persistent: it is not tied to the connection of the mx process
+     * that started it and publishes its port in this file so that later mx processes can reuse it.
+     */
+    private Path portFile;
+    private String portFileContent;
+    private byte[] authToken;
+    private long idleTimeoutMillis = -1;
+    private final AtomicInteger activeRequests = new AtomicInteger();
+    private volatile long lastActivity = System.currentTimeMillis();
+
     private final ThreadLocalOutputStream threadLocalOut = new ThreadLocalOutputStream(System.out);
 
     public void run(String[] args) throws Exception {
@@ -81,6 +143,14 @@ public abstract class CompilerDaemon {
                 } catch (NumberFormatException e) {
                     usage();
                 }
+            } else if (arg.equals("--port-file") && ++i < args.length) {
+                portFile = Paths.get(args[i]);
+            } else if (arg.equals("--idle-timeout") && ++i < args.length) {
+                try {
+                    idleTimeoutMillis = Long.parseLong(args[i]) * 1000;
+                } catch (NumberFormatException e) {
+                    usage();
+                }
             } else {
                 usage();
             }
@@ -91,23 +161,30 @@ public abstract class CompilerDaemon {
         serverSocket = new ServerSocket(0, 0, InetAddress.getLoopbackAddress());
         int port = serverSocket.getLocalPort();
 
-        // Need at least 2 threads since we dedicate one to the control
-        // connection waiting for the shutdown message.
-        int threadCount = Math.max(2, jobsArg > 0 ? jobsArg : Runtime.getRuntime().availableProcessors());
-        ThreadPoolExecutor threadPool = new ThreadPoolExecutor(threadCount, threadCount, 0L, TimeUnit.MILLISECONDS, new LinkedBlockingQueue<>(), new ThreadFactory() {
+        // Connections (such as the control connection waiting for the shutdown message) are
+        // served by their own threads, the pool only runs compilations.
+        int threadCount = Math.max(1, jobsArg > 0 ? jobsArg : Runtime.getRuntime().availableProcessors());
+        ExecutorService connectionPool = Executors.newCachedThreadPool();
+        threadPool = new ThreadPoolExecutor(threadCount, threadCount, 0L, TimeUnit.MILLISECONDS, new LinkedBlockingQueue<>(), new ThreadFactory() {
             public Thread newThread(Runnable runnable) {
                 return new Thread(runnable);
             }
         });
 
         System.out.printf("Started server on port %d [%d threads]\n", port, threadCount);
+        if (portFile != null) {
+            publishPort(port);
+        }
 
         System.setOut(new PrintStream(threadLocalOut));
 
         running = true;
+        if (idleTimeoutMillis > 0) {
+            startIdleWatchdog();
+        }
         while (running) {
             try {
-                threadPool.submit(new Connection(serverSocket.accept(), createCompiler()));
+                connectionPool.submit(new Connection(serverSocket.accept(), createCompiler()));
             } catch (SocketException e) {
                 if (running) {
                     e.printStackTrace();
@@ -116,6 +193,7 @@ public abstract class CompilerDaemon {
                 }
             }
         }
+        connectionPool.shutdown();
         threadPool.shutdown();
         while (!threadPool.isTerminated()) {
             threadPool.awaitTermination(50, TimeUnit.MILLISECONDS);
@@ -123,10 +201,58 @@ public abstract class CompilerDaemon {
     }
 
     private static void usage() {
-        System.err.println("Usage: [ -v ] [ -j NUM ]");
+        System.err.println("Usage: [ -v ] [ -j NUM ] [ --port-file PATH ] [ --idle-timeout SECONDS ]");
         System.exit(1);
     }
 
+    /**
+     * Atomically writes "port pid token" to {@link #portFile}, which is only readable by the
+     * current user.
+     */
+    private void publishPort(int port) throws IOException {
+        String pid = ManagementFactory.getRuntimeMXBean().getName().split("@")[0];
+        byte[] random = new byte[32];
+        new SecureRandom().nextBytes(random);
+        StringBuilder token = new StringBuilder();
+        for (byte b : random) {
+            token.append(String.format("%02x", b));
+        }
+        authToken = token.toString().getBytes(StandardCharsets.UTF_8);
+        portFileContent = port + " " + pid + " " + token + "\n";
+        Path tmp = portFile.resolveSibling(portFile.getFileName() + ".tmp");
+        Files.deleteIfExists(tmp);
+        try {
+            Files.createFile(tmp, PosixFilePermissions.asFileAttribute(PosixFilePermissions.fromString("rw-------")));
+        } catch (UnsupportedOperationException e) {
+            // not a POSIX file system
+        }
+        Files.write(tmp, portFileContent.getBytes(StandardCharsets.UTF_8));
+        Files.move(tmp, portFile, StandardCopyOption.REPLACE_EXISTING, StandardCopyOption.ATOMIC_MOVE);
+    }
+
+    private void startIdleWatchdog() {
+        Thread watchdog = new Thread(() -> {
+            while (running) {
+                try {
+                    Thread.sleep(Math.min(idleTimeoutMillis, 1000));
+                } catch (InterruptedException e) {
+                    return;
+                }
+                if (activeRequests.get() == 0 && System.currentTimeMillis() - lastActivity > idleTimeoutMillis) {
+                    shutdown(String.format("[%s] Idle for %d seconds: ", Instant.now(), idleTimeoutMillis / 1000));
+                    return;
+                }
+            }
+        }, "idle-watchdog");
+        watchdog.setDaemon(true);
+        watchdog.start();
+    }
+
+    private boolean isAuthenticated(String request) {
+        return request.startsWith(REQUEST_HEADER_AUTH) &&
+                        MessageDigest.isEqual(authToken, request.substring(REQUEST_HEADER_AUTH.length()).getBytes(StandardCharsets.UTF_8));
+    }
+
     abstract Compiler createCompiler();
 
     interface Compiler {
@@ -157,6 +283,7 @@ public abstract class CompilerDaemon {
 
         @Override
         public void run() {
+            activeRequests.incrementAndGet();
             try {
                 BufferedReader input = new BufferedReader(new InputStreamReader(connectionSocket.getInputStream(), "UTF-8"));
                 OutputStreamWriter output = new OutputStreamWriter(connectionSocket.getOutputStream(), "UTF-8");
@@ -165,25 +292,39 @@ public abstract class CompilerDaemon {
                     String request = input.readLine();
                     String requestOrigin = connectionSocket.getInetAddress().getHostAddress();
                     String prefix = String.format("[%s:%s] ", Instant.now(), requestOrigin);
-                    if (request == null || request.equals(REQUEST_HEADER_SHUTDOWN)) {
+                    if (request != null && authToken != null) {
+                        if (!isAuthenticated(request)) {
+                            System.err.printf("%sRejected request without a valid authentication token%n", prefix);
+                            output.write(RESPONSE_DONE + "-1\n");
+                            return;
+                        }
+                        request = input.readLine();
+                    }
+                    if (request == null) {
+                        // A persistent daemon is not controlled by the connection of a single mx process
+                        if (portFile == null) {
+                            shutdown(prefix);
+                        }
+                    } else if (request.equals(REQUEST_HEADER_SHUTDOWN)) {
                         shutdown(prefix);
+                    } else if (request.equals(REQUEST_HEADER_PING)) {
+                        output.write(RESPONSE_PONG + "\n");
+                    } else if (request.equals(REQUEST_HEADER_MUX)) {
+                        output.write(RESPONSE_MUX + "\n");
+                        output.flush();
+                        // The client does not send frames before it received the response
+                        // so the reader has not buffered any of them.
+                        serveMultiplexed(connectionSocket, prefix);
                     } else if (request.startsWith(REQUEST_HEADER_COMPILE)) {
                         String commandLine = request.substring(REQUEST_HEADER_COMPILE.length());
                         String[] args = commandLine.split("\u0000");
                         logf("%sCompiling %s%n", prefix, String.join(" ", args));
 
-                        int result;
                         PrintWriter log = new PrintWriter(output);
-                        try {
-                            threadLocalOut.set(connectionSocket.getOutputStream());
-                            result = compiler.compile(args, log);
-                            if (result != 0 && args.length != 0 && args[0].startsWith("GET / HTTP")) {
-                                // GR-52712
-                                System.err.printf("%sFailing compilation received on %s%n", prefix, connectionSocket);
-                            }
-                        } finally {
-                            log.flush();
-                            threadLocalOut.reset();
+                        int result = compileOnPool(compiler, args, log, connectionSocket.getOutputStream());
+                        if (result != 0 && args.length != 0 && args[0].startsWith("GET / HTTP")) {
+                            // GR-52712
+                            System.err.printf("%sFailing compilation received on %s%n", prefix, connectionSocket);
                         }
                         logf("%sResult = %d%n", prefix, result);
 
@@ -204,13 +345,193 @@ public abstract class CompilerDaemon {
                 }
             } catch (SocketException se) {
                 // Lost connection to mx
-                shutdown("");
+                if (portFile == null) {
+                    shutdown("");
+                }
             } catch (Exception ioe) {
                 ioe.printStackTrace();
+            } finally {
+                lastActivity = System.currentTimeMillis();
+                activeRequests.decrementAndGet();
             }
         }
     }
 
+    private int compileOnPool(Compiler compiler, String[] args, PrintWriter log, OutputStream out) throws Exception {
+        try {
+            return threadPool.submit(() -> {
+                try {
+                    threadLocalOut.set(out);
+                    return compiler.compile(args, log);
+                } finally {
+                    log.flush();
+                    threadLocalOut.reset();
+                }
+            }).get();
+        } catch (ExecutionException e) {
+            throw e.getCause() instanceof Exception ? (Exception) e.getCause() : e;
+        }
+    }
+
+    /**
+     * Writes the frames of a multiplexed connection. Frames of concurrent requests are never
+     * interleaved.
+     */
+    private static final class FrameWriter {
+
+        private final DataOutputStream out;
+
+        FrameWriter(OutputStream out) {
+            this.out = new DataOutputStream(new BufferedOutputStream(out));
+        }
+
+        synchronized void write(int requestId, int frameType, String payload) throws IOException {
+            byte[] bytes = payload.getBytes(StandardCharsets.UTF_8);
+            out.writeInt(bytes.length);
+            out.writeInt(requestId);
+            out.writeByte(frameType);
+            out.write(bytes);
+            out.flush();
+        }
+    }
+
+    /**
+     * Sends the output of a compile request line by line as {@link #FRAME_OUTPUT} frames and
+     * keeps a transcript from which the diagnostics are extracted.
+     */
+    private static final class FrameOutputStream extends OutputStream {
+
+        private final FrameWriter writer;
+        private final int requestId;
+        private final ByteArrayOutputStream line = new ByteArrayOutputStream();
+        private final StringBuilder transcript = new StringBuilder();
+
+        FrameOutputStream(FrameWriter writer, int requestId) {
+            this.writer = writer;
+            this.requestId = requestId;
+        }
+
+        @Override
+        public synchronized void write(int b) throws IOException {
+            line.write(b);
+            if (b == '\n') {
+                emitLine();
+            }
+        }
+
+        @Override
+        public synchronized void write(byte[] b, int off, int len) throws IOException {
+            for (int i = off; i < off + len; i++) {
+                write(b[i]);
+            }
+        }
+
+        private void emitLine() throws IOException {
+            String text = new String(line.toByteArray(), StandardCharsets.UTF_8);
+            line.reset();
+            transcript.append(text);
+            writer.write(requestId, FRAME_OUTPUT, text);
+        }
+
+        @Override
+        public synchronized void close() throws IOException {
+            if (line.size() != 0) {
+                line.write('\n');
+                emitLine();
+            }
+        }
+
+        synchronized String transcript() {
+            return transcript.toString();
+        }
+    }
+
+    /**
+     * Extracts the errors and warnings reported by javac or ecj from their output.
+     *
+     * @return the kind, file, line and message of each diagnostic
+     */
+    static List<String[]> parseDiagnostics(String output) {
+        List<String[]> diagnostics = new ArrayList<>();
+        String[] lines = output.split("\r?\n");
+        for (int i = 0; i < lines.length; i++) {
+            Matcher m = JAVAC_DIAGNOSTIC.matcher(lines[i]);
+            if (m.matches()) {
+                diagnostics.add(new String[]{m.group(3), m.group(1), m.group(2), m.group(4)});
+                continue;
+            }
+            m = ECJ_DIAGNOSTIC.matcher(lines[i]);
+            if (m.matches()) {
+                // The header is followed by the tab-indented source line and marker, then the message
+                String message = "";
+                for (int j = i + 1; j < lines.length && !lines[j].startsWith("----------"); j++) {
+                    if (!lines[j].startsWith("\t")) {
+                        message = lines[j];
+                        break;
+                    }
+                }
+                diagnostics.add(new String[]{m.group(1).toLowerCase(), m.group(2), m.group(3), message});
+            }
+        }
+        return diagnostics;
+    }
+
+    private void serveMultiplexed(Socket socket, String prefix) throws IOException {
+        DataInputStream in = new DataInputStream(new BufferedInputStream(socket.getInputStream()));
+        FrameWriter writer = new FrameWriter(socket.getOutputStream());
+        while (running) {
+            int length;
+            try {
+                length = in.readInt();
+            } catch (EOFException e) {
+                return;
+            }
+            int requestId = in.readInt();
+            int frameType = in.readByte();
+            byte[] payload = new byte[length];
+            in.readFully(payload);
+            if (frameType == FRAME_COMPILE) {
+                String[] args = new String(payload, StandardCharsets.UTF_8).split("\u0000");
+                logf("%sCompiling [request %d] %s%n", prefix, requestId, String.join(" ", args));
+                Compiler compiler = createCompiler();
+                threadPool.submit(() -> compileMultiplexed(compiler, requestId, args, writer, prefix));
+            } else {
+                System.err.printf("%sUnrecognized frame type %d for request %d%n", prefix, frameType, requestId);
+                writer.write(requestId, FRAME_DONE, "-1");
+            }
+        }
+    }
+
+    private void compileMultiplexed(Compiler compiler, int requestId, String[] args, FrameWriter writer, String prefix) {
+        activeRequests.incrementAndGet();
+        try {
+            FrameOutputStream stream = new FrameOutputStream(writer, requestId);
+            PrintWriter log = new PrintWriter(new OutputStreamWriter(stream, StandardCharsets.UTF_8));
+            int result;
+            try {
+                threadLocalOut.set(stream);
+                result = compiler.compile(args, log);
+            } catch (Exception e) {
+                e.printStackTrace(log);
+                result = -1;
+            } finally {
+                log.flush();
+                threadLocalOut.reset();
+            }
+            stream.close();
+            for (String[] diagnostic : parseDiagnostics(stream.transcript())) {
+                writer.write(requestId, FRAME_DIAGNOSTIC, String.join("\u0000", diagnostic));
+            }
+            logf("%sResult [request %d] = %d%n", prefix, requestId, result);
+            writer.write(requestId, FRAME_DONE, Integer.toString(result));
+        } catch (IOException e) {
+            logf("%sLost connection while sending result of request %d: %s%n", prefix, requestId, e);
+        } finally {
+            lastActivity = System.currentTimeMillis();
+            activeRequests.decrementAndGet();
+        }
+    }
+
     private static final class ThreadLocalOutputStream extends OutputStream {
 
         private final OutputStream global;
@@ -253,6 +574,16 @@ public abstract class CompilerDaemon {
     private void shutdown(String prefix) {
         logf("%sShutting down%n", prefix);
         running = false;
+        if (portFile != null) {
+            try {
+                // Only remove the port file if it was not taken over by another daemon
+                if (portFileContent != null && portFileContent.equals(new String(Files.readAllBytes(portFile), StandardCharsets.UTF_8))) {
+                    Files.delete(portFile);
+                }
+            } catch (IOException e) {
+                // already removed
+            }
+        }
         try {
             serverSocket.close();
         } catch (IOException e) {
@@ -0,0 +1,218 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+from __future__ import annotations
+
+__all__ = ["merge_compile_args", "plan_batches", "schedule_order", "split_classes"]
+
+import os
+from os.path import join, relpath
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .classfile import ClassFormatError, parse_class_file, source_key
+from .tasks import Task
+
+maxSourcesPerProject = 50
+"""Projects with more Java source files than this are compiled on their own."""
+
+maxSourcesPerBatch = 400
+"""The maximum number of Java source files compiled by one batched compiler invocation."""
+
+maxProjectsPerBatch = 32
+
+
+def _depths(tasks: Sequence[Task]) -> Dict[Task, int]:
+    """
+    Computes the length of the longest dependency chain below each task in `tasks`, which
+    must be ordered such that dependencies come before their dependents. Tasks with the same
+    depth cannot depend on each other, not even transitively.
+    """
+    depths: Dict[Task, int] = {}
+    for t in tasks:
+        depths[t] = 1 + max((depths[d] for d in t.deps if d in depths), default=-1)
+    return depths
+
+
+def plan_batches(tasks: Sequence[Task], keyOf: Callable[[Task], Optional[Hashable]],
+                 sizeOf: Callable[[Task], int]) -> List[List[Task]]:
+    """
+    Groups tasks that can be compiled by a single compiler invocation.
+
+    Only tasks that are at the same depth in the dependency graph (and thus independent of
+    each other) and have the same key are grouped. Groups are filled in the order of `tasks`
+    up to `maxProjectsPerBatch` tasks and `maxSourcesPerBatch` sources. Groups with a single
+    task are not returned.
+
+    :param tasks: the tasks of the build, dependencies before dependents
+    :param keyOf: computes the key of a task or None if the task cannot be batched
+    :param sizeOf: computes the number of Java source files of a task
+    """
+    depths = _depths(tasks)
+    open_batches: Dict[Tuple[int, Hashable], Tuple[List[Task], List[int]]] = {}
+    batches: List[List[Task]] = []
+    for t in tasks:
+        key = keyOf(t)
+        if key is None:
+            continue
+        size = sizeOf(t)
+        if size == 0 or size > maxSourcesPerProject:
+            continue
+        group = (depths[t], key)
+        current = open_batches.get(group)
+        if current is None or len(current[0]) >= maxProjectsPerBatch or current[1][0] + size > maxSourcesPerBatch:
+            current = ([], [0])
+            open_batches[group] = current
+            batches.append(current[0])
+        current[0].append(t)
+        current[1][0] += size
+    return [b for b in batches if len(b) > 1]
+
+
+def schedule_order(tasks: Sequence[Task], aliases: Dict[Task, Task]) -> List[Task]:
+    """
+    Orders the tasks that remain after replacing tasks by the task executing them (as given
+    by `aliases`) such that dependencies come before their dependents. The relative order of
+    `tasks` is kept where possible.
+    """
+    order: List[Task] = []
+    visited = set()
+    index = set(tasks)
+
+    def visit(t):
+        t = aliases.get(t, t)
+        if t in visited:
+            return
+        visited.add(t)
+        for d in t.deps:
+            if d in aliases or d in index:
+                visit(d)
+        order.append(t)
+
+    for t in tasks:
+        visit(t)
+    return order
+
+
+def _split_args(args: Sequence[str]) -> Optional[Tuple[List[str], str, str, str, str]]:
+    """
+    Splits compiler arguments into the arguments that do not depend on the compiled project
+    and the output directory, class path option and value, and argument file. Returns None if
+    the arguments have no or several of any of the latter (e.g. both a ``-classpath`` and a
+    ``-Xbootclasspath/p:`` option).
+    """
+    common = []
+    outputDir = classPathOption = classPath = argFile = None
+    i = 0
+    while i < len(args):
+        a = args[i]
+        if a == '-d' and i + 1 < len(args):
+            outputDir = args[i + 1]
+            i += 2
+            continue
+        if a in ('-classpath', '-cp') and i + 1 < len(args):
+            if classPathOption is not None:
+                return None
+            classPathOption, classPath = a, args[i + 1]
+            i += 2
+            continue
+        if a.startswith('-Xbootclasspath/p:'):
+            if classPathOption is not None:
+                return None
+            classPathOption, classPath = '-Xbootclasspath/p:', a[len('-Xbootclasspath/p:'):]
+        elif a.startswith('@'):
+            if argFile is not None:
+                return None
+            argFile = a[1:]
+        else:
+            common.append(a)
+        i += 1
+    if outputDir is None or classPathOption is None or argFile is None:
+        return None
+    return common, outputDir, classPathOption, classPath, argFile
+
+
+def merge_compile_args(argsList: Sequence[Sequence[str]], outputDir: str, argFile: str) -> Optional[List[str]]:
+    """
+    Creates the arguments for compiling the sources of several projects with one compiler
+    invocation from the arguments for compiling each project. The projects are compatible
+    if their arguments only differ in the output directory and the argument file listing
+    their sources. In particular, their class paths (without the output directories of the
+    projects) must be the same, so that a project cannot use classes it does not depend on.
+
+    :param outputDir: the directory in which the class files of all projects are placed
+    :param argFile: the argument file listing the sources of all projects
+    :return: the merged arguments or None if the projects are not compatible
+    """
+    splits = [_split_args(args) for args in argsList]
+    if not splits or None in splits:
+        return None
+    outputDirs = {split[1] for split in splits}
+    merged = None
+    for common, _, classPathOption, classPath, _ in splits:
+        entries = [e for e in classPath.split(os.pathsep) if e and e not in outputDirs]
+        if merged is None:
+            merged = (common, classPathOption, entries)
+        elif merged != (common, classPathOption, entries):
+            return None
+    common, classPathOption, entries = merged
+    classPath = os.pathsep.join(entries)
+    if classPathOption == '-Xbootclasspath/p:':
+        cpArgs = [classPathOption + classPath]
+    else:
+        cpArgs = [classPathOption, classPath]
+    return ['-d', outputDir] + cpArgs + common + ['@' + argFile]
+
+
+def split_classes(stageDir: str, owners: Dict[Tuple[str, str], Hashable]) -> Dict[Hashable, List[str]]:
+    """
+    Assigns the class files compiled into `stageDir` to the projects whose sources they were
+    compiled from, based on the package directory and the ``SourceFile`` attribute of each
+    class file.
+
+    :param owners: map from (package directory, source file name) to the owner of the source,
+           where the package directory is relative to the source root and uses ``/`` as separator
+    :return: map from owner to the paths of its class files relative to `stageDir`
+    :raises ValueError: if the source of a class file cannot be determined
+    """
+    result: Dict[Hashable, List[str]] = {}
+    for root, _, files in os.walk(stageDir):
+        for name in files:
+            if not name.endswith('.class'):
+                continue
+            path = join(root, name)
+            rel = relpath(path, stageDir).replace(os.sep, '/')
+            try:
+                with open(path, 'rb') as fp:
+                    key = source_key(rel, parse_class_file(fp.read()))
+            except (OSError, ClassFormatError) as e:
+                raise ValueError(f'cannot read {path}: {e}') from e
+            owner = owners.get(key)
+            if owner is None:
+                raise ValueError(f'cannot determine the source of {path}')
+            result.setdefault(owner, []).append(rel)
+    return result
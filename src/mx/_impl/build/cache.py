@@ -0,0 +1,271 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+from __future__ import annotations
+
+__all__ = ["BuildCache", "BuildCacheEntry", "build_cache_enabled", "parse_size"]
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from os.path import exists, isdir, join, relpath
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from ..mx_util import materialize_file
+from ..support.envvars import get_env
+from ..support.logging import logv, warn
+
+
+def build_cache_enabled(args) -> bool:
+    """Determines if the shared build cache is used by a build with the given arguments."""
+    if get_env('MX_BUILD_CACHE') is not None:
+        return get_env('MX_BUILD_CACHE') == 'true'
+    return getattr(args, 'build_cache', False) is True
+
+
+def parse_size(value: str) -> int:
+    """Parses a size in bytes with an optional ``k``, ``m``, ``g`` or ``t`` suffix (e.g. ``10g``)."""
+    units = 'kmgt'
+    value = value.strip().lower()
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * 1024 ** (units.index(value[-1]) + 1))
+    return int(value)
+
+
+def _materialize_tree(src: str, dst: str, strategies: set) -> None:
+    if not isdir(src):
+        strategies.add(materialize_file(src, dst, hardlink=False))
+        return
+    os.makedirs(dst, exist_ok=True)
+    for root, dirs, files in os.walk(src):
+        dirs.sort()
+        target = join(dst, relpath(root, src))
+        for d in dirs:
+            os.makedirs(join(target, d), exist_ok=True)
+        for name in files:
+            strategies.add(materialize_file(join(root, name), join(target, name), hardlink=False))
+
+
+def _remove(path: str) -> None:
+    if isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+def _touch_tree(path: str) -> None:
+    # Restored files must look as new as freshly built ones to tasks that compare modification times
+    if isdir(path):
+        for root, _, files in os.walk(path):
+            for name in files:
+                os.utime(join(root, name))
+    elif exists(path):
+        os.utime(path)
+
+
+class BuildCacheEntry(NamedTuple):
+    path: str
+    lastUse: float
+    size: int
+
+
+class BuildCache:
+    """
+    A content-addressed cache of build task outputs shared by all builds of a user.
+
+    An entry is stored under a key that is a digest of everything that determines the outputs
+    of a build task (see `action_key`). Each entry is a directory containing a manifest and a copy
+    of the outputs. Entries are written to a temporary directory that is renamed into place, so a
+    concurrent build never observes a partially written entry. Restoring an entry links its files
+    into place (reflink where the file system supports it, else a copy) and checks them against
+    the digests in the manifest, discarding entries that were corrupted. Entries are never hard
+    linked to outputs since a build modifying an output in place would then corrupt the entry.
+
+    The modification time of an entry's manifest is updated on every hit so that `evict` can
+    remove the least recently used entries.
+    """
+
+    version = 1
+    manifestName = 'manifest.json'
+
+    def __init__(self, root: str):
+        self.root = root
+
+    dirName = 'build-cache'
+    """The name of the build cache directory in the mx cache directory."""
+
+    @staticmethod
+    def default() -> BuildCache:
+        from .. import mx
+        return BuildCache(join(mx._cache_dir(), BuildCache.dirName))
+
+    @staticmethod
+    def max_size() -> int:
+        """The size in bytes the build cache is trimmed to after a build (``MX_BUILD_CACHE_MAX_SIZE``, default 10g)."""
+        return parse_size(get_env('MX_BUILD_CACHE_MAX_SIZE', '10g'))
+
+    @staticmethod
+    def action_key(components: dict) -> str:
+        """Computes the cache key of a build action from a JSON serializable description of its inputs."""
+        return hashlib.sha256(json.dumps([BuildCache.version, components], sort_keys=True).encode()).hexdigest()
+
+    def _entry_dir(self, key: str) -> str:
+        return join(self.root, key[:2], key)
+
+    def _read_manifest(self, entry: str) -> Optional[dict]:
+        try:
+            with open(join(entry, self.manifestName), encoding='utf-8') as fp:
+                manifest = json.load(fp)
+            return manifest if manifest.get('version') == self.version else None
+        except (OSError, ValueError):
+            return None
+
+    def restore(self, key: str, baseDir: str, outputs: List[str], digestOf: Callable[[str], Optional[str]]) -> Optional[str]:
+        """
+        Restores the outputs stored under `key`.
+
+        :param baseDir: the directory the recorded output paths are relative to
+        :param outputs: the output files or directories to restore (they are replaced if they exist)
+        :param digestOf: function computing the content digest of a restored output
+        :return: a description of how the outputs were restored or None if there is no (valid) entry for `key`
+        """
+        entry = self._entry_dir(key)
+        manifest = self._read_manifest(entry)
+        if manifest is None:
+            return None
+        recorded = manifest['outputs']
+        if [o['path'] for o in recorded] != [relpath(o, baseDir) for o in outputs]:
+            return None
+        strategies = set()
+        try:
+            for i, (output, o) in enumerate(zip(outputs, recorded)):
+                _remove(output)
+                if o['digest'] is None:
+                    continue
+                os.makedirs(os.path.dirname(output), exist_ok=True)
+                _materialize_tree(join(entry, 'files', str(i)), output, strategies)
+                if digestOf(output) != o['digest']:
+                    raise ValueError(f'content of {output} does not match the digest recorded in {entry}')
+                _touch_tree(output)
+        except (OSError, ValueError) as e:
+            warn(f'Discarding build cache entry {entry}: {e}')
+            for output in outputs:
+                _remove(output)
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        try:
+            os.utime(join(entry, self.manifestName))
+        except OSError:
+            pass
+        return '/'.join(sorted(strategies)) or 'no files'
+
+    def store(self, key: str, baseDir: str, outputs: Dict[str, Optional[str]], description: str) -> None:
+        """
+        Stores `outputs` under `key` unless there already is an entry for it.
+
+        :param outputs: map from output paths to their content digests (None for outputs that do not exist)
+        :param description: a human readable description of the entry
+        """
+        entry = self._entry_dir(key)
+        if exists(entry):
+            return
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=key + '.', suffix='.tmp', dir=os.path.dirname(entry))
+        try:
+            recorded = []
+            strategies = set()
+            for i, (output, digest) in enumerate(outputs.items()):
+                if digest is not None:
+                    _materialize_tree(output, join(tmp, 'files', str(i)), strategies)
+                recorded.append({'path': relpath(output, baseDir), 'digest': digest})
+            manifest = {'version': self.version, 'description': description, 'created': time.time(),
+                        'size': _size_of(tmp), 'outputs': recorded}
+            with open(join(tmp, self.manifestName), 'w', encoding='utf-8') as fp:
+                json.dump(manifest, fp)
+            try:
+                os.rename(tmp, entry)
+            except OSError:
+                # Another build stored the same entry concurrently
+                pass
+        finally:
+            if exists(tmp):
+                shutil.rmtree(tmp, ignore_errors=True)
+
+    def entries(self) -> List[BuildCacheEntry]:
+        """Gets the entries in the cache, least recently used first."""
+        result = []
+        if not isdir(self.root):
+            return result
+        for prefix in os.listdir(self.root):
+            prefixDir = join(self.root, prefix)
+            if not isdir(prefixDir):
+                continue
+            for name in os.listdir(prefixDir):
+                entry = join(prefixDir, name)
+                if name.endswith('.tmp'):
+                    continue
+                manifest = self._read_manifest(entry)
+                try:
+                    lastUse = os.path.getmtime(join(entry, self.manifestName))
+                except OSError:
+                    lastUse = 0
+                size = manifest.get('size', 0) if manifest else _size_of(entry)
+                result.append(BuildCacheEntry(entry, lastUse, size))
+        return sorted(result, key=lambda e: e.lastUse)
+
+    def evict(self, maxSize: int) -> List[BuildCacheEntry]:
+        """
+        Removes the least recently used entries until the total size of the cache is at most `maxSize` bytes.
+
+        :return: the removed entries
+        """
+        entries = self.entries()
+        total = sum(e.size for e in entries)
+        removed = []
+        for e in entries:
+            if total <= maxSize:
+                break
+            logv(f'Evicting build cache entry {e.path}')
+            shutil.rmtree(e.path, ignore_errors=True)
+            total -= e.size
+            removed.append(e)
+        return removed
+
+
+def _size_of(path: str) -> int:
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.lstat(join(root, name)).st_size
+            except OSError:
+                pass
+    return size
@@ -0,0 +1,374 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+from __future__ import annotations
+
+__all__ = ["ClassFile", "ClassFormatError", "abi_fingerprint", "parse_class_file", "source_key"]
+
+import hashlib
+import os
+import posixpath
+import re
+import struct
+from typing import FrozenSet, List, NamedTuple, Optional, Tuple
+
+_UTF8 = 1
+_INTEGER = 3
+_FLOAT = 4
+_LONG = 5
+_DOUBLE = 6
+_CLASS = 7
+_STRING = 8
+_NAME_AND_TYPE = 12
+_METHOD_TYPE = 16
+_MODULE = 19
+_PACKAGE = 20
+
+_ACC_PRIVATE = 0x0002
+_ACC_STATIC = 0x0008
+_ACC_FINAL = 0x0010
+_ACC_SUPER = 0x0020
+_ACC_SYNTHETIC = 0x1000
+
+# Number of bytes following the tag byte of each non-UTF8 constant pool entry
+_CONSTANT_SIZES = {
+    _INTEGER: 4,
+    _FLOAT: 4,
+    _LONG: 8,
+    _DOUBLE: 8,
+    _CLASS: 2,
+    _STRING: 2,
+    9: 4,   # Fieldref
+    10: 4,  # Methodref
+    11: 4,  # InterfaceMethodref
+    _NAME_AND_TYPE: 4,
+    15: 3,  # MethodHandle
+    _METHOD_TYPE: 2,
+    17: 4,  # Dynamic
+    18: 4,  # InvokeDynamic
+    _MODULE: 2,
+    _PACKAGE: 2,
+}
+
+# Matches the class names in field, method and generic signature descriptors
+_DESCRIPTOR_CLASS = re.compile(r'L([^;<>\[]+)[;<]')
+
+# Attributes of classes, fields and methods that are part of the ABI
+_ANNOTATION_ATTRIBUTES = ('RuntimeVisibleAnnotations', 'RuntimeInvisibleAnnotations')
+_PARAMETER_ANNOTATION_ATTRIBUTES = ('RuntimeVisibleParameterAnnotations', 'RuntimeInvisibleParameterAnnotations')
+
+
+class ClassFormatError(Exception):
+    pass
+
+
+class ClassFile(NamedTuple):
+    """The parts of a class file that mx needs to know about."""
+
+    name: str
+    """The binary name of the class in internal form (e.g. ``java/util/Map$Entry``)."""
+    sourceFile: Optional[str]
+    """The value of the ``SourceFile`` attribute (e.g. ``Map.java``) or None if the class file has none."""
+    supertypes: Tuple[str, ...]
+    """The direct superclass (if any) followed by the direct superinterfaces."""
+    references: FrozenSet[str]
+    """
+    The classes referenced from the constant pool, either directly or in a descriptor. This
+    over-approximates the classes the class depends on, except for compile time constants of
+    other classes, which javac inlines.
+    """
+    hasConstants: bool
+    """Whether the class declares a static final field initialized with a compile time constant."""
+    abi: Optional[str]
+    """
+    A digest of everything other classes can be compiled against: the non-private, non-synthetic
+    declarations of the class and its members including their generic signatures, annotations,
+    thrown exceptions and constant values. It does not depend on the order of the members or
+    the layout of the constant pool. None if the class is private, local or anonymous.
+    """
+
+
+def _decode(data: bytes) -> str:
+    # Modified UTF-8 only differs from UTF-8 for NUL and supplementary characters
+    # which do not occur in the names mx is interested in.
+    return data.decode('utf-8', errors='replace')
+
+
+class _Parser:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.utf8: List[Optional[str]] = []
+        self.classes: List[int] = []
+        self.constants: List[Optional[str]] = []
+
+    def u1(self, pos: int) -> int:
+        return self.data[pos]
+
+    def u2(self, pos: int) -> int:
+        return struct.unpack_from('>H', self.data, pos)[0]
+
+    def u4(self, pos: int) -> int:
+        return struct.unpack_from('>I', self.data, pos)[0]
+
+    def class_name(self, index: int) -> Optional[str]:
+        if index == 0:
+            return None
+        name = self.utf8[self.classes[index]]
+        if name is None:
+            raise ClassFormatError(f'constant pool entry {index} is not a class')
+        return name
+
+    def parse_constant_pool(self) -> int:
+        data = self.data
+        if data[:4] != b'\xca\xfe\xba\xbe':
+            raise ClassFormatError('bad magic number')
+        count = self.u2(8)
+        self.utf8 = [None] * count
+        self.classes = [0] * count
+        self.constants = [None] * count
+        strings = []
+        pos = 10
+        i = 1
+        while i < count:
+            tag = data[pos]
+            if tag == _UTF8:
+                length = self.u2(pos + 1)
+                self.utf8[i] = _decode(data[pos + 3:pos + 3 + length])
+                pos += 3 + length
+            else:
+                size = _CONSTANT_SIZES.get(tag)
+                if size is None:
+                    raise ClassFormatError(f'unknown constant pool tag {tag} at offset {pos}')
+                if tag == _CLASS:
+                    self.classes[i] = self.u2(pos + 1)
+                elif tag == _STRING:
+                    strings.append((i, self.u2(pos + 1)))
+                elif tag in (_INTEGER, _FLOAT, _LONG, _DOUBLE):
+                    self.constants[i] = f'{tag}:{data[pos + 1:pos + 1 + size].hex()}'
+                pos += 1 + size
+                if tag in (_LONG, _DOUBLE):
+                    # Long and Double constants take up two entries
+                    i += 1
+            i += 1
+        for i, index in strings:
+            self.constants[i] = 's:' + (self.utf8[index] or '')
+        return pos
+
+    def element_value(self, pos: int, out: List[str]) -> int:
+        tag = chr(self.u1(pos))
+        pos += 1
+        if tag in 'BCDFIJSZs':
+            index = self.u2(pos)
+            out.append(tag + ((self.utf8[index] if tag == 's' else self.constants[index]) or ''))
+            return pos + 2
+        if tag == 'e':
+            out.append(f'e{self.utf8[self.u2(pos)]}.{self.utf8[self.u2(pos + 2)]}')
+            return pos + 4
+        if tag == 'c':
+            out.append('c' + (self.utf8[self.u2(pos)] or ''))
+            return pos + 2
+        if tag == '@':
+            return self.annotation(pos, out)
+        if tag == '[':
+            count = self.u2(pos)
+            pos += 2
+            out.append(f'[{count}')
+            for _ in range(count):
+                pos = self.element_value(pos, out)
+            return pos
+        raise ClassFormatError(f'unknown element value tag {tag!r}')
+
+    def annotation(self, pos: int, out: List[str]) -> int:
+        out.append('@' + (self.utf8[self.u2(pos)] or ''))
+        pairs = self.u2(pos + 2)
+        pos += 4
+        for _ in range(pairs):
+            out.append(self.utf8[self.u2(pos)] or '')
+            pos = self.element_value(pos + 2, out)
+        return pos
+
+    def abi_attribute(self, name: str, pos: int, out: List[str]) -> None:
+        """Appends the ABI relevant contents of the attribute `name` whose contents start at `pos` to `out`."""
+        if name == 'Signature':
+            out.append('Signature ' + (self.utf8[self.u2(pos)] or ''))
+        elif name == 'Deprecated':
+            out.append(name)
+        elif name == 'ConstantValue':
+            out.append('ConstantValue ' + (self.constants[self.u2(pos)] or ''))
+        elif name in ('Exceptions', 'PermittedSubclasses'):
+            count = self.u2(pos)
+            out.append(name + ' ' + ','.join(sorted(self.class_name(self.u2(pos + 2 + 2 * j)) or '' for j in range(count))))
+        elif name == 'AnnotationDefault':
+            out.append(name)
+            self.element_value(pos, out)
+        elif name in _ANNOTATION_ATTRIBUTES:
+            out.append(name)
+            count = self.u2(pos)
+            pos += 2
+            for _ in range(count):
+                pos = self.annotation(pos, out)
+        elif name in _PARAMETER_ANNOTATION_ATTRIBUTES:
+            out.append(name)
+            parameters = self.u1(pos)
+            pos += 1
+            for _ in range(parameters):
+                count = self.u2(pos)
+                pos += 2
+                out.append(f'({count}')
+                for _ in range(count):
+                    pos = self.annotation(pos, out)
+
+
+def parse_class_file(data: bytes) -> ClassFile:
+    """
+    Parses the constant pool, the declarations and the ``SourceFile`` attribute of the class
+    file contents in `data`.
+
+    :raises ClassFormatError: if `data` is not a well formed class file
+    """
+    try:
+        parser = _Parser(data)
+        pos = parser.parse_constant_pool()
+        utf8 = parser.utf8
+        access, thisClass, superClass, interfaceCount = struct.unpack_from('>HHHH', data, pos)
+        pos += 8
+        name = parser.class_name(thisClass)
+        if name is None:
+            raise ClassFormatError('missing this_class')
+        supertypes = [parser.class_name(superClass)] if superClass else []
+        for j in range(interfaceCount):
+            supertypes.append(parser.class_name(parser.u2(pos + 2 * j)))
+        pos += 2 * interfaceCount
+
+        hasConstants = False
+        memberAbis = []
+        for kind in ('field', 'method'):
+            members = parser.u2(pos)
+            pos += 2
+            for _ in range(members):
+                memberAccess, nameIndex, descriptorIndex, attributes = struct.unpack_from('>HHHH', data, pos)
+                pos += 8
+                inAbi = not memberAccess & (_ACC_PRIVATE | _ACC_SYNTHETIC)
+                abi = [f'{kind} {memberAccess:x} {utf8[nameIndex]} {utf8[descriptorIndex]}']
+                for _ in range(attributes):
+                    attributeName = utf8[parser.u2(pos)]
+                    length = parser.u4(pos + 2)
+                    if kind == 'field' and memberAccess & _ACC_STATIC and memberAccess & _ACC_FINAL and attributeName == 'ConstantValue':
+                        hasConstants = True
+                    if inAbi:
+                        parser.abi_attribute(attributeName, pos + 6, abi)
+                    pos += 6 + length
+                if inAbi:
+                    memberAbis.append('\n'.join(abi))
+
+        sourceFile = None
+        visible = not access & _ACC_SYNTHETIC
+        classAbi = [f'class {access & ~_ACC_SUPER:x} {name} {",".join(supertypes)}']
+        attributes = parser.u2(pos)
+        pos += 2
+        for _ in range(attributes):
+            attributeName = utf8[parser.u2(pos)]
+            length = parser.u4(pos + 2)
+            if attributeName == 'SourceFile':
+                sourceFile = utf8[parser.u2(pos + 6)]
+            elif attributeName == 'InnerClasses':
+                for j in range(parser.u2(pos + 6)):
+                    inner, outer, innerName, innerAccess = struct.unpack_from('>HHHH', data, pos + 8 + 8 * j)
+                    innerClass = parser.class_name(inner)
+                    if innerClass == name and (outer == 0 or innerName == 0 or innerAccess & _ACC_PRIVATE):
+                        # Local, anonymous and private classes cannot be used by other compilation units
+                        visible = False
+                    elif outer and parser.class_name(outer) == name and innerName and not innerAccess & (_ACC_PRIVATE | _ACC_SYNTHETIC):
+                        classAbi.append(f'InnerClass {innerClass} {innerAccess:x}')
+            else:
+                parser.abi_attribute(attributeName, pos + 6, classAbi)
+            pos += 6 + length
+
+        abi = None
+        if visible:
+            h = hashlib.sha256()
+            for part in classAbi + sorted(memberAbis):
+                h.update(part.encode())
+                h.update(b'\0')
+            abi = h.hexdigest()
+
+        references = set()
+        for entry in parser.classes:
+            if entry:
+                referenced = utf8[entry] or ''
+                if referenced.startswith('['):
+                    references.update(_DESCRIPTOR_CLASS.findall(referenced))
+                else:
+                    references.add(referenced)
+        for value in utf8:
+            if value and 'L' in value and ';' in value:
+                references.update(_DESCRIPTOR_CLASS.findall(value))
+        references.discard(name)
+        return ClassFile(name, sourceFile, tuple(supertypes), frozenset(references), hasConstants, abi)
+    except (struct.error, IndexError, TypeError) as e:
+        raise ClassFormatError(f'truncated class file: {e}') from e
+
+
+def abi_fingerprint(classDir: str) -> str:
+    """
+    Computes a digest of the ABI (see `ClassFile.abi`) of all classes below `classDir`.
+    Class files that cannot be parsed contribute their complete contents.
+    """
+    abis = {}
+    for root, dirs, files in os.walk(classDir):
+        dirs.sort()
+        for name in files:
+            if not name.endswith('.class'):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as fp:
+                data = fp.read()
+            try:
+                classFile = parse_class_file(data)
+            except ClassFormatError:
+                abis[os.path.relpath(path, classDir).replace(os.sep, '/')] = hashlib.sha256(data).hexdigest()
+                continue
+            if classFile.abi is not None:
+                abis[classFile.name] = classFile.abi
+    h = hashlib.sha256()
+    for key in sorted(abis):
+        h.update(f'{key} {abis[key]}\n'.encode())
+    return h.hexdigest()
+
+
+def source_key(relPath: str, classFile: ClassFile) -> Tuple[str, str]:
+    """
+    Gets the package directory and name of the source file a class file was compiled from.
+
+    :param relPath: the path of the class file relative to the class path root, using ``/`` as separator
+    """
+    sourceFile = classFile.sourceFile
+    if sourceFile is None:
+        # Without debug info, nested classes are assumed to be declared in the source of their top level class
+        sourceFile = posixpath.basename(classFile.name).split('$')[0] + '.java'
+    return posixpath.dirname(relPath), sourceFile
@@ -0,0 +1,173 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+
+"""Compression of archive contents on multiple threads with output that does not depend on the number of threads."""
+
+from __future__ import annotations
+
+__all__ = ["ordered_map", "deflate_entry", "ParallelGzipWriter"]
+
+import collections
+import io
+import struct
+import zlib
+import zipfile
+from concurrent.futures import Executor
+from typing import Any, BinaryIO, Callable, Deque, Iterable, Iterator, Optional
+
+
+def ordered_map(executor: Optional[Executor], fn: Callable[[Any], Any], items: Iterable[Any], window: int = 64) -> Iterator[Any]:
+    """
+    Applies `fn` to `items` on `executor` and yields the results in the order of `items`.
+    At most `window` results are computed ahead of the one being consumed so that the
+    memory needed does not grow with the number of items. If `executor` is None, `fn`
+    is applied on the calling thread.
+    """
+    if executor is None:
+        for item in items:
+            yield fn(item)
+        return
+    pending: Deque[Any] = collections.deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def deflate_entry(zinfo: zipfile.ZipInfo, data: bytes) -> bytes:
+    """
+    Compresses `data` according to ``zinfo.compress_type`` exactly as `zipfile.ZipFile.writestr`
+    (with the default compression level) does and updates the ``file_size``, ``CRC`` and
+    ``compress_size`` of `zinfo` accordingly. The result can be added to a zip file with
+    `rawzip.write_raw_entry`. zlib releases the GIL while compressing so this can run on
+    multiple threads.
+
+    :raises ValueError: if ``zinfo.compress_type`` is neither ``ZIP_STORED`` nor ``ZIP_DEFLATED``
+    """
+    zinfo.file_size = len(data)
+    zinfo.CRC = zlib.crc32(data)
+    if zinfo.compress_type == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        data = compressor.compress(data) + compressor.flush()
+    elif zinfo.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f'Unsupported compression type {zinfo.compress_type} for {zinfo.filename}')
+    zinfo.compress_size = len(data)
+    return data
+
+
+_gzip_header = struct.Struct('<BBBBIBB')
+"""ID1, ID2, CM, FLG, MTIME, XFL and OS of a gzip member."""
+
+_gzip_trailer = struct.Struct('<II')
+"""CRC32 and ISIZE of a gzip member."""
+
+
+def _gzip_member(data: bytes, compresslevel: int) -> bytes:
+    """
+    Compresses `data` into a gzip member (RFC 1952) with a fixed header: no file name, a zero
+    modification time and an unknown (255) operating system.
+    """
+    xfl = 2 if compresslevel == zlib.Z_BEST_COMPRESSION else 4 if compresslevel == zlib.Z_BEST_SPEED else 0
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+    return _gzip_header.pack(0x1f, 0x8b, zlib.DEFLATED, 0, 0, xfl, 255) + compressor.compress(data) + compressor.flush() + \
+        _gzip_trailer.pack(zlib.crc32(data), len(data) & 0xffffffff)
+
+
+class ParallelGzipWriter(io.BufferedIOBase):
+    """
+    A writable stream producing gzip data in the manner of pigz: the data is split into blocks of
+    `blockSize` bytes and each block is compressed on `executor` into a separate gzip member.
+    The members are concatenated in order, which is a valid gzip file (RFC 1952, section 2.2).
+    The members are framed by `_gzip_member` rather than `gzip.compress`, whose header differs
+    between Python versions, so that the output only depends on the data written, the block size
+    and the compression level.
+    """
+
+    def __init__(self, fileobj: BinaryIO, executor: Optional[Executor], compresslevel: int = 9, blockSize: int = 1024 * 1024, window: int = 16):
+        super().__init__()
+        self.fileobj = fileobj
+        self.executor = executor
+        self.compresslevel = compresslevel
+        self.blockSize = blockSize
+        self.window = window
+        self._block = bytearray()
+        self._pending: Deque[Any] = collections.deque()
+        self._offset = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._offset
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError('write to closed file')
+        length = len(data)
+        self._block += data
+        self._offset += length
+        while len(self._block) >= self.blockSize:
+            block = bytes(self._block[:self.blockSize])
+            del self._block[:self.blockSize]
+            self._submit(block)
+        return length
+
+    def _compress(self, block: bytes) -> bytes:
+        return _gzip_member(block, self.compresslevel)
+
+    def _submit(self, block: bytes) -> None:
+        if self.executor is None:
+            self.fileobj.write(self._compress(block))
+            return
+        self._pending.append(self.executor.submit(self._compress, block))
+        while len(self._pending) >= self.window:
+            self.fileobj.write(self._pending.popleft().result())
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if self._block or self._offset == 0:
+                # An empty gzip file still needs one member
+                self._submit(bytes(self._block))
+                self._block = bytearray()
+            while self._pending:
+                self.fileobj.write(self._pending.popleft().result())
+        finally:
+            for future in self._pending:
+                future.cancel()
+            self._pending.clear()
+            self.fileobj.close()
+            super().close()
@@ -1,6 +1,6 @@
 # ----------------------------------------------------------------------------------------------------
 #
-# Copyright (c) 2024, 2024, Oracle and/or its affiliates. All rights reserved.
+# Copyright (c) 2024, 2026, Oracle and/or its affiliates. All rights reserved.
 # DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
 #
 # This code is free software; you can redistribute it and/or modify it
@@ -24,6 +24,22 @@
 # ----------------------------------------------------------------------------------------------------
 #
 
+from __future__ import annotations
+
+__all__ = ["Daemon", "PersistentDaemonRegistry", "auth_header", "ping_daemon"]
+
+import hashlib
+import os
+import socket
+from contextlib import contextmanager
+from os.path import join
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 class Daemon:
     """
     Daemons are background processes used during the build process and
@@ -31,3 +47,86 @@ class Daemon:
     """
     def shutdown(self) -> None:
         pass
+
+# See:
+#   com.oracle.mxtool.compilerserver.CompilerDaemon.REQUEST_HEADER_PING
+#   com.oracle.mxtool.compilerserver.CompilerDaemon.RESPONSE_PONG
+#   com.oracle.mxtool.compilerserver.CompilerDaemon.REQUEST_HEADER_AUTH
+_request_ping = "MX DAEMON/PING"
+_response_pong = "MX DAEMON/PONG"
+_request_auth = "MX DAEMON/AUTH: "
+
+def auth_header(token: Optional[str]) -> bytes:
+    """
+    Gets the line that authenticates a connection to a persistent daemon that published `token`
+    (nothing if `token` is None).
+    """
+    return (_request_auth + token + '\n').encode('utf-8') if token is not None else b''
+
+def ping_daemon(port: int, token: Optional[str] = None, timeout: float = 5.0) -> bool:
+    """
+    Checks whether a daemon listening on `port` on the loopback interface responds to a ping.
+
+    :param token: the authentication token published by a persistent daemon
+    """
+    try:
+        with socket.create_connection(('127.0.0.1', port), timeout=timeout) as s:
+            s.sendall(auth_header(token) + (_request_ping + '\n').encode('utf-8'))
+            with s.makefile(encoding='utf-8') as f:
+                return f.readline().rstrip('\n') == _response_pong
+    except OSError:
+        return False
+
+class PersistentDaemonRegistry:
+    """
+    A directory in which daemons that outlive the mx process that started them publish the
+    port they listen on. A daemon is identified by a key derived from everything that
+    determines its behavior (e.g. the JDK and JVM arguments) and publishes its port, pid and
+    a random authentication token in ``<key>.port``. The token must be sent on every connection
+    to the daemon and the directory is only accessible by the current user, so other users of
+    the machine cannot use the daemon. Starting and discovering daemons is serialized between
+    mx processes by an exclusive lock on ``<key>.lock``.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @staticmethod
+    def is_supported() -> bool:
+        return fcntl is not None
+
+    @staticmethod
+    def key(components: List[str]) -> str:
+        return hashlib.sha256('\0'.join(components).encode('utf-8')).hexdigest()[:32]
+
+    def port_file(self, key: str) -> str:
+        return join(self.root, key + '.port')
+
+    def log_file(self, key: str) -> str:
+        return join(self.root, key + '.log')
+
+    @contextmanager
+    def locked(self, key: str) -> Iterator[None]:
+        os.makedirs(self.root, mode=0o700, exist_ok=True)
+        os.chmod(self.root, 0o700)
+        with open(join(self.root, key + '.lock'), 'w', encoding='utf-8') as fp:
+            fcntl.flock(fp, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fp, fcntl.LOCK_UN)
+
+    def lookup(self, key: str) -> Optional[Tuple[int, int, str]]:
+        """Gets the (port, pid, token) published for `key` or None if there is none."""
+        try:
+            with open(self.port_file(key), encoding='utf-8') as fp:
+                port, pid, token = fp.read().split()
+            return int(port), int(pid), token
+        except (OSError, ValueError):
+            return None
+
+    def remove(self, key: str) -> None:
+        try:
+            os.remove(self.port_file(key))
+        except FileNotFoundError:
+            pass
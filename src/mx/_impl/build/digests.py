@@ -0,0 +1,201 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+from __future__ import annotations
+
+__all__ = ["ContentDigests"]
+
+import hashlib
+import json
+import os
+import stat
+import time
+from os.path import exists, join, relpath
+from typing import Dict, Iterable, Optional, Tuple
+
+from .fileindex import INDEX_LOAD_ERRORS, is_racy
+from ..mx_util import SafeFileCreation
+
+Digests = Dict[str, Optional[str]]
+"""Map from a path or dependency name to its content digest (None if it does not exist)."""
+
+
+class ContentDigests:
+    """
+    The content digests of the inputs, outputs and dependencies of a build task at the
+    time of its last successful build.
+
+    To avoid re-reading files whose content cannot have changed, the digest of a file is
+    cached together with its mtime and size, unless the file was racy (see `is_racy`) when it
+    was hashed.
+    """
+
+    version = 1
+    _blockSize = 1024 * 1024
+
+    inputs: Optional[Digests]
+    outputs: Optional[Digests]
+    deps: Optional[Digests]
+
+    def __init__(self, path: str, baseDir: Optional[str] = None):
+        """
+        :param path: the file in which the digests are persisted
+        :param baseDir: the directory that output paths are relative to in `outputDigest`
+        """
+        self.path = path
+        self.baseDir = baseDir
+        self._fileCache: Dict[str, Tuple[int, int, str]] = {}
+        self._usedCache: Dict[str, Tuple[int, int, str]] = {}
+        self.inputs = None
+        self.outputs = None
+        self.deps = None
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as fp:
+                data = json.load(fp)
+            if data.get('version') != self.version:
+                return
+            self._fileCache = {p: (e[0], e[1], e[2]) for p, e in data['files'].items()}
+            self.inputs = data['inputs']
+            self.outputs = data['outputs']
+            self.deps = data['deps']
+        except INDEX_LOAD_ERRORS:
+            self._fileCache = {}
+            self.inputs = self.outputs = self.deps = None
+
+    def save(self, onlyIfChanged: bool = False) -> None:
+        """
+        Writes the recorded digests to disk.
+
+        :param onlyIfChanged: only write if digests were computed that were not cached before
+        """
+        if onlyIfChanged and not self._dirty:
+            return
+        self._dirty = False
+        data = {
+            'version': self.version,
+            'files': {p: list(e) for p, e in self._usedCache.items()},
+            'inputs': self.inputs,
+            'outputs': self.outputs,
+            'deps': self.deps,
+        }
+        with SafeFileCreation(self.path) as sfc:
+            with open(sfc.tmpPath, 'w', encoding='utf-8') as fp:
+                json.dump(data, fp)
+
+    def is_recorded(self) -> bool:
+        return self.outputs is not None
+
+    @property
+    def outputDigest(self) -> Optional[str]:
+        """
+        A digest summarizing all recorded outputs, used by dependents of the task.
+        It does not depend on the location of `baseDir`.
+        """
+        if self.outputs is None:
+            return None
+        if self.baseDir is None:
+            return ContentDigests.combine(self.outputs)
+        return ContentDigests.combine({relpath(p, self.baseDir).replace(os.sep, '/'): d for p, d in self.outputs.items()})
+
+    @staticmethod
+    def combine(digests: Digests) -> str:
+        h = hashlib.sha256()
+        for key in sorted(digests):
+            h.update(key.encode())
+            h.update(b'\0')
+            h.update((digests[key] or '-').encode())
+            h.update(b'\n')
+        return h.hexdigest()
+
+    def file_digest(self, path: str) -> Optional[str]:
+        """
+        Gets the digest of the contents of `path`. The digest of a directory covers the relative
+        paths and contents of all files below it. Returns None if `path` does not exist.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if stat.S_ISDIR(st.st_mode):
+            return self._dir_digest(path)
+        cached = self._fileCache.get(path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            self._usedCache[path] = cached
+            return cached[2]
+        h = hashlib.sha256()
+        with open(path, 'rb') as fp:
+            for block in iter(lambda: fp.read(self._blockSize), b''):
+                h.update(block)
+        digest = h.hexdigest()
+        if not is_racy(st.st_mtime_ns, time.time_ns()):
+            self._fileCache[path] = self._usedCache[path] = (st.st_mtime_ns, st.st_size, digest)
+            self._dirty = True
+        return digest
+
+    def _dir_digest(self, path: str) -> str:
+        entries = {}
+        for root, dirs, files in os.walk(path, followlinks=True):
+            dirs.sort()
+            for name in files:
+                f = join(root, name)
+                entries[relpath(f, path).replace(os.sep, '/')] = self.file_digest(f)
+        return 'dir:' + ContentDigests.combine(entries)
+
+    def digests(self, paths: Iterable[str]) -> Digests:
+        return {p: self.file_digest(p) for p in paths}
+
+    def find_change(self, inputs: Digests, outputs: Digests, deps: Digests) -> Optional[str]:
+        """
+        Compares the given digests with the recorded ones.
+        Returns a description of the first difference found or None if there is none.
+        """
+        for kind, current, recorded in (('dependency', deps, self.deps), ('input', inputs, self.inputs), ('output', outputs, self.outputs)):
+            if recorded is None:
+                return f'no recorded {kind} digests'
+            if current.keys() != recorded.keys():
+                changed = sorted(current.keys() ^ recorded.keys())
+                return f'{kind} {changed[0]} added or removed'
+            for key, digest in current.items():
+                if recorded[key] != digest:
+                    if digest is None:
+                        return f'{kind} {key} does not exist'
+                    return f'content of {kind} {key} changed'
+        return None
+
+    def record(self, inputs: Digests, outputs: Digests, deps: Digests) -> None:
+        self.inputs = inputs
+        self.outputs = outputs
+        self.deps = deps
+
+    def invalidate(self) -> None:
+        self.inputs = self.outputs = self.deps = None
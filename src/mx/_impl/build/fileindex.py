@@ -0,0 +1,224 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+from __future__ import annotations
+
+__all__ = ["FileStateIndex", "UpToDateState", "RACY_WINDOW_NS", "INDEX_LOAD_ERRORS", "is_racy"]
+
+import json
+import os
+import time
+from os.path import dirname, exists, join
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from ..mx_util import SafeFileCreation
+
+RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+"""
+Files and directories modified within this many nanoseconds of the time their state is recorded
+are not trusted, as a subsequent modification within the granularity of the file system's
+timestamps could go unnoticed (like git's "racy" index entries).
+"""
+
+INDEX_LOAD_ERRORS = (OSError, ValueError, KeyError, TypeError, IndexError)
+"""The errors raised while loading a persisted index that is missing, corrupt or has an unexpected layout."""
+
+
+def is_racy(mtime_ns: int, now_ns: int) -> bool:
+    """Determines if the state of a file last modified at `mtime_ns` that is recorded at `now_ns` cannot be trusted."""
+    return now_ns - mtime_ns < RACY_WINDOW_NS
+
+
+FileState = Tuple[int, int, int]
+"""(st_mtime_ns, st_size, st_ino) of a file."""
+
+
+def _file_state(st: os.stat_result) -> FileState:
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class UpToDateState(NamedTuple):
+    """The state of a build task's files at the time the task was found to be up to date."""
+
+    inputs: Dict[str, FileState]
+    outputDirs: Dict[str, int]
+    """mtime_ns of the directories containing the outputs. Deleting an output changes its directory's mtime."""
+    oldestOutput: Optional[float]
+    newestOutput: Optional[str]
+
+
+class FileStateIndex:
+    """
+    Persistent index of the files of a build task that avoids repeated directory listings
+    and per-file timestamp comparisons for tasks that are up to date.
+
+    It caches the listing of every directory walked with `walk`, which is reused as long as
+    the mtime of the directory does not change. It also records the (mtime, size, inode)
+    of every input of a task that was found to be up to date so that the next up-to-date check
+    only needs one stat call per input instead of comparing each input with its output.
+
+    Files and directories that are racy (see `is_racy`) when they are recorded are not trusted.
+    """
+
+    version = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self._dirs: Dict[str, Tuple[int, List[str], List[str]]] = {}
+        self._state: Optional[UpToDateState] = None
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as fp:
+                data = json.load(fp)
+            if data.get('version') != self.version:
+                return
+            self._dirs = {d: (e[0], e[1], e[2]) for d, e in data['dirs'].items()}
+            state = data.get('state')
+            if state:
+                self._state = UpToDateState({p: tuple(s) for p, s in state['inputs'].items()}, state['outputDirs'],
+                                            state['oldestOutput'], state['newestOutput'])
+        except INDEX_LOAD_ERRORS:
+            # A corrupt index is equivalent to no index
+            self._dirs = {}
+            self._state = None
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        state = self._state
+        data = {
+            'version': self.version,
+            'dirs': {d: list(e) for d, e in self._dirs.items()},
+            'state': None if state is None else {
+                'inputs': {p: list(s) for p, s in state.inputs.items()},
+                'outputDirs': state.outputDirs,
+                'oldestOutput': state.oldestOutput,
+                'newestOutput': state.newestOutput,
+            }
+        }
+        with SafeFileCreation(self.path) as sfc:
+            with open(sfc.tmpPath, 'w', encoding='utf-8') as fp:
+                json.dump(data, fp)
+        self._dirty = False
+
+    def walk(self, root: str) -> Iterator[Tuple[str, List[str]]]:
+        """
+        Walks the directory tree rooted at `root` like ``os.walk(root, followlinks=True)``,
+        yielding ``(dirpath, filenames)`` for each directory. The listing of a directory whose
+        mtime did not change since it was last walked is taken from the index.
+        """
+        now_ns = time.time_ns()
+        stack = [root]
+        while stack:
+            d = stack.pop()
+            try:
+                mtime_ns = os.stat(d).st_mtime_ns
+            except OSError:
+                continue
+            cached = self._dirs.get(d)
+            if cached is not None and cached[0] == mtime_ns:
+                files, subdirs = cached[1], cached[2]
+            else:
+                files, subdirs = [], []
+                try:
+                    with os.scandir(d) as entries:
+                        for entry in entries:
+                            (subdirs if entry.is_dir() else files).append(entry.name)
+                except OSError:
+                    continue
+                if is_racy(mtime_ns, now_ns):
+                    self._dirs.pop(d, None)
+                else:
+                    self._dirs[d] = (mtime_ns, files, subdirs)
+                self._dirty = True
+            yield d, files
+            stack.extend(join(d, s) for s in reversed(subdirs))
+
+    def unchanged_state(self, inputs: Iterable[str]) -> Optional[UpToDateState]:
+        """
+        Gets the recorded up-to-date state if the set of `inputs`, the state of each input
+        and the output directories are all unchanged since the state was recorded.
+        """
+        state = self._state
+        if state is None:
+            return None
+        count = 0
+        for path in inputs:
+            count += 1
+            recorded = state.inputs.get(path)
+            if recorded is None:
+                return None
+            try:
+                if _file_state(os.stat(path)) != recorded:
+                    return None
+            except OSError:
+                return None
+        if count != len(state.inputs):
+            return None
+        for d, mtime_ns in state.outputDirs.items():
+            try:
+                if os.stat(d).st_mtime_ns != mtime_ns:
+                    return None
+            except OSError:
+                return None
+        return state
+
+    def record_state(self, inputs: Iterable[str], outputs: Iterable[str], oldestOutput: Optional[float], newestOutput: Optional[str]) -> None:
+        """
+        Records that the task is up to date with respect to `inputs` and `outputs`.
+        Nothing is recorded if any input was modified too recently to be trusted.
+        """
+        now_ns = time.time_ns()
+        inputStates = {}
+        outputDirs = {}
+        try:
+            for path in inputs:
+                s = _file_state(os.stat(path))
+                if is_racy(s[0], now_ns):
+                    self.invalidate()
+                    return
+                inputStates[path] = s
+            for path in outputs:
+                d = dirname(path)
+                if d not in outputDirs:
+                    outputDirs[d] = os.stat(d).st_mtime_ns
+        except OSError:
+            self.invalidate()
+            return
+        self._state = UpToDateState(inputStates, outputDirs, oldestOutput, newestOutput)
+        self._dirty = True
+
+    def invalidate(self) -> None:
+        """Forgets the recorded up-to-date state."""
+        if self._state is not None:
+            self._state = None
+            self._dirty = True
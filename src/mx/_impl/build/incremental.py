@@ -0,0 +1,235 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+from __future__ import annotations
+
+__all__ = ["IncrementalCompilation", "JavaDependencyGraph"]
+
+import json
+import os
+import time
+from os.path import dirname, exists, join, relpath
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .classfile import ClassFormatError, parse_class_file, source_key
+from .fileindex import INDEX_LOAD_ERRORS, is_racy
+from ..mx_util import SafeFileCreation
+
+
+class IncrementalCompilation(NamedTuple):
+    """The work for compiling a Java project incrementally."""
+
+    sources: List[str]
+    """The sources to compile."""
+    staleClassFiles: List[str]
+    """The class files (relative to the output directory) to delete before compiling."""
+    deletedSources: List[str]
+
+
+class _ClassEntry(NamedTuple):
+    source: str
+    file: str
+    """The class file relative to the output directory, using ``/`` as separator."""
+    supertypes: List[str]
+    """The supertypes declared in the same project."""
+    references: List[str]
+    """The classes of the same project referenced by the class."""
+    hasConstants: bool
+
+
+class JavaDependencyGraph:
+    """
+    The class level dependency graph of a Java project as of its last successful compilation.
+
+    It is derived from the constant pools of the class files produced by the compiler and
+    is used to determine which sources need to be recompiled after some sources changed:
+    the changed sources, the sources of all subtypes of the classes declared in them and
+    the sources of all classes referencing any of these classes. Since javac inlines compile
+    time constants, a change to a class declaring such constants requires a full compilation.
+
+    Sources that are racy (see `is_racy`) when a compilation is recorded are considered changed
+    by the next compilation.
+    """
+
+    version = 1
+    maxAffectedFraction = 0.5
+    """A full compilation is performed if more than this fraction of the sources would be recompiled."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.key: Optional[str] = None
+        self._sources: Dict[str, Tuple[int, int]] = {}
+        self._classes: Dict[str, _ClassEntry] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as fp:
+                data = json.load(fp)
+            if data.get('version') != self.version:
+                return
+            self.key = data['key']
+            self._sources = {s: (e[0], e[1]) for s, e in data['sources'].items()}
+            self._classes = {c: _ClassEntry(*e) for c, e in data['classes'].items()}
+        except INDEX_LOAD_ERRORS:
+            self.invalidate()
+
+    def save(self) -> None:
+        data = {
+            'version': self.version,
+            'key': self.key,
+            'sources': {s: list(e) for s, e in self._sources.items()},
+            'classes': {c: list(e) for c, e in self._classes.items()},
+        }
+        with SafeFileCreation(self.path) as sfc:
+            with open(sfc.tmpPath, 'w', encoding='utf-8') as fp:
+                json.dump(data, fp)
+
+    def invalidate(self) -> None:
+        self.key = None
+        self._sources = {}
+        self._classes = {}
+
+    @staticmethod
+    def _source_state(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def plan(self, key: str, sources: Iterable[str]) -> Tuple[Optional[IncrementalCompilation], str]:
+        """
+        Determines what needs to be compiled for the current `sources` of the project.
+
+        :param key: a digest of everything besides the sources that the compilation depends on
+               (e.g. the compiler, its options and the class path)
+        :return: the incremental compilation to perform and a description of it, or None
+                 and the reason why a full compilation is required
+        """
+        if self.key is None:
+            return None, 'no dependency graph recorded'
+        if key != self.key:
+            return None, 'compiler configuration or class path changed'
+        sources = list(sources)
+        changed = {s for s in sources if self._sources.get(s) is None or self._source_state(s) != self._sources[s]}
+        deleted = set(self._sources).union(e.source for e in self._classes.values()) - set(sources)
+        if not changed and not deleted:
+            return None, 'no source changed'
+
+        subtypes: Dict[str, List[str]] = {}
+        referrers: Dict[str, List[str]] = {}
+        for name, entry in self._classes.items():
+            for t in entry.supertypes:
+                subtypes.setdefault(t, []).append(name)
+            for r in entry.references:
+                referrers.setdefault(r, []).append(name)
+
+        changedClasses = [name for name, entry in self._classes.items() if entry.source in changed or entry.source in deleted]
+        for name in changedClasses:
+            if self._classes[name].hasConstants:
+                return None, f'{name.replace("/", ".")} declares compile time constants'
+        affectedTypes: Set[str] = set(changedClasses)
+        worklist = list(changedClasses)
+        while worklist:
+            for sub in subtypes.get(worklist.pop(), []):
+                if sub not in affectedTypes:
+                    affectedTypes.add(sub)
+                    worklist.append(sub)
+        recompile = set(changed)
+        for name in affectedTypes:
+            recompile.add(self._classes[name].source)
+            for r in referrers.get(name, []):
+                recompile.add(self._classes[r].source)
+        recompile -= deleted
+        if len(recompile) > self.maxAffectedFraction * len(sources):
+            return None, f'{len(recompile)} of {len(sources)} sources affected'
+        stale = sorted(entry.file for entry in self._classes.values() if entry.source in recompile or entry.source in deleted)
+        return IncrementalCompilation(sorted(recompile), stale, sorted(deleted)), f'{len(recompile)} of {len(sources)} sources affected'
+
+    def record(self, key: str, outputDir: str, javafiles: Dict[str, str], compiled: Optional[Iterable[str]] = None,
+               deleted: Iterable[str] = ()) -> None:
+        """
+        Updates the graph after a successful compilation.
+
+        :param outputDir: the directory containing the class files of the project
+        :param javafiles: map from each source of the project to the path of its top level class file
+        :param compiled: the sources that were compiled or None if all sources were compiled
+        :param deleted: sources that were deleted since the graph was last recorded
+        """
+        owners = {}
+        for source, classfile in javafiles.items():
+            owners[(dirname(relpath(classfile, outputDir)).replace(os.sep, '/'), os.path.basename(source))] = source
+        if compiled is None:
+            compiled = set(javafiles)
+            self._classes = {}
+            self._sources = {}
+            packageDirs = [outputDir]
+        else:
+            compiled = set(compiled)
+            removed = compiled.union(deleted)
+            self._classes = {name: entry for name, entry in self._classes.items() if entry.source not in removed}
+            packageDirs = sorted({dirname(javafiles[s]) for s in compiled})
+            for s in deleted:
+                self._sources.pop(s, None)
+
+        parsed = {}
+        for d in packageDirs:
+            walk = os.walk(d) if d == outputDir else [(d, [], os.listdir(d) if exists(d) else [])]
+            for root, _, files in walk:
+                for name in files:
+                    if not name.endswith('.class'):
+                        continue
+                    path = join(root, name)
+                    rel = relpath(path, outputDir).replace(os.sep, '/')
+                    try:
+                        with open(path, 'rb') as fp:
+                            classFile = parse_class_file(fp.read())
+                    except (OSError, ClassFormatError):
+                        continue
+                    source = owners.get(source_key(rel, classFile))
+                    if source in compiled:
+                        parsed[classFile.name] = (source, rel, classFile)
+
+        known = set(self._classes).union(parsed)
+        for name, (source, rel, classFile) in parsed.items():
+            self._classes[name] = _ClassEntry(source, rel,
+                                              [t for t in classFile.supertypes if t in known],
+                                              sorted(r for r in classFile.references if r in known),
+                                              classFile.hasConstants)
+        now_ns = time.time_ns()
+        for s in compiled:
+            state = self._source_state(s)
+            if state is None or is_racy(state[0], now_ns):
+                # Forces the source to be recompiled next time
+                self._sources.pop(s, None)
+            else:
+                self._sources[s] = state
+        self.key = key
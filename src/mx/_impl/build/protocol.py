@@ -0,0 +1,178 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+from __future__ import annotations
+
+__all__ = ["Diagnostic", "MultiplexedConnection"]
+
+import itertools
+import queue
+import socket
+import struct
+import threading
+from typing import BinaryIO, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .daemon import auth_header
+
+# See:
+#   com.oracle.mxtool.compilerserver.CompilerDaemon.REQUEST_HEADER_MUX
+#   com.oracle.mxtool.compilerserver.CompilerDaemon.RESPONSE_MUX
+#   com.oracle.mxtool.compilerserver.CompilerDaemon.FRAME_*
+_request_mux = "MX DAEMON/MUX"
+_response_mux = "MX DAEMON/MUX-OK"
+
+FRAME_COMPILE = 1
+FRAME_OUTPUT = 2
+FRAME_DIAGNOSTIC = 3
+FRAME_DONE = 4
+
+_frame_header = struct.Struct('>IIB')
+"""Payload length, request id and frame type."""
+
+
+class Diagnostic(NamedTuple):
+    """An error or warning reported by a compiler."""
+
+    kind: str
+    """"error", "warning" or "note"."""
+    file: str
+    line: int
+    message: str
+
+    def __str__(self) -> str:
+        return f'{self.file}:{self.line}: {self.kind}: {self.message}'
+
+
+def write_frame(sock: socket.socket, requestId: int, frameType: int, payload: bytes) -> None:
+    sock.sendall(_frame_header.pack(len(payload), requestId, frameType) + payload)
+
+
+def read_frame(stream: BinaryIO) -> Optional[Tuple[int, int, bytes]]:
+    """Reads a frame from `stream`, returning (request id, frame type, payload) or None at the end of the stream."""
+    header = stream.read(_frame_header.size)
+    if len(header) < _frame_header.size:
+        return None
+    length, requestId, frameType = _frame_header.unpack(header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    return requestId, frameType, payload
+
+
+class MultiplexedConnection:
+    """
+    A connection to a compiler daemon over which any number of compilations can be in flight at
+    the same time.
+
+    After a handshake, both sides exchange frames consisting of a header (payload length, request
+    id and frame type) followed by a UTF-8 payload. Each compile request gets a new id. The daemon
+    runs the requests concurrently and answers with `FRAME_OUTPUT` frames streaming the output of
+    the compiler line by line, one `FRAME_DIAGNOSTIC` frame per error or warning and a final
+    `FRAME_DONE` frame with the exit code. A reader thread dispatches the frames to the threads
+    waiting in `compile`.
+    """
+
+    def __init__(self, sock: socket.socket, token: Optional[str] = None):
+        """
+        :param token: the authentication token published by a persistent daemon
+        """
+        self._socket = sock
+        self._input = sock.makefile('rb')
+        sock.sendall(auth_header(token) + (_request_mux + '\n').encode('utf-8'))
+        ack = self._input.readline().decode('utf-8').rstrip('\n')
+        if ack != _response_mux:
+            sock.close()
+            raise ConnectionError(f'compiler daemon does not support multiplexed connections (response: {ack!r})')
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._sendLock = threading.Lock()
+        self._pending: Dict[int, queue.Queue] = {}
+        self.closed = False
+        reader = threading.Thread(target=self._read, name='compiler-daemon-reader', daemon=True)
+        reader.start()
+
+    def _read(self) -> None:
+        try:
+            while True:
+                frame = read_frame(self._input)
+                if frame is None:
+                    break
+                requestId, frameType, payload = frame
+                with self._lock:
+                    q = self._pending.get(requestId)
+                if q is not None:
+                    q.put((frameType, payload))
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self.closed = True
+                pending = list(self._pending.values())
+            for q in pending:
+                q.put(None)
+
+    def compile(self, args: List[str], onOutput: Callable[[str], None]) -> Tuple[int, List[Diagnostic]]:
+        """
+        Runs a compilation in the daemon.
+
+        :param onOutput: called with every line of output of the compiler
+        :return: the exit code of the compiler (-1 if the connection was lost) and the reported diagnostics
+        """
+        q = queue.Queue()
+        with self._lock:
+            if self.closed:
+                raise ConnectionError('connection to compiler daemon is closed')
+            requestId = next(self._ids)
+            self._pending[requestId] = q
+        diagnostics = []
+        try:
+            with self._sendLock:
+                write_frame(self._socket, requestId, FRAME_COMPILE, '\0'.join(args).encode('utf-8'))
+            while True:
+                frame = q.get()
+                if frame is None:
+                    return -1, diagnostics
+                frameType, payload = frame
+                text = payload.decode('utf-8')
+                if frameType == FRAME_OUTPUT:
+                    onOutput(text)
+                elif frameType == FRAME_DIAGNOSTIC:
+                    kind, file, line, message = text.split('\0', 3)
+                    diagnostics.append(Diagnostic(kind, file, int(line), message))
+                elif frameType == FRAME_DONE:
+                    return int(text), diagnostics
+        finally:
+            with self._lock:
+                del self._pending[requestId]
+
+    def close(self) -> None:
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
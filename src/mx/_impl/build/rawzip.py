@@ -0,0 +1,137 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+from __future__ import annotations
+
+__all__ = ["RawZipReader", "write_raw_entry"]
+
+import struct
+import zipfile
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+_local_header = struct.Struct('<4s2B4HL2L2H')
+_local_header_signature = b'PK\003\004'
+_zip64_extra_id = 0x0001
+_data_descriptor_flag = 0x08
+_copy_block_size = 1024 * 1024
+
+
+def _strip_zip64_extra(extra: bytes) -> bytes:
+    """Removes the ZIP64 extra field from `extra` since `zipfile` adds a new one when needed."""
+    result = []
+    i = 0
+    while i + 4 <= len(extra):
+        header_id, size = struct.unpack_from('<HH', extra, i)
+        if header_id != _zip64_extra_id:
+            result.append(extra[i:i + 4 + size])
+        i += 4 + size
+    return b''.join(result)
+
+
+class RawZipReader:
+    """
+    Reads the entries of a zip file in their compressed form so that they can be added to
+    another zip file with `write_raw_entry` without decompressing and recompressing them.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with zipfile.ZipFile(path) as zf:
+            self._infos: Dict[str, zipfile.ZipInfo] = {info.filename: info for info in zf.infolist()}
+        self._fp: BinaryIO = open(path, 'rb')
+
+    def __enter__(self) -> RawZipReader:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._fp.close()
+
+    def infolist(self) -> List[zipfile.ZipInfo]:
+        return list(self._infos.values())
+
+    def getinfo(self, name: str) -> Optional[zipfile.ZipInfo]:
+        return self._infos.get(name)
+
+    def data_range(self, info: zipfile.ZipInfo) -> Tuple[int, int]:
+        """Gets the offset and length of the compressed data of `info`."""
+        self._fp.seek(info.header_offset)
+        header = _local_header.unpack(self._fp.read(_local_header.size))
+        if header[0] != _local_header_signature:
+            raise zipfile.BadZipFile(f'Bad local file header for {info.filename} in {self.path}')
+        nameLength, extraLength = header[10], header[11]
+        return info.header_offset + _local_header.size + nameLength + extraLength, info.compress_size
+
+    def copy_to(self, info: zipfile.ZipInfo, out: zipfile.ZipFile, date_time: Optional[Tuple[int, ...]] = None) -> zipfile.ZipInfo:
+        """
+        Adds the entry for `info` to `out` without recompressing it.
+
+        :param date_time: the modification time of the new entry, the time of `info` if None
+        """
+        offset, length = self.data_range(info)
+        zinfo = zipfile.ZipInfo(info.filename, date_time or info.date_time)
+        zinfo.compress_type = info.compress_type
+        zinfo.external_attr = info.external_attr
+        zinfo.create_system = info.create_system
+        zinfo.extra = _strip_zip64_extra(info.extra)
+        zinfo.flag_bits = info.flag_bits & ~_data_descriptor_flag
+        zinfo.CRC = info.CRC
+        zinfo.compress_size = info.compress_size
+        zinfo.file_size = info.file_size
+        self._fp.seek(offset)
+        write_raw_entry(out, zinfo, self._fp, length)
+        return zinfo
+
+
+def write_raw_entry(out: zipfile.ZipFile, zinfo: zipfile.ZipInfo, data: BinaryIO, length: int) -> None:
+    """
+    Adds an entry to `out` whose compressed data are the next `length` bytes of `data`.
+    The ``CRC``, ``compress_size``, ``file_size`` and ``compress_type`` of `zinfo` must
+    describe that data.
+    """
+    # zipfile has no public API for this, so this replicates what ZipFile.writestr does
+    # after compressing the data
+    with out._lock:  # pylint: disable=protected-access
+        out._writecheck(zinfo)  # pylint: disable=protected-access
+        out._didModify = True  # pylint: disable=protected-access
+        # Use the same estimate as ZipFile.open(..., 'w') so that the local header is identical
+        zip64 = zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+        zinfo.header_offset = out.fp.tell()
+        out.fp.write(zinfo.FileHeader(zip64))
+        remaining = length
+        while remaining > 0:
+            block = data.read(min(_copy_block_size, remaining))
+            if not block:
+                raise zipfile.BadZipFile(f'Truncated data for {zinfo.filename}')
+            out.fp.write(block)
+            remaining -= len(block)
+        out.filelist.append(zinfo)
+        out.NameToInfo[zinfo.filename] = zinfo
+        out.start_dir = out.fp.tell()
@@ -1,7 +1,7 @@
 #
 # ----------------------------------------------------------------------------------------------------
 #
-# Copyright (c) 2024, 2024, Oracle and/or its affiliates. All rights reserved.
+# Copyright (c) 2024, 2026, Oracle and/or its affiliates. All rights reserved.
 # DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
 #
 # This code is free software; you can redistribute it and/or modify it
@@ -37,6 +37,12 @@ def write_task_report(f, task):
     f.write('\n<div class="task">\n')
     f.write(f'    <h2>{task.name}</h2>\n')
     f.write(f'    <p class="result {task.status}">{task.statusInfo}</p>\n')
+    diagnostics = getattr(task, 'diagnostics', [])
+    if diagnostics:
+        f.write('    <table class="diagnostics">\n')
+        for d in diagnostics:
+            f.write(f'        <tr class="{html.escape(d.kind)}"><td>{html.escape(d.kind)}</td><td>{html.escape(d.file)}:{d.line}</td><td>{html.escape(d.message)}</td></tr>\n')
+        f.write('    </table>\n')
     l = str(task._log).strip()
     if l:
         f.write('        <span class="log"><pre>\n')
@@ -54,6 +60,9 @@ def write_style(f):
         .skipped:before { content: "skipped"; margin-right: 2em; color: blue; }
         .log:before { content: "build log:"; }
         .log pre { border: 1px inset; padding: 5px; max-height: 350px; overflow: auto; }
+        .diagnostics td { padding-right: 1em; font-family: monospace; }
+        .diagnostics .error td:first-child { color: red; }
+        .diagnostics .warning td:first-child { color: orange; }
     </style>
     ''')
 
@@ -0,0 +1,181 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+from __future__ import annotations
+
+__all__ = ["TaskScheduler"]
+
+import heapq
+import queue
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .tasks import Task
+
+
+class TaskScheduler:
+    """
+    Decides the order in which the tasks of a parallel build are started.
+
+    Every task is weighted with its expected cost and prioritized by the length of the
+    longest weighted path from the task to the end of the build (the critical path).
+    Tasks whose dependencies are all finished are kept in a heap ordered by that priority
+    so that the tasks that delay the build the most are started first.
+
+    Instead of polling, the main thread blocks in `wait` until a running task reports its
+    completion through `completed`.
+    """
+
+    def __init__(self, tasks: Sequence[Task], cpus: int, cost: Optional[Callable[[Task], float]] = None,
+                 demand: Optional[Callable[[Task], int]] = None, aliases: Optional[Dict[Task, Task]] = None):
+        """
+        :param tasks: the tasks to schedule, in an order where dependencies come before their dependents
+        :param cpus: the number of CPUs that may be occupied by running tasks at the same time
+        :param cost: function computing the expected cost of a task (defaults to `Task.build_time`)
+        :param demand: function computing the number of CPUs a running task occupies (defaults to `Task.parallelism`)
+        :param aliases: map from tasks that are not scheduled themselves to the scheduled task executing
+               them (e.g. a batch of Java compilations). A dependency on such a task is a dependency on its alias.
+        """
+        self.cpus = cpus
+        self._cost = cost or (lambda t: t.build_time)
+        self._demand = {t: (demand(t) if demand else t.parallelism) for t in tasks}
+        self._index: Dict[Task, int] = {t: i for i, t in enumerate(tasks)}
+        self._dependents: Dict[Task, List[Task]] = {t: [] for t in tasks}
+        self._pendingDeps: Dict[Task, int] = {}
+        self._scheduledDeps: Dict[Task, List[Task]] = {}
+        aliases = aliases or {}
+        for t in tasks:
+            scheduledDeps = []
+            for d in t.deps:
+                d = aliases.get(d, d)
+                if d in self._index and d is not t and d not in scheduledDeps:
+                    scheduledDeps.append(d)
+            self._scheduledDeps[t] = scheduledDeps
+            self._pendingDeps[t] = len(scheduledDeps)
+            for d in scheduledDeps:
+                self._dependents[d].append(t)
+        self.priorities = self._compute_priorities(tasks)
+        self._ready: List = []
+        self._waiting = set(tasks)
+        self._running: List[Task] = []
+        self._completions = queue.Queue()
+        for t in tasks:
+            if self._pendingDeps[t] == 0:
+                self._make_ready(t)
+
+    def _compute_priorities(self, tasks: Sequence[Task]) -> Dict[Task, float]:
+        # Visit the tasks in reverse topological order so that the priority of every
+        # dependent is known before the priority of its dependencies is computed.
+        remaining = {t: len(self._dependents[t]) for t in tasks}
+        worklist = [t for t in tasks if remaining[t] == 0]
+        priorities = {}
+        while worklist:
+            t = worklist.pop()
+            longestTail = max((priorities[d] for d in self._dependents[t]), default=0)
+            priorities[t] = max(self._cost(t), 0) + longestTail
+            for dep in self._scheduledDeps[t]:
+                if dep in remaining:
+                    remaining[dep] -= 1
+                    if remaining[dep] == 0:
+                        worklist.append(dep)
+        assert len(priorities) == len(tasks), "cycle in build plan"
+        return priorities
+
+    def _make_ready(self, task: Task) -> None:
+        heapq.heappush(self._ready, (-self.priorities[task], self._index[task], task))
+
+    def has_pending(self) -> bool:
+        """Returns whether there are tasks that have not been started yet."""
+        return len(self._waiting) != 0
+
+    def pending(self) -> List[Task]:
+        """Gets the tasks that have not been started yet."""
+        return list(self._waiting)
+
+    def running(self) -> List[Task]:
+        """Gets the tasks that have been started but whose completion has not been processed yet."""
+        return list(self._running)
+
+    def active_cpus(self) -> int:
+        return sum(self._demand.get(t, t.parallelism) for t in self._running)
+
+    def take_ready(self) -> List[Task]:
+        """
+        Removes the tasks that can be started now from the ready queue, highest priority first.
+        A task that does not fit into the remaining CPUs does not block tasks with a lower
+        priority that do fit.
+        """
+        free = self.cpus - self.active_cpus()
+        taken = []
+        skipped = []
+        while self._ready and free > 0:
+            entry = heapq.heappop(self._ready)
+            task = entry[2]
+            if self._demand[task] <= free:
+                free -= self._demand[task]
+                self._waiting.discard(task)
+                taken.append(task)
+            else:
+                skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(self._ready, entry)
+        return taken
+
+    def started(self, task: Task) -> None:
+        """Records that `task` is running and occupies its CPUs until `finished` is called."""
+        self._running.append(task)
+
+    def finished(self, task: Task) -> None:
+        """
+        Records that `task` is done (or was skipped) and makes dependents whose
+        dependencies are now all finished ready.
+        """
+        self._waiting.discard(task)
+        if task in self._running:
+            self._running.remove(task)
+        for dependent in self._dependents.get(task, []):
+            self._pendingDeps[dependent] -= 1
+            if self._pendingDeps[dependent] == 0:
+                self._make_ready(dependent)
+
+    def completed(self, task: Task) -> None:
+        """Called from the thread executing `task` once it is done. Wakes up `wait`."""
+        self._completions.put(task)
+
+    def wait(self, timeout: Optional[float] = None) -> List[Task]:
+        """
+        Blocks until at least one running task has completed or `timeout` seconds have passed.
+
+        :return: the completed tasks (possibly empty if the timeout expired)
+        """
+        done = []
+        try:
+            done.append(self._completions.get(timeout=timeout))
+            while True:
+                done.append(self._completions.get_nowait())
+        except queue.Empty:
+            pass
+        return done
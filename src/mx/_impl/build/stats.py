@@ -0,0 +1,201 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+from __future__ import annotations
+
+__all__ = ["BuildStatsDatabase", "TaskStat"]
+
+import json
+import math
+import os
+import statistics
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from ..mx_util import SafeFileCreation, ensure_dirname_exists
+from ..support.logging import logv
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class TaskStat(NamedTuple):
+    """The measurements for one execution of a build task."""
+
+    task: str
+    jdk: str
+    config: str
+    start: float
+    end: float
+    cpu: float
+    """CPU time in seconds spent in the task's thread and the subprocesses it waited for."""
+    maxrss: int
+    """Peak resident set size in kilobytes of the largest subprocess of the task (0 if unknown)."""
+
+    @property
+    def duration(self) -> float:
+        return max(self.end - self.start, 0.0)
+
+
+class BuildStatsDatabase:
+    """
+    A persistent record of how long build tasks took in previous builds.
+
+    Measurements are appended to a file with one JSON object per line, so concurrent builds
+    never have to rewrite each other's data. The file is compacted when it has grown to
+    contain many more samples than are retained per task. Appending and compacting are
+    serialized between builds by an exclusive lock on ``<path>.lock`` so that a compaction
+    does not drop the measurements appended by a concurrent build.
+    """
+
+    samplesPerKey = 5
+    """The number of most recent samples used for the estimates of a (task, jdk, config) key."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._samples: Dict[Tuple[str, str, str], List[TaskStat]] = {}
+        self._byTask: Dict[str, List[TaskStat]] = {}
+        self._lines = 0
+        self._new: List[TaskStat] = []
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as fp:
+            for line in fp:
+                self._lines += 1
+                try:
+                    stat = TaskStat(**json.loads(line))
+                except (ValueError, TypeError):
+                    # Tolerate lines truncated by an interrupted build
+                    continue
+                self._add(stat)
+
+    def _add(self, stat: TaskStat) -> None:
+        samples = self._samples.setdefault((stat.task, stat.jdk, stat.config), [])
+        samples.append(stat)
+        del samples[:-self.samplesPerKey]
+        samples = self._byTask.setdefault(stat.task, [])
+        samples.append(stat)
+        del samples[:-self.samplesPerKey]
+
+    def record(self, stat: TaskStat) -> None:
+        """Adds a measurement. It is written to disk by `flush`."""
+        self._add(stat)
+        self._new.append(stat)
+
+    def _samples_for(self, task: str, jdk: str, config: str) -> List[TaskStat]:
+        return self._samples.get((task, jdk, config)) or self._byTask.get(task, [])
+
+    def estimated_duration(self, task: str, jdk: str, config: str) -> Optional[float]:
+        """
+        Gets the expected wall clock time in seconds of `task`, based on the most recent
+        samples for the same JDK and configuration, or for any JDK and configuration if
+        there are none. Returns None if the task was never measured.
+        """
+        samples = self._samples_for(task, jdk, config)
+        if not samples:
+            return None
+        return statistics.median(s.duration for s in samples)
+
+    def estimated_cpus(self, task: str, jdk: str, config: str) -> Optional[float]:
+        """
+        Gets the average number of CPUs `task` kept busy while it was running,
+        or None if the task was never measured.
+        """
+        samples = self._samples_for(task, jdk, config)
+        duration = sum(s.duration for s in samples)
+        if not samples or duration <= 0:
+            return None
+        return sum(s.cpu for s in samples) / duration
+
+    def cost_estimator(self, tasks, jdk: str, config: str, keyOf, staticCost):
+        """
+        Creates a function that estimates the cost of a task in seconds.
+
+        Tasks without measurements are estimated by scaling their static cost (see
+        `Task.build_time`) with the median seconds per static cost unit of the measured
+        tasks in `tasks`.
+
+        :param keyOf: function computing the database key of a task
+        :param staticCost: function computing the static cost of a task
+        """
+        ratios = []
+        for t in tasks:
+            measured = self.estimated_duration(keyOf(t), jdk, config)
+            if measured is not None and staticCost(t) > 0:
+                ratios.append(measured / staticCost(t))
+        secondsPerUnit = statistics.median(ratios) if ratios else 1.0
+
+        def estimate(task):
+            measured = self.estimated_duration(keyOf(task), jdk, config)
+            if measured is not None:
+                return measured
+            return staticCost(task) * secondsPerUnit
+        return estimate
+
+    def cpu_demand_estimator(self, jdk: str, config: str, keyOf):
+        """
+        Creates a function that estimates how many CPUs a running task occupies.
+        The estimate never exceeds the parallelism declared by the task.
+        """
+        def demand(task):
+            cpus = self.estimated_cpus(keyOf(task), jdk, config)
+            if cpus is None:
+                return task.parallelism
+            return max(1, min(task.parallelism, math.ceil(cpus)))
+        return demand
+
+    def flush(self) -> None:
+        """Appends new measurements to the database file, compacting it if it became too large."""
+        if not self._new:
+            return
+        ensure_dirname_exists(self.path)
+        with open(self.path + '.lock', 'ab') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            retained = sum(len(s) for s in self._samples.values())
+            if self._lines + len(self._new) > 4 * max(retained, 100):
+                logv(f'Compacting build statistics in {self.path}')
+                # Reload to include the measurements appended by other builds since this database was loaded
+                self._samples, self._byTask, self._lines = {}, {}, 0
+                self._load()
+                for stat in self._new:
+                    self._add(stat)
+                with SafeFileCreation(self.path) as sfc:
+                    with open(sfc.tmpPath, 'w', encoding='utf-8') as fp:
+                        for samples in self._samples.values():
+                            for stat in samples:
+                                fp.write(json.dumps(stat._asdict()) + '\n')
+                self._lines = sum(len(s) for s in self._samples.values())
+            else:
+                with open(self.path, 'a', encoding='utf-8') as fp:
+                    fp.write(''.join(json.dumps(stat._asdict()) + '\n' for stat in self._new))
+                self._lines += len(self._new)
+        self._new = []
@@ -36,11 +36,13 @@ import datetime, time, os, sys, json
 import multiprocessing.dummy as multiprocessing
 from abc import abstractmethod
 from os import path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from mx._impl.support.timestampfile import TimeStampFile
 
 from .task import Args, Dependency, Task
+from ..cache import BuildCache, build_cache_enabled
+from ..digests import ContentDigests
 from ...mx_util import SafeFileCreation
 from ...support.envvars import get_env
 from ...support.logging import abort, log, logv, logvv, nyi, warn
@@ -83,6 +85,9 @@ class BuildTask(Buildable, Task):
         self._saved_config_path = path.join(subject.suite.get_mx_output_dir(), 'savedConfig', type(subject).__name__,
                                             subject._extra_artifact_discriminant(), self.name)
         self._cached_build_state: Optional[Tuple[bool, str | None]] = None
+        self._contentDigests: Optional[ContentDigests] = None
+        self._buildCacheKey: Optional[str] = None
+        self._depAbis: Optional[Dict[str, str]] = None
 
     def _get_config(self) -> dict:
         """
@@ -133,15 +138,24 @@ class BuildTask(Buildable, Task):
                 self.clean(forBuild=True)
             start_time = time.time()
             self.logBuild(reason)
+            restored = None
             try:
-                _built = self.build()
+                if self._use_build_cache():
+                    restored = self._restore_from_build_cache()
+                _built = True if restored else self.build()
             except:
                 # In concurrent builds, this helps identify on the console which build failed
                 log(self._timestamp() + f"{self}: Failed due to error: {sys.exc_info()[1]}")
                 raise
             self._persist_config()
+            if self.usesDependencyAbi():
+                self._record_dep_abis()
             # The build task is `built` if the `build()` function returns True or None (legacy)
             self.built = _built or _built is None
+            if self.built and self._use_content_digests():
+                self._record_content_digests(afterBuild=True)
+                if not restored and self._buildCacheKey is not None:
+                    self._store_in_build_cache()
             self.logBuildDone(time.time() - start_time)
             logv(f'Finished {self}')
         else:
@@ -163,8 +177,12 @@ class BuildTask(Buildable, Task):
         if self.args.clean and not self.cleanForbidden():
             buildNeeded = True
             reason = 'clean'
+        if not buildNeeded and not self.args.force and self._use_content_digests():
+            contentState = self._computeContentBuildState()
+            if contentState is not None:
+                return contentState
         if not buildNeeded:
-            updated = [dep for dep in self.deps if getattr(dep, 'built', False)]
+            updated = [dep for dep in self.deps if getattr(dep, 'built', False) and not self._dep_abi_unchanged(dep)]
             if updated:
                 buildNeeded = True
                 if not _opts.verbose:
@@ -178,6 +196,9 @@ class BuildTask(Buildable, Task):
             newestInput = None
             newestInputDep = None
             for dep in self.deps:
+                if self._dep_abi_unchanged(dep):
+                    logvv(f'Ignoring outputs of {dep.subject.name} for {self.subject.name} as its ABI is unchanged')
+                    continue
                 depNewestOutput = getattr(dep, 'newestOutput', lambda: None)()
                 if depNewestOutput and (not newestInput or depNewestOutput.isNewerThan(newestInput)):
                     newestInput = depNewestOutput
@@ -197,8 +218,221 @@ class BuildTask(Buildable, Task):
             if __name__ != self.__module__ and not self.subject.suite.getMxCompatibility().newestInputIsTimeStampFile():
                 newestInput = newestInput.timestamp if newestInput else float(0)
             buildNeeded, reason = self.needsBuild(newestInput)
+            if not buildNeeded and self._use_content_digests() and not self._content_digests().is_recorded():
+                # Up to date according to timestamps: remember the current content so that
+                # later builds can recognize unchanged content even if timestamps change
+                self._record_content_digests(afterBuild=False)
+            if not buildNeeded and self.usesDependencyAbi() and not self._recorded_dep_abis():
+                self._record_dep_abis()
         return buildNeeded, reason
 
+    def abiFingerprint(self) -> Optional[str]:
+        """
+        Gets a digest of the parts of this task's outputs that dependents are compiled against
+        (e.g. the signatures of the classes produced by a Java compilation), including those of
+        the dependencies of this task. Returns None if this is not known.
+        """
+        return None
+
+    def usesDependencyAbi(self) -> bool:
+        """
+        Determines if this task only depends on the ABI (see `abiFingerprint`) of its dependencies.
+        Such a task does not need to be rebuilt because of a dependency that was updated if the
+        ABI of the dependency did not change since this task was last built.
+        """
+        return False
+
+    def _dep_abis_path(self) -> str:
+        return path.join(self.subject.suite.get_mx_output_dir(), 'dependencyAbis', type(self.subject).__name__,
+                         self.subject._extra_artifact_discriminant(), self.name + '.json')
+
+    def _recorded_dep_abis(self) -> Dict[str, str]:
+        """Gets the ABI fingerprints of the dependencies as of the last build of this task."""
+        if self._depAbis is None:
+            try:
+                with open(self._dep_abis_path(), encoding='utf-8') as fp:
+                    self._depAbis = json.load(fp)
+            except (OSError, ValueError):
+                self._depAbis = {}
+        return self._depAbis
+
+    def _dep_abi_unchanged(self, dep: Task) -> bool:
+        if not self.usesDependencyAbi() or not isinstance(dep, BuildTask):
+            return False
+        fingerprint = dep.abiFingerprint()
+        return fingerprint is not None and self._recorded_dep_abis().get(dep.subject.name) == fingerprint
+
+    def _record_dep_abis(self) -> None:
+        abis = {}
+        for dep in self.deps:
+            fingerprint = dep.abiFingerprint() if isinstance(dep, BuildTask) else None
+            if fingerprint is not None:
+                abis[dep.subject.name] = fingerprint
+        if abis != self._recorded_dep_abis():
+            with SafeFileCreation(self._dep_abis_path()) as sfc:
+                with open(sfc.tmpPath, 'w', encoding='utf-8') as fp:
+                    json.dump(abis, fp)
+            self._depAbis = abis
+
+    def _use_content_digests(self) -> bool:
+        """
+        Determines if the staleness of this task is decided by the content digests of its inputs,
+        outputs and dependencies instead of timestamps (see `contentInputs`).
+        """
+        if self.contentInputs() is None:
+            return False
+        if build_cache_enabled(self.args):
+            return True
+        if get_env('MX_BUILD_CONTENT_DIGESTS') is not None:
+            return get_env('MX_BUILD_CONTENT_DIGESTS') == 'true'
+        return getattr(self.args, 'content_digests', False) is True
+
+    def _content_digests(self) -> ContentDigests:
+        if self._contentDigests is None:
+            self._contentDigests = ContentDigests(path.join(self.subject.suite.get_mx_output_dir(), 'contentDigests', type(self.subject).__name__,
+                                                            self.subject._extra_artifact_discriminant(), self.name + '.json'),
+                                                  baseDir=self.subject.suite.dir)
+        return self._contentDigests
+
+    def _current_dep_digests(self) -> Optional[Dict[str, Optional[str]]]:
+        digests = {}
+        for dep in self.deps:
+            digest = dep.contentOutputDigest() if isinstance(dep, BuildTask) else None
+            if digest is None:
+                return None
+            digests[dep.subject.name] = digest
+        return digests
+
+    def _computeContentBuildState(self) -> Optional[Tuple[bool, str | None]]:
+        """
+        Decides whether this task needs to be built based on content digests.
+        Returns None if that is not possible, in which case timestamps are used.
+        """
+        recorded = self._content_digests()
+        if not recorded.is_recorded():
+            return None
+        depDigests = self._current_dep_digests()
+        if depDigests is None:
+            return None
+        if self._has_config_changed():
+            return True, 'config was changed'
+        change = recorded.find_change(recorded.digests(self.contentInputs()), recorded.digests(self.contentOutputs()), depDigests)
+        if change is not None:
+            return True, change
+        buildNeeded, reason = self.needsBuildByContent()
+        if buildNeeded:
+            return True, reason
+        recorded.save(onlyIfChanged=True)
+        return False, 'content unchanged'
+
+    def _record_content_digests(self, afterBuild: bool) -> None:
+        digests = self._content_digests()
+        depDigests = self._current_dep_digests()
+        if depDigests is None:
+            digests.invalidate()
+        else:
+            previousOutputDigest = digests.outputDigest
+            digests.record(digests.digests(self.contentInputs()), digests.digests(self.contentOutputs()), depDigests)
+            if afterBuild and previousOutputDigest == digests.outputDigest:
+                # Early cutoff: dependents do not need to be rebuilt because of this task
+                logv(f'[{self.name} produced identical output]')
+                self.built = False
+        digests.save()
+
+    def _use_build_cache(self) -> bool:
+        return build_cache_enabled(self.args) and self.contentInputs() is not None and self.buildCacheKey() is not None
+
+    def _build_cache_action_key(self) -> Optional[str]:
+        """
+        Computes the key under which the outputs of this task are stored in the build cache.
+        Paths are relative to the suite directory so that checkouts in different locations share entries.
+        Returns None if the outputs of a dependency are unknown.
+        """
+        depDigests = self._current_dep_digests()
+        if depDigests is None:
+            return None
+        baseDir = self.subject.suite.dir
+        digests = self._content_digests()
+        return BuildCache.action_key({
+            'subject': [type(self.subject).__name__, self.subject.name, self.subject._extra_artifact_discriminant()],
+            'task': type(self).__name__,
+            'config': self._get_config(),
+            'inputs': {path.relpath(p, baseDir): d for p, d in digests.digests(self.contentInputs()).items()},
+            'outputs': [path.relpath(p, baseDir) for p in self.contentOutputs()],
+            'deps': depDigests,
+            'extra': self.buildCacheKey(),
+        })
+
+    def _restore_from_build_cache(self) -> Optional[str]:
+        """
+        Restores the outputs of this task from the build cache.
+        Returns a description of how the outputs were restored or None if they are not in the cache.
+        """
+        self._buildCacheKey = self._build_cache_action_key()
+        if self._buildCacheKey is None:
+            return None
+        restored = BuildCache.default().restore(self._buildCacheKey, self.subject.suite.dir, self.contentOutputs(),
+                                                self._content_digests().file_digest)
+        if restored is None:
+            logv(f'[{self.name} not found in build cache]')
+            return None
+        self.restoredFromBuildCache()
+        logv(f'[{self.name} restored from build cache ({restored})]')
+        return restored
+
+    def _store_in_build_cache(self) -> None:
+        digests = self._content_digests()
+        if digests.outputs is None:
+            return
+        try:
+            BuildCache.default().store(self._buildCacheKey, self.subject.suite.dir, digests.outputs, str(self))
+            self._storedInBuildCache = True
+        except OSError as e:
+            warn(f'Could not store outputs of {self.name} in build cache: {e}')
+
+    def buildCacheKey(self) -> Optional[dict]:
+        """
+        Gets a JSON serializable description of everything apart from the config, the content of the
+        inputs (see `contentInputs`) and the outputs of the dependencies of this task that determines
+        its outputs, such as the identity of the compiler. Returns None if the outputs of this task
+        must not be stored in the shared build cache.
+        """
+        return None
+
+    def restoredFromBuildCache(self) -> None:
+        """Called after the outputs of this task were restored from the build cache instead of calling `build`."""
+
+    def contentInputs(self) -> Optional[List[str]]:
+        """
+        Gets the files whose contents (together with the outputs of the dependencies of this task)
+        determine the outputs of this task. Returns None if this task does not support content digests.
+        """
+        return None
+
+    def contentOutputs(self) -> List[str]:
+        """
+        Gets the files or directories produced by this task.
+        Only called if `contentInputs` does not return None.
+        """
+        return []
+
+    def contentOutputDigest(self) -> Optional[str]:
+        """
+        Gets a digest summarizing the current outputs of this task, used by
+        dependents that decide their staleness based on content digests.
+        """
+        if self.contentInputs() is None:
+            return None
+        return self._content_digests().outputDigest
+
+    def needsBuildByContent(self) -> Tuple[bool, str | None]:
+        """
+        Determines if this task needs to be built for reasons other than changed content
+        of its inputs, outputs or dependencies. This is used instead of `needsBuild` if this
+        task's staleness is decided by content digests.
+        """
+        return self.needsBuild(None)
+
     def _timestamp(self) -> str:
         if self.args.print_timing:
             return time.strftime('[%H:%M:%S] ')
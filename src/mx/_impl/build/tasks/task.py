@@ -1,7 +1,7 @@
 #
 # ----------------------------------------------------------------------------------------------------
 #
-# Copyright (c) 2024, 2024, Oracle and/or its affiliates. All rights reserved.
+# Copyright (c) 2024, 2026, Oracle and/or its affiliates. All rights reserved.
 # DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
 #
 # This code is free software; you can redistribute it and/or modify it
@@ -74,6 +74,10 @@ class Task(object, metaclass=ABCMeta):
         self._exitcode = 0
         self.status = None
         self.statusInfo = ""
+        self.subprocessCpuTime = 0.0
+        self.subprocessMaxRss = 0
+        # Errors and warnings reported by compilers while executing this task (see `protocol.Diagnostic`)
+        self.diagnostics = []
 
     def __str__(self) -> str:  # pylint: disable=invalid-str-returned
         return nyi('__str__', self)
@@ -141,6 +145,17 @@ class Task(object, metaclass=ABCMeta):
     def addSubproc(self, p):
         self.subprocs += [p]
 
+    def recordSubprocessUsage(self, cpuTime: float, maxRss: int) -> None:
+        """
+        Accounts the resources used by a subprocess of this task that has finished.
+
+        :param cpuTime: user and system CPU time of the subprocess in seconds
+        :param maxRss: peak resident set size of the subprocess in kilobytes
+        """
+        with Task.consoleLock:
+            self.subprocessCpuTime += cpuTime
+            self.subprocessMaxRss = max(self.subprocessMaxRss, maxRss)
+
     def cancelSubprocs(self, failed=None):
         self.status = "cancelled"
         if failed is not None:
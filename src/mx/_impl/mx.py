@@ -331,6 +331,7 @@ if __name__ == '__main__':
     sys.modules['mx'] = sys.modules.pop('__main__')
 
 import os, errno, time, subprocess, shlex, zipfile, signal, tempfile, platform
+import atexit
 import textwrap
 import socket
 import tarfile, gzip
@@ -356,7 +357,7 @@ from io import BytesIO, open as io_open
 import fnmatch
 import operator
 import calendar
-from stat import S_IWRITE
+from stat import S_IWRITE, S_ISREG
 from .mx_commands import MxCommands, MxCommand
 from copy import copy, deepcopy
 import posixpath
@@ -364,8 +365,21 @@ from .. import mx_version
 
 from .build.suite import Dependency, SuiteConstituent
 from .build.tasks import BuildTask, NoOpTask, TaskAbortException, TaskSequence
-from .build.daemon import Daemon
+from .build.daemon import Daemon, PersistentDaemonRegistry, ping_daemon
+from .build.protocol import MultiplexedConnection
 from .build.report import BuildReport
+from .build.scheduler import TaskScheduler
+from .build.stats import BuildStatsDatabase, TaskStat
+from .build.fileindex import FileStateIndex
+from .build.cache import BuildCache
+from .build.batch import merge_compile_args, plan_batches, schedule_order, split_classes
+from .build.incremental import JavaDependencyGraph
+from .build.classfile import abi_fingerprint
+from .build.compress import ParallelGzipWriter
+from .mx_suite_snapshot import SuiteFileSnapshot
+from .mx_jdk_probe_cache import JDKProbeCache
+from .mx_download import DownloadError, DownloadProgress, Downloader
+from .mx_digest_index import DigestIndex
 from .support.comparable import compare, Comparable
 from .support.envvars import env_var_to_bool, get_env
 from .support.logging import abort, abort_or_warn, colorize, log, logv, logvv, log_error, nyi, warn, \
@@ -388,6 +402,7 @@ from .mx_repo_suite import (  # pylint: disable=unused-import
     _run_command_for_repo_suites,
     _select_repo_suites,
 )
+from . import mx_suite_parser
 from . import mx_suite_version_conflicts
 
 
@@ -577,7 +592,7 @@ def _urlopen(*args, **kwargs):
             if e.code == 500:
                 if error500_attempts < error500_limit:
                     error500_attempts += 1
-                    url = '?' if len(args) == 0 else args[0]
+                    url = '?' if len(args) == 0 else getattr(args[0], 'full_url', args[0])
                     warn("Retrying after error reading from " + url + ": " + str(e))
                     time.sleep(0.2)
                     continue
@@ -602,6 +617,33 @@ def _urlopen(*args, **kwargs):
         abort("should not reach here")
 
 
+_digest_index_instance = None
+_digest_index_lock = threading.Lock()
+
+def _digest_index():
+    """
+    Gets the `DigestIndex` in ~/.mx that records the digests of downloaded artifacts,
+    or None if MX_DIGEST_INDEX=false. It is saved when mx exits.
+    """
+    global _digest_index_instance
+    with _digest_index_lock:
+        if _digest_index_instance is None and env_var_to_bool('MX_DIGEST_INDEX', 'true'):
+            _digest_index_instance = DigestIndex(join(dot_mx_dir(), 'digest-index.json'))
+            atexit.register(_digest_index_instance.save)
+        return _digest_index_instance
+
+
+def _write_digest_file(path, digest_name, value):
+    """
+    Atomically records `value` as the `digest_name` digest of `path` in the ``<path>.<digest_name>`` file.
+    """
+    with SafeFileCreation(f'{path}.{digest_name}') as sfc, open(sfc.tmpPath, 'w') as f:
+        f.write(value)
+    index = _digest_index()
+    if index:
+        index.put(path, digest_name, value)
+
+
 def _check_file_with_digest(path, digest, mustExist=True, newFile=False, logErrors=False):
     """
     Checks if `path` exists and is up to date with respect to `digest`.
@@ -625,11 +667,14 @@ def _check_file_with_digest(path, digest, mustExist=True, newFile=False, logErro
             return content.split(maxsplit=1)[0]
 
     def _write_digest(digest_name, value=None):
-        with SafeFileCreation(digest_path) as sfc, open(sfc.tmpPath, 'w') as f:
-            f.write(value or digest_of_file(path, digest_name))
+        _write_digest_file(path, digest_name, value or digest_of_file(path, digest_name))
 
     if exists(path):
         if check_digest and digest:
+            index = _digest_index()
+            if index and index.get(path, digest.name) == digest.value:
+                return True
+
             if not _cached_digest_is_valid() or (newFile and digest.value != _read_digest()):
                 logv(f'Create/update {digest.name} cache file ' + digest_path)
                 _write_digest(digest.name)
@@ -644,6 +689,8 @@ def _check_file_with_digest(path, digest, mustExist=True, newFile=False, logErro
                     size = os.path.getsize(path)
                     log_error(f'{digest.name} of {TimeStampFile(path)} [size: {size}] ({computed_digest}) does not match expected value ({digest.value})')
                 return False
+            if index:
+                index.put(path, digest.name, digest.value)
     elif mustExist:
         if logErrors:
             log_error(f"'{path}' does not exist")
@@ -1197,6 +1244,12 @@ def no_suite_discovery(func):
     _no_suite_discovery.extend(_command_function_names(func))
     return func
 
+# Names of commands that only need the suites defining their root dependencies (and the suites
+# these import) to be loaded if MX_LAZY_SUITES=true, mapped to a function that gets the names
+# of the root dependencies from the command arguments or None if they cannot be determined.
+# This cannot be used outside of mx because of implementation restrictions
+_dependency_closure_loading = {}
+
 
 class SuiteModel:
     """
@@ -1577,6 +1630,8 @@ class SuiteImport:
 
 
 _suites = {}
+_lazy_suites = {}
+"""Discovered suites whose loading is deferred until they are needed (MX_LAZY_SUITES=true), keyed by name."""
 _primary_suite_path = None
 _primary_suite = None
 _mx_suite = None
@@ -1682,13 +1737,14 @@ class Suite(object):
     def all_libs(self):
         return self.libs + self.removed_libs
 
-    def _load(self):
+    def _load(self, parse_env=True):
         """
-        Calls _parse_env and _load_extensions
+        Calls _parse_env (unless `parse_env` is False) and _load_extensions
         """
         logvv("Loading suite " + self.name)
         self._load_suite_dict()
-        self._parse_env()
+        if parse_env:
+            self._parse_env()
         self._load_extensions()
 
     def getMxCompatibility(self):
@@ -1811,34 +1867,11 @@ class Suite(object):
             if not exists(modulePath):
                 abort(f'{modulePath} is missing')
 
-            savedModule = sys.modules.get(moduleName)
-            if savedModule:
-                warn(modulePath + ' conflicts with ' + savedModule.__file__)
-            # temporarily extend the Python path
-            sys.path.insert(0, self.mxDir)
-
-            snapshot = frozenset(sys.modules.keys())
-            module = __import__(moduleName)
-
-            if savedModule:
-                # restore the old module into the module name space
-                sys.modules[moduleName] = savedModule
+            cached = _suite_snapshot.suite_dict(modulePath) if _suite_snapshot else None
+            if cached:
+                preloaded, jsonifiable, errorMessage = cached
             else:
-                # remove moduleName from the module name space
-                sys.modules.pop(moduleName)
-
-            # For now fail fast if extra modules were loaded.
-            # This can later be relaxed to simply remove the extra modules
-            # from the sys.modules name space if necessary.
-            extraModules = frozenset(sys.modules.keys()) - snapshot
-            assert len(extraModules) == 0, 'loading ' + modulePath + ' caused extra modules to be loaded: ' + ', '.join(extraModules)
-
-            # revert the Python path
-            del sys.path[0]
-
-            if not hasattr(module, dictName):
-                abort(modulePath + ' must define a variable named "' + dictName + '"')
-            preloaded = getattr(module, dictName)
+                preloaded, jsonifiable, errorMessage = self._read_suite_dict(modulePath, moduleName, dictName)
 
         def expand(value, context):
             if isinstance(value, dict):
@@ -1877,7 +1910,6 @@ class Suite(object):
             Suite._merge_os_arch_attrs(_suite, os_arch, context)
 
         if modulePath:
-            (jsonifiable, errorMessage) = self._is_jsonifiable(modulePath)
             if not jsonifiable:
                 msg = f"Cannot parse file {modulePath}. Please make sure that this file only contains dicts and arrays. {errorMessage}"
                 if self.getMxCompatibility().requireJsonifiableSuite():
@@ -1885,55 +1917,77 @@ class Suite(object):
                 else:
                     warn(msg)
 
-    def _is_jsonifiable(self, suiteFile):
-        """Other tools require the suite.py files to be parseable without running a python interpreter.
-        Therefore suite.py file must consist out of JSON like dict, array, string, integer and boolean
-        structures. Function calls, string concatenations and other python expressions are not allowed."""
-        with open(suiteFile, "r") as f:
+    def _read_suite_dict(self, modulePath, moduleName, dictName):
+        """
+        Gets the value of the `dictName` variable of `modulePath`. The file is only imported if it
+        contains more than assignments of JSON-like values.
+
+        :return: the unexpanded dict, whether the file is jsonifiable and the reason it is not
+        """
+        digest = _suite_snapshot.file_digest(modulePath) if _suite_snapshot else None
+        with open(modulePath, "r") as f:
             suiteContents = f.read()
         try:
-            # This code tries to keep text on the same line and column as much as possible so that in case of json parse
-            # errors, the location matches the one in the python file
-            result = re.match("(.*?)suite\\s*=\\s*(\\{.*)", suiteContents, re.DOTALL)
-            pre = result.group(1)
-            part = result.group(2)
-            stack = 0
-            endIdx = 0
-            for c in part:
-                if c == "{":
-                    stack += 1
-                elif c == "}":
-                    stack -= 1
-                endIdx += 1
-                if stack == 0:
-                    break
-            part = part[:endIdx]
-            if pre:
-                # add empty lines to ensure the location of errors matches up
-                part = ('\n' * len(pre.splitlines())) + part
-
-            # convert python boolean constants to json boolean constants
-            part = re.sub("True", "true", part)
-            part = re.sub("False", "false", part)
+            variables = mx_suite_parser.parse_suite_file(suiteContents)
+            if dictName not in variables:
+                abort(modulePath + ' must define a variable named "' + dictName + '"')
+            preloaded = variables[dictName]
+            jsonifiable, errorMessage = True, None
+        except mx_suite_parser.SuiteFileSyntaxError:
+            preloaded = self._import_suite_dict(modulePath, moduleName, dictName)
+            jsonifiable, errorMessage = Suite._is_jsonifiable_contents(suiteContents)
+        if errorMessage is not None:
+            errorMessage = str(errorMessage)
+        if _suite_snapshot:
+            _suite_snapshot.record_suite_dict(modulePath, digest, preloaded, jsonifiable, errorMessage)
+        return preloaded, jsonifiable, errorMessage
+
+    def _import_suite_dict(self, modulePath, moduleName, dictName):
+        """
+        Imports `modulePath` and gets the value of its `dictName` variable.
+        """
+        savedModule = sys.modules.get(moduleName)
+        if savedModule:
+            warn(modulePath + ' conflicts with ' + savedModule.__file__)
+        # temporarily extend the Python path
+        sys.path.insert(0, self.mxDir)
+
+        snapshot = frozenset(sys.modules.keys())
+        module = __import__(moduleName)
+
+        if savedModule:
+            # restore the old module into the module name space
+            sys.modules[moduleName] = savedModule
+        else:
+            # remove moduleName from the module name space
+            sys.modules.pop(moduleName)
 
-            # remove python comments
-            part = re.sub("(.*?)#.*", "\\1", part)
-            def python_to_json_string(m):
-                return "\"" + m.group(1).replace("\n", "\\n") + "\""
+        # For now fail fast if extra modules were loaded.
+        # This can later be relaxed to simply remove the extra modules
+        # from the sys.modules name space if necessary.
+        extraModules = frozenset(sys.modules.keys()) - snapshot
+        assert len(extraModules) == 0, 'loading ' + modulePath + ' caused extra modules to be loaded: ' + ', '.join(extraModules)
 
-            # remove trailing commas before ']' or '}'
-            part = re.sub(",(\\s*(\\]|\\}))", " \\1", part)
+        # revert the Python path
+        del sys.path[0]
 
-            # convert python multiline strings to json strings with embedded newlines
-            part = re.sub("\"\"\"(.*?)\"\"\"", python_to_json_string, part, flags=re.DOTALL)
-            part = re.sub("'''(.*?)'''", python_to_json_string, part, flags=re.DOTALL)
+        if not hasattr(module, dictName):
+            abort(modulePath + ' must define a variable named "' + dictName + '"')
+        return getattr(module, dictName)
 
-            # convert python single-quoted strings to json double-quoted strings
-            part = re.sub("'(.*?)'", python_to_json_string, part, flags=re.DOTALL)
+    @staticmethod
+    def _is_jsonifiable_contents(suiteContents):
+        """Other tools require the suite.py files to be parseable without running a python interpreter.
+        Therefore suite.py file must consist out of JSON like dict, array, string, integer and boolean
+        structures. Function calls, string concatenations and other python expressions are not allowed.
 
-            json.loads(part)
+        :return: whether `suiteContents` is jsonifiable and the reason it is not
+        """
+        try:
+            if mx_suite_parser.parse_suite_value(suiteContents) is None:
+                return (False, 'no assignment to the "suite" variable found')
             return (True, None)
-        except:
+        except mx_suite_parser.SuiteFileSyntaxError:
             return (False, sys.exc_info()[1])
 
     def _register_url_rewrites(self):
@@ -2030,6 +2084,7 @@ class Suite(object):
         Registers the metadata loaded by _load_metadata into the relevant
         global dictionaries such as _projects, _libs, _jreLibs and _dists.
         """
+        _dependency_graph_index.invalidate()
         for l in self.libs:
             existing = _libs.get(l.name)
             # Check that suites that define the same library are consistent wrt digests
@@ -2071,6 +2126,7 @@ class Suite(object):
             _repositories[r.name] = r
 
     def _register_distribution(self, d):
+        _dependency_graph_index.invalidate()
         existing = _dists.get(d.name)
         if existing is not None and _check_global_structures:
             warn('distribution ' + d.name + ' redefined', context=d)
@@ -2385,6 +2441,7 @@ class Suite(object):
         return d
 
     def _unload_unregister_distribution(self, name):
+        _dependency_graph_index.invalidate()
         self.dists = [d for d in self.dists if d.name != name]
         d = _dists[name]
         del _dists[name]
@@ -3075,11 +3132,13 @@ class SourceSuite(Suite):
 
     def projects_recursive(self):
         """return all projects including those in imported suites"""
-        result = []
-        result += self.projects
-        visitmap = {}
-        self.visit_imports(self._projects_recursive_visitor, projects=result, visitmap=visitmap,)
-        return result
+        def _compute():
+            result = []
+            result += self.projects
+            visitmap = {}
+            self.visit_imports(self._projects_recursive_visitor, projects=result, visitmap=visitmap,)
+            return result
+        return _dependency_graph_index.get(('projects_recursive', self.name), _compute)
 
     def mx_binary_distribution_jar_path(self):
         """
@@ -3161,9 +3220,9 @@ class BinarySuite(Suite):
         # directory. For a freshly downloaded suite, the actual distribution jars
         # have not been downloaded as we need info from the suite.py for that
 
-    def _load(self):
+    def _load(self, parse_env=True):
         self._load_binary_suite()
-        super(BinarySuite, self)._load()
+        super(BinarySuite, self)._load(parse_env)
 
     def reload_binary_suite(self):
         for d in self.dists:
@@ -3297,6 +3356,9 @@ def suite(name: str, fatalIfMissing: bool = True, context = None) -> Optional[Su
     :rtype: Suite
     """
     s = _suites.get(name)
+    if s is None and name in _lazy_suites:
+        _load_lazy_suites([name])
+        s = _suites.get(name)
     if s is None and fatalIfMissing:
         abort('suite named ' + name + ' not found', context=context)
     return s
@@ -3483,7 +3545,7 @@ def _find_suite_import(importing_suite, suite_import, fatalIfMissing=True, load=
         assert _found_mode[0] == 'source'
         return SourceSuite(import_mx_dir, importing_suite=importing_suite, load=load, dynamicallyImported=suite_import.dynamicImport, foreign=suite_import.foreign), _clone_status[0]
 
-def _discover_suites(primary_suite_dir, load=True, register=True, update_existing=False):
+def _discover_suites(primary_suite_dir, load=True, register=True, update_existing=False, lazy_roots=None):
 
     def _log_discovery(msg):
         dt = datetime.utcnow() - _mx_start_datetime
@@ -3719,7 +3781,7 @@ def _discover_suites(primary_suite_dir, load=True, register=True, update_existin
             try:
                 for discovered_suite, resolved_version in repos_to_update.values():
                     _update_repo(discovered_suite, resolved_version, update_reason="to resolve deferred conflict")
-                return _discover_suites(primary_suite_dir, load=load, register=register, update_existing=update_existing)
+                return _discover_suites(primary_suite_dir, load=load, register=register, update_existing=update_existing, lazy_roots=lazy_roots)
             except SystemExit as se:
                 _rollback_discovery_side_effects()
                 raise se
@@ -3727,20 +3789,153 @@ def _discover_suites(primary_suite_dir, load=True, register=True, update_existin
     _log_discovery("Discovery finished")
 
     if register:
+        needed = _lazy_suite_closure(discovered, lazy_roots, primary.name) if load and lazy_roots is not None else None
+        if needed is not None:
+            _log_discovery(f"Deferring loading of {', '.join(sorted(set(discovered) - needed)) or 'no suites'}")
+
         # Register & finish loading discovered suites
         def _register_visit(s):
-            _register_suite(s)
+            deferred = needed is not None and s.name not in needed
+            if deferred:
+                _lazy_suites[s.name] = s
+            else:
+                _register_suite(s)
             for _suite_import in s.suite_imports:
-                if _suite_import.name not in _suites:
+                if _suite_import.name not in _suites and _suite_import.name not in _lazy_suites:
                     _register_visit(discovered[_suite_import.name])
             if load:
-                s._load()
+                if deferred:
+                    # env files are always parsed so that they are seen the same in lazy mode
+                    s._parse_env()
+                else:
+                    s._load()
 
         _register_visit(primary)
 
     _log_discovery("Registration/Loading finished")
     return primary
 
+
+def _lazy_suite_roots(command_and_args):
+    """
+    Gets the names of the root dependencies of a command declared with `dependency_closure_loading`
+    if MX_LAZY_SUITES=true, otherwise None.
+    """
+    if get_env('MX_LAZY_SUITES') != 'true' or not command_and_args:
+        return None
+    roots = _dependency_closure_loading.get(command_and_args[0])
+    return roots(command_and_args[1:]) if roots else None
+
+
+def _suite_dict_defines(s, name):
+    """Determines if the suite dict of `s` defines a project, library or distribution named `name`."""
+    return any(name in s._get_early_suite_dict_property(attr, {}) for attr in ('projects', 'libraries', 'jrelibraries', 'jdklibraries', 'distributions'))
+
+
+def _lazy_suite_closure(discovered, roots, primary_name):
+    """
+    Gets the names of the primary suite, of the suites in `discovered` that define the dependencies
+    named by `roots` and of the suites they transitively import. This only looks at the suite dicts
+    of the suites. The primary suite is always included so that its extension (and the options and
+    hooks it defines) is loaded before the command runs.
+
+    :param dict discovered: map from name to discovered (but not yet loaded) suite
+    :param list roots: dependency names, optionally qualified by a suite name
+    :param str primary_name: name of the primary suite
+    :return: the set of suite names or None if a root is not defined by the suite dict of a discovered suite
+    """
+    worklist = [primary_name]
+    for root in roots:
+        suite_name, name = splitqualname(root)
+        if suite_name is None:
+            if dependency(name, fatalIfMissing=False) is not None:
+                # defined by the mx suite
+                continue
+            defining = [s.name for s in discovered.values() if _suite_dict_defines(s, name)]
+            if not defining:
+                logv(f'Loading all suites as {name} is not defined by a suite.py file')
+                return None
+            worklist.extend(defining)
+        elif suite_name in discovered:
+            worklist.append(suite_name)
+        elif suite_name != _mx_suite.name:
+            return None
+    needed = set()
+    while worklist:
+        suite_name = worklist.pop()
+        if suite_name not in needed:
+            needed.add(suite_name)
+            worklist.extend(si.name for si in discovered[suite_name].suite_imports if si.name in discovered)
+    return needed
+
+
+def _post_init_suites(loaded):
+    """
+    Performs the steps of `Suite.recursive_post_init` for each suite in `loaded` that has not
+    completed them yet. The suites imported by a suite in `loaded` must be registered.
+    """
+    for s in loaded:
+        if not s._metadata_initialized:
+            s._metadata_initialized = True
+            s.visit_imports(Suite._init_metadata_visitor)
+            s._init_metadata()
+    for s in loaded:
+        if not s.resolved_dependencies:
+            s.visit_imports(Suite._resolve_dependencies_visitor)
+            s._resolve_dependencies()
+    for s in loaded:
+        if not s.post_init:
+            s.visit_imports(Suite._post_init_visitor)
+            s._post_init()
+
+
+def _load_lazy_suites(names):
+    """
+    Loads, registers and initializes the deferred suites in `names` together with the deferred
+    suites they import. Dependencies of these suites are not removed if they are unsatisfied.
+
+    :return: the suites that were loaded
+    """
+    loaded = []
+
+    def _visit(name):
+        s = _lazy_suites.pop(name, None)
+        if s is None:
+            return
+        _register_suite(s)
+        for suite_import in s.suite_imports:
+            _visit(suite_import.name)
+        logv(f'Loading deferred suite {s.name}')
+        # the env file was already parsed when the suite was deferred
+        s._load(parse_env=False)
+        loaded.append(s)
+
+    # The extension hooks of the loaded suites can change the dependency graph in place
+    frozen = _dependency_graph_index.thaw()
+    try:
+        for name in names:
+            _visit(name)
+        _post_init_suites(loaded)
+        for s in loaded:
+            if isinstance(s, SourceSuite):
+                for d in s.dists:
+                    d.post_init()
+    finally:
+        if frozen:
+            _dependency_graph_index.freeze()
+    return loaded
+
+
+def _load_lazy_suites_defining(name):
+    """
+    Loads the deferred suites whose suite dict defines a dependency named `name`.
+
+    :return: whether any suite was loaded
+    """
+    if not _lazy_suites:
+        return False
+    return len(_load_lazy_suites([s.name for s in list(_lazy_suites.values()) if _suite_dict_defines(s, name)])) != 0
+
 from . import mx_spotbugs
 from . import mx_sigtest
 from . import mx_gate
@@ -3858,11 +4053,10 @@ def download_file_with_digest(name, path, urls, digest, resolve, mustExist, ext=
                         # It was some other error
                         raise OSError(f"failed to create symlink {link_name}") from e
             else:
-                # If we can't symlink, then atomically copy. Never move as that
-                # can cause problems in the context of multiple processes/threads.
-                with SafeFileCreation(link_name) as sfc:
-                    logvv(f'Copying {source} to {link_name}')
-                    shutil.copy(source, sfc.tmpPath)
+                # If we can't symlink, then atomically reflink, hardlink or copy. Never move
+                # as that can cause problems in the context of multiple processes/threads.
+                strategy = materialize_file(source, link_name)
+                logvv(f'Materialized {link_name} from {source} ({strategy})')
 
         cache_path_parent = dirname(cachePath)
         if is_cache_path(cache_path_parent):
@@ -3876,15 +4070,20 @@ def download_file_with_digest(name, path, urls, digest, resolve, mustExist, ext=
                     if exists(cache_path_parent) and not isdir(cache_path_parent):
                         raise e
 
-        if not exists(cachePath) or (check_digest and digest_of_file(cachePath, digest.name) != digest.value):
+        if not exists(cachePath) or not _check_file_with_digest(cachePath, digest):
             if exists(cachePath):
                 log(f'{digest.name} of {cachePath} does not match expected value ({digest.value}) - found {digest_of_file(cachePath, digest.name)} - re-downloading')
 
             log(f'Downloading {"sources " if sources else ""}{name} from {urls}')
-            download(cachePath, urls)
+            download(cachePath, urls, digest_name=digest.name if check_digest else None)
+            if not _check_file_with_digest(cachePath, digest, newFile=True, logErrors=True):
+                abort(f"No valid file for {cachePath} after download. Broken download? {digest.name} not updated in suite.py file?")
 
         if path != cachePath:
             _copy_or_symlink(cachePath, path)
+            if check_digest:
+                # `path` has the content of the verified cache entry
+                _write_digest_file(path, digest.name, digest.value)
 
         if not _check_file_with_digest(path, digest, newFile=True, logErrors=True):
             abort(f"No valid file for {path} after download. Broken download? {digest.name} not updated in suite.py file?")
@@ -4012,14 +4211,16 @@ def digest_of_file(path, digest_name):
     """
     Creates a cryptographic hash of the contents in `path` using the `digest_name` algorithm.
     """
+    d = _new_digest(digest_name)
+    buf = bytearray(1024 * 1024)
+    view = memoryview(buf)
     with open(path, 'rb') as f:
-        d = _new_digest(digest_name)
         while True:
-            buf = f.read(4096)
-            if not buf:
+            n = f.readinto(buf)
+            if not n:
                 break
-            d.update(buf)
-        return d.hexdigest()
+            d.update(view[:n])
+    return d.hexdigest()
 
 def sha1OfFile(path):
     return digest_of_file(path, 'sha1')
@@ -4326,65 +4527,71 @@ def show_envs(args):
             print(f'{key}: {value}')
 
 
-def _attempt_download(url, path, jarEntryName=None):
+_downloader_instance = None
+_downloader_lock = threading.Lock()
+
+def _downloader():
+    """
+    Gets the `Downloader` shared by all downloads of this mx process. The number of concurrent
+    downloads and the number of parallel segments in which large files are fetched are set by
+    MX_DOWNLOAD_WORKERS and MX_DOWNLOAD_SEGMENTS respectively.
+    """
+    global _downloader_instance
+    with _downloader_lock:
+        if _downloader_instance is None:
+            _downloader_instance = Downloader(workers=int(get_env('MX_DOWNLOAD_WORKERS', '4')),
+                                              segments=int(get_env('MX_DOWNLOAD_SEGMENTS', '4')),
+                                              opener=_urlopen)
+        return _downloader_instance
+
+
+def _report_download_progress(logTask):
+    def _report(bytesRead, length, remaining):
+        if length == -1:
+            message = f'{bytesRead} bytes'
+        else:
+            message = f'{bytesRead} bytes ({bytesRead * 100 / max(length, 1):.0f}%)'
+        if remaining > 1:
+            message += f' [{remaining} downloads]'
+        if logTask:
+            logTask.log(message, replace=True)
+        else:
+            sys.stdout.write(f'\r {message}')
+            if remaining == 0:
+                sys.stdout.write('\n')
+    return _report
+
+_download_progress = DownloadProgress(_report_download_progress(None))
+"""Aggregates the progress of the downloads that are not part of a build task with its own log."""
+
+
+def _attempt_download(url, path, jarEntryName=None, digest_name=None):
     """
     Attempts to download content from `url` and save it to `path`.
     If `jarEntryName` is not None, then the downloaded content is
     expected to be a zip/jar file and the entry of the corresponding
-    name is extracted and written to `path`.
+    name is extracted and written to `path`. If `digest_name` is not None,
+    the digest of the content computed during the download is recorded
+    in ``<path>.<digest_name>``.
+
+    Content received before a failed attempt is kept in ``<path>.tmp``
+    so that a retry can resume the download.
 
     :return: True if the download succeeded, "retry" if it failed but might succeed
             if retried, False otherwise
     """
 
-    progress = not _opts.no_download_progress and sys.stdout.isatty()
-    conn = None
+    progress = None
+    if not _opts.no_download_progress and sys.stdout.isatty():
+        logTask = getLogTask()
+        progress = DownloadProgress(_report_download_progress(logTask)) if logTask else _download_progress
     try:
         # Use a temp file while downloading to avoid multiple threads overwriting the same file
         with SafeFileCreation(path) as sfc:
             tmp = sfc.tmpPath
-
-            # 10 second timeout to establish connection
             url = url.replace('\\', '/')
-            conn = _urlopen(url, timeout=10)
-
-            # Not all servers support the "Content-Length" header
-            lengthHeader = conn.headers.get('Content-Length')
-            length = int(lengthHeader.strip()) if lengthHeader else -1
-
-            bytesRead = 0
-            chunkSize = 8192
-
-            if progress:
-                logTask = getLogTask()
-
-            with open(tmp, 'wb') as fp:
-                chunk = conn.read(chunkSize)
-                while chunk:
-                    bytesRead += len(chunk)
-                    fp.write(chunk)
-                    if length == -1:
-                        if progress:
-                            if logTask:
-                                logTask.log(f'{bytesRead} bytes', replace=True)
-                            else:
-                                sys.stdout.write(f'\r {bytesRead} bytes')
-                    else:
-                        if progress:
-                            if logTask:
-                                logTask.log(f'{bytesRead} bytes ({bytesRead * 100 / length:.0f}%)', replace=True)
-                            else:
-                                sys.stdout.write(f'\r {bytesRead} bytes ({bytesRead * 100 / length:.0f}%)')
-                        if bytesRead == length:
-                            break
-                    chunk = conn.read(chunkSize)
-
-            if progress and not logTask:
-                sys.stdout.write('\n')
-
-            if length not in (-1, bytesRead):
-                log_error(f'Download of {url} truncated: read {bytesRead} of {length} bytes.')
-                return "retry"
+            streamed_digest = _downloader().fetch(url, tmp, partial=path + '.tmp', progress=progress,
+                                                  digestName=None if jarEntryName else digest_name)
 
             if jarEntryName:
                 with zipfile.ZipFile(tmp, 'r') as zf:
@@ -4392,18 +4599,22 @@ def _attempt_download(url, path, jarEntryName=None):
                 with open(tmp, 'wb') as fp:
                     fp.write(jarEntry)
 
-            return True
+        if streamed_digest:
+            # Written after `path` so that the digest file is not older than `path`
+            _write_digest_file(path, digest_name, streamed_digest)
+        return True
 
-    except (IOError, socket.timeout, urllib.error.HTTPError) as e:
+    except DownloadError as e:
         # In case of an exception the temp file is removed automatically, so no cleanup is necessary
+        log_error("Error downloading from " + url + " to " + path + ": " + str(e))
+        if e.retry:
+            return "retry"
+        _suggest_http_proxy_error(e)
+        _suggest_tlsv1_error(e)
+    except (IOError, socket.timeout, urllib.error.HTTPError) as e:
         log_error("Error downloading from " + url + " to " + path + ": " + str(e))
         _suggest_http_proxy_error(e)
         _suggest_tlsv1_error(e)
-        if isinstance(e, urllib.error.HTTPError) and e.code == 500:
-            return "retry"
-    finally:
-        if conn:
-            conn.close()
     return False
 
 class _JarURL(object):
@@ -4434,11 +4645,14 @@ class _JarURL(object):
     def __repr__(self):
         return f'jar:{self.base_url}!/{self.entry}'
 
-def download(path, urls, verbose=False, abortOnError=True, verifyOnly=False):
+def download(path, urls, verbose=False, abortOnError=True, verifyOnly=False, digest_name=None):
     """
     Attempts to downloads content for each URL in a list, stopping after the first successful download.
     If the content cannot be retrieved from any URL, the program is aborted, unless abortOnError=False.
     The downloaded content is written to the file indicated by `path`.
+
+    :param digest_name: if not None, the `digest_name` digest of the content is computed while
+           it is downloaded and recorded in ``<path>.<digest_name>``
     """
     if not verifyOnly:
         ensure_dirname_exists(path)
@@ -4469,7 +4683,7 @@ def download(path, urls, verbose=False, abortOnError=True, verifyOnly=False):
                 if i != 0:
                     time.sleep(1)
                     warn(f'Retry {i} to download from {url}')
-                res = _attempt_download(url, path, jarEntryName)
+                res = _attempt_download(url, path, jarEntryName, digest_name)
                 if res == "retry":
                     continue
                 if res:
@@ -4623,6 +4837,57 @@ def _check_dependency_cycles():
     walk_deps(ignoredEdges=[DEP_EXCLUDED], preVisit=_preVisit, visitEdge=_visitEdge, visit=_visit)
 
 
+_suite_snapshot = None
+"""The `SuiteFileSnapshot` of the primary suite's workspace if MX_SUITE_SNAPSHOT=true, otherwise None."""
+
+def _init_suite_snapshot(primarySuiteMxDir):
+    global _suite_snapshot
+    if get_env('MX_SUITE_SNAPSHOT') == 'true':
+        name = hashlib.sha1(realpath(primarySuiteMxDir).encode()).hexdigest()[:16]
+        _suite_snapshot = SuiteFileSnapshot(join(dot_mx_dir(), 'suite-snapshots', name + '.json'))
+
+
+def _suite_graph_key(snapshot):
+    """
+    Computes the key of the loaded suite graph from the suite, env and extension files of all
+    loaded suites, the mx version and the environment variables that can influence the graph.
+    """
+    files = [_global_env_file()]
+    suitePys = []
+    for s in _suites.values():
+        if s.mxDir is None:
+            continue
+        suitePys.append(s.suite_py())
+        files.append(join(s.mxDir, 'env'))
+        files.extend(join(s.mxDir, f) for f in os.listdir(s.mxDir) if f.endswith('.py'))
+    additional_env = _opts.additional_env or get_env('MX_ENV_PATH')
+    if additional_env and _primary_suite and _primary_suite.mxDir:
+        files.append(join(_primary_suite.mxDir, additional_env))
+    env = {n: v for n, v in os.environ.items() if n.startswith('MX_') or n in ('JAVA_HOME', 'EXTRA_JAVA_HOMES', 'DYNAMIC_IMPORTS')}
+    for n in snapshot.referenced_env_vars(suitePys):
+        env[n] = os.environ.get(n)
+    env[':platform'] = get_os() + '-' + get_arch()
+    env[':dynamicImports'] = ','.join(f'{name}:{in_subdir}' for name, in_subdir in get_dynamic_imports())
+    return snapshot.graph_key(files, str(version), env)
+
+
+def _check_suite_graph():
+    """
+    Checks the loaded suite graph for dependency cycles unless the suite snapshot
+    shows that an identical graph was already checked.
+    """
+    if _suite_snapshot is None:
+        _check_dependency_cycles()
+        return
+    key = _suite_graph_key(_suite_snapshot)
+    if _suite_snapshot.is_acyclic(key):
+        logv('Suite graph is unchanged since it was last checked for dependency cycles')
+    else:
+        _check_dependency_cycles()
+        _suite_snapshot.record_acyclic(key)
+    _suite_snapshot.save()
+
+
 def _remove_unsatisfied_deps():
     """
     Remove projects and libraries that (recursively) depend on an optional library
@@ -4722,6 +4987,8 @@ def _remove_unsatisfied_deps():
         dep.getSuiteRemovedRegistry().append(dep)
         dep.getGlobalRegistry().pop(dep.name)
         dep.getGlobalRemovedRegistry()[dep.name] = dep
+    if res:
+        _dependency_graph_index.invalidate()
     return res
 
 DEP_STANDARD = "standard dependency"
@@ -4936,6 +5203,7 @@ class Distribution(Dependency):
             l(self)
 
     def removeDependency(self, dep):
+        _dependency_graph_index.invalidate()
         if dep in self.deps:
             self.deps.remove(dep)
         if dep in self.buildDependencies:
@@ -5220,6 +5488,12 @@ class JARArchiveTask(AbstractArchiveTask):
     def newestOutput(self):
         return TimeStampFile.newest([self.subject.path, self.subject.sourcesPath])
 
+    def contentInputs(self):
+        return list(self.subject.stripConfig) if self.subject.is_stripped() else []
+
+    def contentOutputs(self):
+        return [p for p in (self.subject.path, self.subject.sourcesPath) if p]
+
     def clean(self, forBuild=False):
         if isinstance(self.subject.suite, BinarySuite):  # make sure we never clean distributions from BinarySuites
             abort('should not reach here')
@@ -5830,7 +6104,8 @@ class LayoutDistribution(AbstractDistribution):
                         os.remove(absolute_destination)
                     os.symlink(os.path.relpath(src, dirname(absolute_destination)), absolute_destination)
                 else:
-                    shutil.copy(src, absolute_destination)
+                    # A hard link would let later changes to the layout leak into `src`
+                    materialize_file(src, absolute_destination, hardlink=False)
 
         def _install_source_files(files, include=None, excludes=None, optional=False, archive=True, dereference=None):
             dereference = dereference or 'root'
@@ -7344,10 +7619,114 @@ class JavaBuildTask(ProjectBuildTask):
         self._javafiles = None
         self._newestOutput = None
         self._compiler = None
+        self._fileIndex = None
+        # The JavaBatchBuildTask compiling the sources of this task (see JavaBatchBuildTask.prepare)
+        self._batch = None
+        self._dependencyGraph = None
+        self._incremental = None
+        self._incrementalKey = None
+        self._abiFingerprint = None
 
     def __str__(self):
         return f"Compiling {self.subject.name} with {self._getCompiler().name()}"
 
+    def _file_index(self):
+        if self._fileIndex is None:
+            self._fileIndex = FileStateIndex(join(self.subject.suite.get_mx_output_dir(), 'fileIndex',
+                                                  self.subject._extra_artifact_discriminant(), self.name + '.json'))
+        return self._fileIndex
+
+    def _dependency_graph(self):
+        if self._dependencyGraph is None:
+            self._dependencyGraph = JavaDependencyGraph(join(self.subject.suite.get_mx_output_dir(), 'javaDependencies',
+                                                             self.subject._extra_artifact_discriminant(), self.name + '.json'))
+        return self._dependencyGraph
+
+    def _use_incremental_compilation(self):
+        """
+        Determines if only the sources affected by changes since the last compilation are compiled
+        (see `JavaDependencyGraph`). This is not supported for projects with annotation processors
+        or generated JNI headers as their outputs cannot be attributed to individual sources.
+        """
+        if get_env('MX_BUILD_INCREMENTAL_JAVA') != 'true' and getattr(self.args, 'incremental_java', None) is not True:
+            return False
+        return not self.subject.annotation_processors() and not self.subject.jni_gen_dir() and isinstance(self._getCompiler(), JavacLikeCompiler)
+
+    def _use_abi_cutoff(self):
+        return get_env('MX_BUILD_JAVA_ABI_CUTOFF') == 'true' or getattr(self.args, 'java_abi_cutoff', None) is True
+
+    def usesDependencyAbi(self):
+        return self._use_abi_cutoff()
+
+    def _abi_path(self):
+        return join(self.subject.suite.get_mx_output_dir(), 'abi', self.subject._extra_artifact_discriminant(), self.name + '.json')
+
+    def _own_abi_fingerprint(self):
+        """
+        Gets the ABI fingerprint of the classes in the output directory. It is cached on disk
+        for as long as the newest output of this task does not change.
+        """
+        newest = self.newestOutput()
+        stamp = [newest.path, newest.timestamp] if newest and newest.exists() else None
+        abiPath = self._abi_path()
+        if stamp is not None and exists(abiPath):
+            try:
+                with open(abiPath, encoding='utf-8') as fp:
+                    cached = json.load(fp)
+                if cached.get('newestOutput') == stamp:
+                    return cached['abi']
+            except (OSError, ValueError, KeyError, AttributeError):
+                pass
+        abi = abi_fingerprint(self.subject.output_dir())
+        if stamp is not None:
+            with SafeFileCreation(abiPath) as sfc:
+                with open(sfc.tmpPath, 'w', encoding='utf-8') as fp:
+                    json.dump({'newestOutput': stamp, 'abi': abi}, fp)
+        return abi
+
+    def abiFingerprint(self):
+        if not self._use_abi_cutoff():
+            return None
+        if self._abiFingerprint is None:
+            h = hashlib.sha256(self._own_abi_fingerprint().encode())
+            for dep in self.deps:
+                fingerprint = dep.abiFingerprint() if isinstance(dep, BuildTask) else None
+                if fingerprint is None:
+                    newest = getattr(dep, 'newestOutput', lambda: None)()
+                    fingerprint = f'{newest.path}@{newest.timestamp}' if newest else '-'
+                h.update(f'{dep.subject.name} {fingerprint}\n'.encode())
+            self._abiFingerprint = h.hexdigest()
+        return self._abiFingerprint
+
+    def _plan_incremental_compilation(self, classPath):
+        """
+        Determines the sources to compile if this task can be compiled incrementally.
+
+        :return: an `IncrementalCompilation` or None if all sources must be compiled
+        """
+        depOutputs = {}
+        for dep in self.deps:
+            fingerprint = dep.abiFingerprint() if isinstance(dep, BuildTask) else None
+            if fingerprint is None:
+                newest = dep.newestOutput() if isinstance(dep, BuildTask) else None
+                fingerprint = [newest.path, newest.timestamp] if newest else None
+            depOutputs[dep.subject.name] = fingerprint
+        key = json.dumps([self.buildCacheKey(), classPath, self._get_config(), depOutputs], sort_keys=True, default=str)
+        self._incrementalKey = hashlib.sha256(key.encode()).hexdigest()
+
+        if getattr(self.args, 'force', False) or getattr(self.args, 'clean', False) or not exists(self.subject.output_dir()):
+            return None
+        updatedDeps = [dep.subject.name for dep in self.deps if getattr(dep, 'built', False) and not self._dep_abi_unchanged(dep)]
+        if updatedDeps:
+            logv(f'[{self.subject}: compiling all sources as {updatedDeps[0]} was rebuilt]')
+            return None
+        incremental, description = self._dependency_graph().plan(self._incrementalKey, self._get_javafiles().keys())
+        if incremental is None:
+            logv(f'[{self.subject}: compiling all sources ({description})]')
+        else:
+            logv(f'[{self.subject}: compiling incrementally ({description})]')
+        return incremental
+
     def initSharedMemoryState(self):
         ProjectBuildTask.initSharedMemoryState(self)
         try:
@@ -7404,6 +7783,51 @@ class JavaBuildTask(ProjectBuildTask):
     def newestOutput(self):
         return self._newestOutput
 
+    def contentInputs(self):
+        self._collect_files()
+        return sorted(itertools.chain(self._javafiles.keys(), self._non_javafiles.keys(), self._copyfiles.keys()))
+
+    def contentOutputs(self):
+        outputs = [self.subject.output_dir()]
+        if self.subject.annotation_processors():
+            outputs.append(self.subject.source_gen_dir())
+        if self.subject.jni_gen_dir():
+            outputs.append(self.subject.jni_gen_dir())
+        return outputs
+
+    def needsBuildByContent(self):
+        if self.subject.check_current_annotation_processors_file():
+            return (True, 'annotation processor(s) changed')
+        return (False, None)
+
+    def buildCacheKey(self):
+        compiler = self._getCompiler()
+        return {
+            'compiler': [compiler.name(), getattr(compiler, 'jdtJar', None), getattr(compiler, 'altJavac', None)],
+            'jdk': [os.path.realpath(self.jdk.home), str(self.jdk.version)],
+            'extraJavacArgs': self.args.extra_javac_args,
+            'lintOverrides': get_env('JAVAC_LINT_OVERRIDES'),
+            'flags': [self.args.warnAPI, self.args.warning_as_error, self.args.jdt_show_task_tags, self.args.force_deprecation_as_warning],
+        }
+
+    def restoredFromBuildCache(self):
+        self._file_index().invalidate()
+        self._file_index().save()
+        self._abiFingerprint = None
+        if exists(self._abi_path()):
+            os.remove(self._abi_path())
+        if exists(self._dependency_graph().path):
+            os.remove(self._dependency_graph().path)
+        if self.compileArgs:
+            for action in self.postCompileActions:
+                action()
+        self.subject.update_current_annotation_processors_file()
+        output = []
+        for root, _, filenames in os.walk(self.subject.output_dir()):
+            for fname in filenames:
+                output.append(os.path.join(root, fname))
+        self._newestOutput = TimeStampFile(max(output, key=getmtime)) if output else None
+
     def _get_javafiles(self): return self._collect_files()._javafiles
     def _get_non_javafiles(self): return self._collect_files()._non_javafiles
     def _get_copyfiles(self): return self._collect_files()._copyfiles
@@ -7414,8 +7838,9 @@ class JavaBuildTask(ProjectBuildTask):
             non_javafiles = {}
             copyfiles = {}
             outputDir = self.subject.output_dir()
+            fileIndex = self._file_index()
             for sourceDir in self.subject.source_dirs():
-                for root, _, files in os.walk(sourceDir, followlinks=True):
+                for root, files in fileIndex.walk(sourceDir):
                     for name in files:
                         path = join(root, name)
                         if name.endswith('.java'):
@@ -7444,13 +7869,29 @@ class JavaBuildTask(ProjectBuildTask):
 
     def _compute_build_reason(self, newestInput):
         self._collect_files()
+        fileIndex = self._file_index()
+        inputs = itertools.chain(self._javafiles.keys(), self._non_javafiles.keys(), self._copyfiles.keys())
+        upToDate = fileIndex.unchanged_state(inputs)
+        if upToDate is not None:
+            newestInputTime = newestInput.timestamp if isinstance(newestInput, TimeStampFile) else newestInput
+            if not newestInputTime or upToDate.oldestOutput is None or newestInputTime <= upToDate.oldestOutput:
+                fileIndex.save()
+                self._newestOutput = TimeStampFile(upToDate.newestOutput) if upToDate.newestOutput else None
+                return None
+
+        checkedOutputs = []
+        oldestOutput = None
         def _find_build_reason(items):
+            nonlocal oldestOutput
             for source, output in items:
                 if basename(source) == 'package-info.java':
                     continue
                 if not exists(output):
                     return output + ' does not exist'
                 output_ts = TimeStampFile(output)
+                checkedOutputs.append(output)
+                if oldestOutput is None or output_ts.timestamp < oldestOutput:
+                    oldestOutput = output_ts.timestamp
                 if not self._newestOutput or output_ts.isNewerThan(self._newestOutput):
                     self._newestOutput = output_ts
                 if output_ts.isOlderThan(source):
@@ -7459,9 +7900,16 @@ class JavaBuildTask(ProjectBuildTask):
                     return f'{output_ts} is older than {newestInput}'
             return None
 
-        return _find_build_reason((item for item in self._javafiles.items() if basename(item[0]) != 'package-info.java')) or \
+        reason = _find_build_reason((item for item in self._javafiles.items() if basename(item[0]) != 'package-info.java')) or \
                _find_build_reason(self._non_javafiles.items()) or \
                _find_build_reason(self._copyfiles.items())
+        if reason is None:
+            fileIndex.record_state(itertools.chain(self._javafiles.keys(), self._non_javafiles.keys(), self._copyfiles.keys()),
+                                   checkedOutputs, oldestOutput, self._newestOutput.path if self._newestOutput else None)
+        else:
+            fileIndex.invalidate()
+        fileIndex.save()
+        return reason
 
     def _getCompiler(self):
         if self._compiler is None:
@@ -7503,16 +7951,29 @@ class JavaBuildTask(ProjectBuildTask):
                 created to assist this task when `build` is called should be placed.
         """
         self.compiler = self._getCompiler()
-        outputDir = ensure_dir_exists(self.subject.output_dir())
+        self._incremental = None
+        self._incrementalKey = None
         self._collect_files()
         javafiles = self._get_javafiles()
-        if javafiles:
+        classPath = classpath(self.subject.name, includeSelf=False, jdk=self.jdk, ignoreStripped=True, forBuild=True, includeOptionalDependencies=True) if javafiles else None
+        if javafiles and self._use_incremental_compilation():
+            self._incremental = self._plan_incremental_compilation(classPath)
+        outputDir = ensure_dir_exists(self.subject.output_dir())
+        if self._incremental is not None and not self._incremental.sources:
+            # Only sources were deleted that no other source depends on
+            self.compileArgs = None
+        elif javafiles:
             self.postCompileActions = []
+            sourceFiles = sorted(javafiles.keys())
+            if self._incremental is not None:
+                # The classes of the sources that are not recompiled are taken from the output directory
+                sourceFiles = self._incremental.sources
+                classPath = outputDir + os.pathsep + classPath if classPath else outputDir
             self.compileArgs = self.compiler.prepare(
-                sourceFiles=[_cygpathU2W(f) for f in sorted(javafiles.keys())],
+                sourceFiles=[_cygpathU2W(f) for f in sourceFiles],
                 project=self.subject,
                 outputDir=_cygpathU2W(outputDir),
-                classPath=_separatedCygpathU2W(classpath(self.subject.name, includeSelf=False, jdk=self.jdk, ignoreStripped=True, forBuild=True, includeOptionalDependencies=True)),
+                classPath=_separatedCygpathU2W(classPath),
                 sourceGenDir=self.subject.source_gen_dir(),
                 jnigenDir=self.subject.jni_gen_dir(),
                 processorPath=_separatedCygpathU2W(self.subject.annotation_processors_path(self.jdk)),
@@ -7527,6 +7988,12 @@ class JavaBuildTask(ProjectBuildTask):
 
     def build(self):
         outputDir = ensure_dir_exists(self.subject.output_dir())
+        # The outputs are about to change so the recorded up-to-date state must not survive a failed build
+        self._file_index().invalidate()
+        self._file_index().save()
+        self._abiFingerprint = None
+        if exists(self._abi_path()):
+            os.remove(self._abi_path())
         # Copy other files
         self._collect_files()
         if self._get_non_javafiles():
@@ -7538,9 +8005,21 @@ class JavaBuildTask(ProjectBuildTask):
                     self._newestOutput = output_ts
             logvv(f'Finished resource copy for {self.subject.name}')
         # Java build
+        graph = self._dependency_graph() if self._incrementalKey is not None else None
+        if graph is not None and exists(graph.path):
+            # The recorded graph must not survive a failed compilation
+            os.remove(graph.path)
+        if self._incremental is not None:
+            for classfile in self._incremental.staleClassFiles:
+                path = join(outputDir, classfile)
+                if exists(path):
+                    os.remove(path)
         if self.compileArgs:
             try:
-                self.compiler.compile(self.compileArgs)
+                if self._batch is not None:
+                    self._batch.compile(self)
+                else:
+                    self.compiler.compile(self.compileArgs)
             finally:
                 for action in self.postCompileActions:
                     action()
@@ -7551,6 +8030,12 @@ class JavaBuildTask(ProjectBuildTask):
                     output.append(os.path.join(root, fname))
             if output:
                 self._newestOutput = TimeStampFile(max(output, key=getmtime))
+        if graph is not None:
+            if self._incremental is not None:
+                graph.record(self._incrementalKey, outputDir, self._get_javafiles(), self._incremental.sources, self._incremental.deletedSources)
+            else:
+                graph.record(self._incrementalKey, outputDir, self._get_javafiles())
+            graph.save()
         # Record current annotation processor config
         self.subject.update_current_annotation_processors_file()
         if self._get_copyfiles():
@@ -7562,6 +8047,9 @@ class JavaBuildTask(ProjectBuildTask):
             logvv(f'Finished copying files from dependencies for {self.subject.name}')
 
     def clean(self, forBuild=False):
+        if forBuild and self._incremental is not None:
+            # The class files of the sources that are not recompiled are still valid
+            return
         genDir = self.subject.source_gen_dir()
         if exists(genDir):
             logv(f'Cleaning {genDir}...')
@@ -7583,6 +8071,160 @@ class JavaBuildTask(ProjectBuildTask):
             logv(f'Cleaning {jnigenDir}...')
             rmtree(jnigenDir)
 
+class JavaBatchBuildTask(TaskSequence):
+    """
+    Builds several small Java projects that do not depend on each other. The sources of all
+    the projects that need to be compiled are compiled with a single compiler invocation,
+    which saves the fixed cost of a compilation for every project. Everything else, including
+    the up-to-date checks, is done by the `JavaBuildTask` of each project.
+
+    Only projects with the same class path are batched so each project is compiled against
+    exactly the classes it can see when compiled on its own.
+    """
+
+    def __init__(self, args, members):
+        self._members = members
+        TaskSequence.__init__(self, members[0].subject, args)
+        for t in members:
+            t._log = self._log
+            for dep in t.deps:
+                if dep not in self.deps:
+                    self.deps.append(dep)
+        batchId = hashlib.sha1(' '.join(t.name for t in members).encode()).hexdigest()[:16]
+        self._stageDir = join(members[0].subject.suite.get_mx_output_dir(), 'javaBatch', batchId)
+        self._compileArgs = None
+        self._compiler = None
+        self._owners = None
+        self._classes = None
+
+    @property
+    def subtasks(self):
+        return self._members
+
+    @property
+    def name(self):
+        return 'batch(' + ','.join(t.name for t in self._members) + ')'
+
+    def initSharedMemoryState(self):
+        for t in self._members:
+            t.initSharedMemoryState()
+
+    def pushSharedMemoryState(self):
+        for t in self._members:
+            t.pushSharedMemoryState()
+
+    def pullSharedMemoryState(self):
+        for t in self._members:
+            t.pullSharedMemoryState()
+
+    def cleanSharedMemoryState(self):
+        for t in self._members:
+            t.cleanSharedMemoryState()
+
+    def prepare(self, daemons):
+        self._compileArgs = None
+        toCompile = []
+        for t in self._members:
+            t._batch = None
+            buildNeeded, _ = t.getBuildState()
+            if buildNeeded:
+                t.prepare(daemons)
+                if t.compileArgs and t._incremental is None:
+                    toCompile.append(t)
+        if len(toCompile) < 2:
+            return
+
+        classesDir = join(self._stageDir, 'classes')
+        fileList = join(self._stageDir, 'javafilelist.txt')
+        compileArgs = merge_compile_args([t.compileArgs for t in toCompile], _cygpathU2W(classesDir), _cygpathU2W(fileList))
+        if compileArgs is None:
+            logv(f'[{self.name}: compiler arguments of the projects differ - compiling them separately]')
+            return
+        owners = {}
+        for t in toCompile:
+            outputDir = t.subject.output_dir()
+            for source, classfile in t._get_javafiles().items():
+                key = (dirname(relpath(classfile, outputDir)).replace(os.sep, '/'), basename(source))
+                if key in owners:
+                    logv(f'[{self.name}: {owners[key]} and {t.subject} both contain {key[1]} in the same package - compiling them separately]')
+                    return
+                owners[key] = t
+        if exists(self._stageDir):
+            rmtree(self._stageDir)
+        ensure_dir_exists(classesDir)
+        with open(fileList, 'w') as fp:
+            java_argument_file.write_to_file(fp, [_cygpathU2W(f) for f in sorted(itertools.chain.from_iterable(t._get_javafiles().keys() for t in toCompile))])
+        self._compileArgs = compileArgs
+        self._compiler = toCompile[0].compiler
+        self._owners = owners
+        self._classes = None
+        for t in toCompile:
+            t._batch = self
+
+    def compile(self, task):
+        """
+        Called by the `JavaBuildTask` of a project in this batch instead of compiling the
+        project's sources. The first call compiles the sources of all projects in the batch.
+        """
+        classesDir = join(self._stageDir, 'classes')
+        if self._classes is None:
+            logv(f'Compiling {len(self._owners)} sources of {len(set(self._owners.values()))} projects with a single {self._compiler.name()} invocation')
+            self._compiler.compile(self._compileArgs)
+            try:
+                self._classes = split_classes(classesDir, self._owners)
+            except ValueError as e:
+                abort(str(e), context=task.subject)
+        outputDir = task.subject.output_dir()
+        for rel in self._classes.get(task, []):
+            dst = join(outputDir, rel)
+            ensure_dir_exists(dirname(dst))
+            os.replace(join(classesDir, rel), dst)
+
+    def execute(self):
+        try:
+            for t in self._members:
+                t.execute()
+        finally:
+            if self._compileArgs is not None and exists(self._stageDir):
+                rmtree(self._stageDir)
+        if all(t.status == 'skipped' for t in self._members):
+            self.status = 'skipped'
+
+def _java_batch_key(task):
+    """
+    Gets the key under which `task` can be batched with other Java compilations by
+    `JavaBatchBuildTask` or None if it must be compiled on its own.
+    """
+    if type(task) is not JavaBuildTask or task.buildForbidden():  # pylint: disable=unidiomatic-typecheck
+        return None
+    p = task.subject
+    if p.annotation_processors() or p.jni_gen_dir() or hasattr(p, 'copyFiles') or getattr(p, 'patchModule', None):
+        return None
+    compiler = task._getCompiler()
+    if not isinstance(compiler, JavacCompiler) or compiler.altJavac:
+        return None
+    if any(basename(f) == 'module-info.java' for f in task._get_javafiles()):
+        return None
+    cp = classpath(p.name, includeSelf=False, jdk=task.jdk, ignoreStripped=True, forBuild=True, includeOptionalDependencies=True)
+    return (task.jdk.home, str(p.javaCompliance), str(p.javaPreviewNeeded), compiler.name(), tuple(p.get_javac_lint_overrides() or []), cp)
+
+def _batch_java_tasks(tasks, args):
+    """
+    Replaces groups of small independent Java compilations in `tasks` by `JavaBatchBuildTask`s.
+
+    :return: the tasks to schedule, dependencies before dependents, and a map from each batched
+             task to the `JavaBatchBuildTask` executing it
+    """
+    aliases = {}
+    for members in plan_batches(tasks, _java_batch_key, lambda t: len(t._get_javafiles())):
+        batch = JavaBatchBuildTask(args, members)
+        for t in members:
+            aliases[t] = batch
+    if not aliases:
+        return list(tasks), aliases
+    logv(f'[Batching the compilation of {len(aliases)} Java projects into {len(set(aliases.values()))} compiler invocations]')
+    return schedule_order(tasks, aliases), aliases
+
 ### Compiler / Java Compiler
 
 class JavaCompiler:
@@ -7948,6 +8590,13 @@ class JavacDaemonCompiler(JavacCompiler):
             self.daemon = JavacDaemon(self.jdk, jvmArgs)
             daemons[key] = self.daemon
 
+def _use_persistent_compiler_daemons():
+    """
+    Determines if compiler daemons outlive the mx process that started them so that later
+    mx invocations can reuse them (see `CompilerDaemon._attach_persistent`).
+    """
+    return get_env('MX_PERSISTENT_COMPILER_DAEMONS') == 'true' and PersistentDaemonRegistry.is_supported()
+
 class CompilerDaemon(Daemon):
     def __init__(self, jdk, jvmArgs, mainClass, toolJar, buildArgs=None):
         logv(f"Starting daemon for {jdk.java} [{', '.join(jvmArgs)}]")
@@ -7960,10 +8609,21 @@ class CompilerDaemon(Daemon):
 
         self.port = None
         self.portRegex = re.compile(r'Started server on port ([0-9]+)')
+        self.persistent = _use_persistent_compiler_daemons()
+        self.closed = False
+        self._connectLock = threading.RLock()
+        self._mux = None
+        self._token = None
+
+        jobs = ['-j', str(cpu_count())]
+        if self.persistent:
+            self.connection = None
+            self._persistentArgs = [jdk.java] + jvmArgs + cpArgs + [mainClass] + jobs
+            self._attach_persistent()
+            return
 
         # Start Java process asynchronously
         verbose = ['-v'] if _opts.verbose else []
-        jobs = ['-j', str(cpu_count())]
         args = [jdk.java] + jvmArgs + cpArgs + [mainClass] + verbose + jobs
         start_new_session, creationflags = _get_new_progress_group_args()
         if _opts.verbose:
@@ -8006,7 +8666,6 @@ class CompilerDaemon(Daemon):
                 time.sleep(0.1)
 
         self.connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.closed = False
         try:
             self.connection.connect(('127.0.0.1', self.port))
             logv(f'[Started {myself}')
@@ -8015,6 +8674,54 @@ class CompilerDaemon(Daemon):
             logv(f'[Error starting {myself}: {e}]')
             raise e
 
+    def _attach_persistent(self):
+        """
+        Connects to a running persistent daemon for the same JDK, JVM arguments and compiler
+        server classes, starting one if there is none or it does not respond to a ping.
+        Persistent daemons are not tied to the lifetime of this mx process and shut
+        themselves down after being idle for MX_COMPILER_DAEMON_IDLE_TIMEOUT seconds.
+        """
+        args = self._persistentArgs
+        registry = PersistentDaemonRegistry(join(dot_mx_dir(), 'compiler-daemons'))
+        # The newest class file of the compiler server is part of the key so that an updated mx does not reuse an old daemon
+        stamps = []
+        for entry in args[args.index('-cp') + 1].split(os.pathsep) if '-cp' in args else []:
+            if isdir(entry):
+                stamps += [str(getmtime(join(root, f))) for root, _, files in os.walk(entry) for f in files]
+            elif exists(entry):
+                stamps.append(str(getmtime(entry)))
+        key = PersistentDaemonRegistry.key([os.path.realpath(self.jdk.java), str(self.jdk.version)] + args + [max(stamps, default='')])
+        with registry.locked(key):
+            published = registry.lookup(key)
+            if published and ping_daemon(published[0], published[2]):
+                self.port, _, self._token = published
+                logv(f'[Reusing {self.name()}[{published[1]}] on port {self.port}]')
+                return
+            registry.remove(key)
+            idleTimeout = get_env('MX_COMPILER_DAEMON_IDLE_TIMEOUT', '3600')
+            cmd = args + ['--port-file', registry.port_file(key), '--idle-timeout', idleTimeout]
+            if _opts.verbose:
+                log(' '.join(map(shlex.quote, cmd)))
+            start_new_session, creationflags = _get_new_progress_group_args()
+            with open(registry.log_file(key), 'w') as logFile:
+                p = subprocess.Popen(cmd, start_new_session=start_new_session, creationflags=creationflags, # pylint: disable=subprocess-popen-preexec-fn
+                                     stdin=subprocess.DEVNULL, stdout=logFile, stderr=subprocess.STDOUT)
+            deadline = time.time() + 30
+            while True:
+                published = registry.lookup(key)
+                if published:
+                    self.port, _, self._token = published
+                    logv(f'[Started persistent {self.name()}[{p.pid}] on port {self.port} (log: {registry.log_file(key)})]')
+                    return
+                returncode = p.poll()
+                if returncode is not None:
+                    with open(registry.log_file(key)) as fp:
+                        raise RuntimeError(f'Error starting {self.name()}[{p.pid}]: returncode={returncode}\n{fp.read()}')
+                if time.time() > deadline:
+                    p.kill()
+                    raise RuntimeError(f'Error starting {self.name()}[{p.pid}]: no port was published after 30 seconds')
+                time.sleep(0.1)
+
     def _noticePort(self, data):
         logv(data.rstrip())
         if self.port is None:
@@ -8023,42 +8730,58 @@ class CompilerDaemon(Daemon):
                 self.port = int(m.group(1))
 
     # See:
-    #   com.oracle.mxtool.compilerserver.CompilerDaemon.REQUEST_HEADER_COMPILE
     #   com.oracle.mxtool.compilerserver.CompilerDaemon.REQUEST_HEADER_SHUTDOWN
-    #   com.oracle.mxtool.compilerserver.CompilerDaemon.RESPONSE_DONE
-    header_compile = "MX DAEMON/COMPILE: "
     header_shutdown = "MX DAEMON/SHUTDOWN"
-    response_done = "MX DAEMON/DONE:"
 
-    def compile(self, compilerArgs):
+    def _connect(self):
         s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
             s.connect(('127.0.0.1', self.port))
-            logv(f'Compile with {self.name()}: {" ".join(compilerArgs)}')
-            commandLine = '\x00'.join(compilerArgs)
-            s.send((f'{CompilerDaemon.header_compile}{commandLine}\n').encode('utf-8'))
-            f = s.makefile()
-            while True:
-                response = str(f.readline())
-                if response.startswith(CompilerDaemon.response_done):
-                    retcode = int(response[len(CompilerDaemon.response_done):])
-                    break
-                if response == "":
-                    # Compiler server process probably crashed
-                    log('[Compiler daemon process appears to have crashed. ]')
-                    retcode = -1
-                    break
-                if response.startswith('Note: '):
-                    # Unimportant, keep them in the log but don't echo them
-                    log(response, end='')
-                else:
-                    # Always show javac warnings in the terminal
-                    log(response, end='', echo=True)
+        except ConnectionRefusedError:
+            s.close()
+            if not self.persistent:
+                raise
+            # The persistent daemon exited (e.g. idle timeout) since it was discovered
+            with self._connectLock:
+                if not ping_daemon(self.port, self._token):
+                    self._attach_persistent()
+            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            s.connect(('127.0.0.1', self.port))
+        return s
+
+    def _multiplexed(self):
+        """
+        Gets the connection to the daemon shared by all compilations of this mx process.
+        """
+        with self._connectLock:
+            if self._mux is None or self._mux.closed:
+                self._mux = MultiplexedConnection(self._connect(), self._token)
+            return self._mux
+
+    def compile(self, compilerArgs):
+        logv(f'Compile with {self.name()}: {" ".join(compilerArgs)}')
+
+        def _output(line):
+            if line.startswith('Note: '):
+                # Unimportant, keep them in the log but don't echo them
+                log(line, end='')
+            else:
+                # Always show javac warnings in the terminal
+                log(line, end='', echo=True)
+
+        diagnostics = []
+        try:
+            mux = self._multiplexed()
+            retcode, diagnostics = mux.compile(compilerArgs, _output)
+            if mux.closed and retcode == -1:
+                # Compiler server process probably crashed
+                log('[Compiler daemon process appears to have crashed. ]')
         except ConnectionError as e:
             log(f'[Exception while communicating with compiler daemon process: {e}]')
             retcode = -1
-        finally:
-            s.close()
+        task = getLogTask()
+        if task is not None:
+            task.diagnostics.extend(diagnostics)
         if retcode:
             detailed_retcode = str(subprocess.CalledProcessError(retcode, f'Compile with {self.name()}: ' + ' '.join(compilerArgs)))
             if _opts.verbose:
@@ -8073,6 +8796,15 @@ class CompilerDaemon(Daemon):
         return retcode
 
     def shutdown(self):
+        with self._connectLock:
+            if self._mux is not None:
+                self._mux.close()
+                self._mux = None
+        if self.persistent:
+            if not self.closed:
+                self.closed = True
+                logv(f'[Leaving {self} running for later builds]')
+            return
         if not self.closed:
             try:
                 self.connection.send(f'{CompilerDaemon.header_shutdown}\n'.encode('utf8'))
@@ -9023,6 +9755,13 @@ class LibraryDownloadTask(BuildTask):
     def newestOutput(self):
         return TimeStampFile(_make_absolute(self.subject.path, self.subject.suite.dir))
 
+    def contentOutputDigest(self):
+        # The declared digest identifies the contents of a library
+        digest = getattr(self.subject, 'digest', None)
+        if digest is None or digest.value == 'NOCHECK' or self.subject._check_download_needed():
+            return None
+        return str(digest)
+
     def build(self):
         self.subject.get_path(resolve=True)
         if hasattr(self.subject, 'get_source_path'):
@@ -11288,6 +12027,8 @@ def distribution(name, fatalIfMissing=True, context=None):
     """
     _, name = splitqualname(name)
     d = _dists.get(name)
+    if d is None and _load_lazy_suites_defining(name):
+        d = _dists.get(name)
     if d is None and fatalIfMissing:
         abort(_missing_dep_message(name, 'distribution'), context=context)
     return d
@@ -11334,6 +12075,8 @@ def dependency(name, fatalIfMissing=True, context=None):
         d = _jdkLibs.get(name)
     if d is None:
         d = _dists.get(name)
+    if d is None and _load_lazy_suites_defining(name):
+        return dependency(name, fatalIfMissing=fatalIfMissing, context=context)
     if d is None and fatalIfMissing:
         if hasattr(_opts, 'ignored_projects') and name in _opts.ignored_projects:
             abort('dependency named ' + name + ' is ignored', context=context)
@@ -11349,6 +12092,8 @@ def project(name, fatalIfMissing=True, context=None):
     """
     _, name = splitqualname(name)
     p = _projects.get(name)
+    if p is None and _load_lazy_suites_defining(name):
+        p = _projects.get(name)
     if p is None and fatalIfMissing:
         if name in _opts.ignored_projects:
             abort('project named ' + name + ' is ignored', context=context)
@@ -11366,6 +12111,8 @@ def library(name, fatalIfMissing=True, context=None):
     :rtype: BaseLibrary
     """
     l = _libs.get(name) or _jreLibs.get(name) or _jdkLibs.get(name)
+    if l is None and _load_lazy_suites_defining(name):
+        l = _libs.get(name) or _jreLibs.get(name) or _jdkLibs.get(name)
     if l is None and fatalIfMissing:
         if _projects.get(name):
             abort(name + ' is a project, not a library', context=context)
@@ -11417,6 +12164,11 @@ def classpath_entries(names=None, includeSelf=True, preferProjects=False, exclud
 
     assert len(set(roots) & set(excludes)) == 0
 
+    key = ('classpath_entries', tuple(roots) if names is not None else None, includeSelf, preferProjects, tuple(excludes), forBuild, includeOptionalDependencies)
+    return _dependency_graph_index.get(key, lambda: _compute_classpath_entries(roots, includeSelf, preferProjects, excludes, forBuild, includeOptionalDependencies))
+
+
+def _compute_classpath_entries(roots, includeSelf, preferProjects, excludes, forBuild, includeOptionalDependencies):
     cpEntries = []
     def _preVisit(dst, edge):
         if not (isinstance(dst, ClasspathDependency) or dst.isPOMDistribution()):
@@ -11447,22 +12199,60 @@ def classpath_entries(names=None, includeSelf=True, preferProjects=False, exclud
     return cpEntries
 
 
+class _ClasspathEntrySet:
+    """
+    A set of class path entries in which two existing regular files are the same entry if
+    `filecmp.cmp` considers them equal and a missing file is only the same entry as an identical path.
+    Other existing files (e.g. directories) are never the same entry. Files are indexed by inode and
+    size so that a file is only compared with the files it can be equal to.
+    """
+
+    def __init__(self, paths=()):
+        self._missing = set()
+        self._inodes = set()
+        self._files_by_size = {}
+        for path in paths:
+            self.add(path)
+
+    @staticmethod
+    def _stat(path):
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+
+    def __contains__(self, path):
+        st = _ClasspathEntrySet._stat(path)
+        if st is None:
+            return path in self._missing
+        if not S_ISREG(st.st_mode):
+            return False
+        if (st.st_dev, st.st_ino) in self._inodes:
+            return True
+        return any(filecmp.cmp(f, path) for f in self._files_by_size.get(st.st_size, []))
+
+    def add(self, path):
+        st = _ClasspathEntrySet._stat(path)
+        if st is None:
+            self._missing.add(path)
+        elif S_ISREG(st.st_mode):
+            self._inodes.add((st.st_dev, st.st_ino))
+            self._files_by_size.setdefault(st.st_size, []).append(path)
+
+
 def _entries_to_classpath(cpEntries, resolve=True, includeBootClasspath=False, jdk=None, unique=False, ignoreStripped=False, cp_prefix=None, cp_suffix=None):
     cp = []
     jdk = jdk or get_jdk()
     bcp_str = jdk.bootclasspath()
-    bcp = bcp_str.split(os.pathsep) if bcp_str else []
-
-    def _filecmp(a, b):
-        if not exists(a) or not exists(b):
-            return a == b
-        return filecmp.cmp(a, b)
+    bcp = _ClasspathEntrySet(bcp_str.split(os.pathsep) if bcp_str and not includeBootClasspath else [])
+    seen = _ClasspathEntrySet()
 
     def _appendUnique(cp_addition):
         for new_path in cp_addition.split(os.pathsep):
-            if (not unique or not any((_filecmp(d, new_path) for d in cp))) \
-                    and (includeBootClasspath or not any((_filecmp(d, new_path) for d in bcp))):
+            if (not unique or new_path not in seen) and (includeBootClasspath or new_path not in bcp):
                 cp.append(new_path)
+                if unique:
+                    seen.add(new_path)
     if includeBootClasspath:
         if bcp_str:
             _appendUnique(bcp_str)
@@ -11694,6 +12484,60 @@ def defaultDependencies(opt_limit_to_suite=False):
     return removedDeps, deps
 
 
+class _DependencyGraphIndex:
+    """
+    Memoizes the results of dependency graph queries whose traversal is fully determined by their
+    arguments, such as `classpath_entries` and `sorted_dists`, so that repeated queries (e.g. one
+    class path per project during a build) do not walk the graph again.
+
+    The index is only used once the graph is complete (see `freeze`), i.e. after the last extension
+    hook that may change the dependencies of projects and distributions in place has run. It is
+    cleared by any change to the graph made through `Distribution.removeDependency`, the
+    (un)registration of a project, library or distribution or the removal of unsatisfied
+    dependencies. It is not used while a deferred suite is loaded (see `thaw`).
+    """
+
+    def __init__(self):
+        self._frozen = False
+        self._results = {}
+
+    def freeze(self):
+        """Starts memoizing queries. Called once all suites are loaded and unsatisfied dependencies are removed."""
+        self._results.clear()
+        self._frozen = True
+
+    def thaw(self):
+        """
+        Stops memoizing queries and discards all memoized results, e.g. while the extension hooks
+        of a suite loaded on demand run.
+
+        :return: whether the index was frozen
+        """
+        frozen, self._frozen = self._frozen, False
+        self._results.clear()
+        return frozen
+
+    def invalidate(self):
+        """Discards all memoized results after a change to the dependency graph."""
+        self._results.clear()
+
+    def get(self, key, compute):
+        """
+        Gets the result of the query identified by `key`, calling `compute` to compute it on a miss.
+        The result is a list that is copied for each caller.
+        """
+        if not self._frozen:
+            return compute()
+        result = self._results.get(key)
+        if result is None:
+            result = compute()
+            self._results[key] = result
+        return list(result)
+
+
+_dependency_graph_index = _DependencyGraphIndex()
+
+
 def walk_deps(roots=None, preVisit=None, visit=None, ignoredEdges=None, visitEdge=None):
     """
     Walks a spanning tree of the dependency graph. The first time a dependency `dep` is seen, if the
@@ -11725,18 +12569,22 @@ def sorted_dists():
     Gets distributions sorted such that each distribution comes after
     any distributions it depends upon.
     """
-    dists = []
-    def add_dist(dist):
-        if not dist in dists:
-            for dep in dist.deps:
-                if dep.isDistribution():
-                    add_dist(dep)
-            if not dist in dists:
-                dists.append(dist)
+    def _compute():
+        dists = []
+        added = set()
+        def add_dist(dist):
+            if not dist in added:
+                for dep in dist.deps:
+                    if dep.isDistribution():
+                        add_dist(dep)
+                if not dist in added:
+                    added.add(dist)
+                    dists.append(dist)
 
-    for d in _dists.values():
-        add_dist(d)
-    return dists
+        for d in _dists.values():
+            add_dist(d)
+        return dists
+    return _dependency_graph_index.get(('sorted_dists',), _compute)
 
 def distributions(opt_limit_to_suite=False):
     sorted_dists = sorted((d for d in _dists.values() if not d.suite.internal))
@@ -12263,6 +13111,19 @@ def _expand_java_home(source, home):
     return os.path.abspath(home)
 
 
+_jdk_probe_cache_instance = None
+
+def _jdk_probe_cache():
+    """
+    Gets the `JDKProbeCache` in ~/.mx used to avoid running JDK tools to find out about a JDK,
+    or None if MX_JDK_PROBE_CACHE=false.
+    """
+    global _jdk_probe_cache_instance
+    if _jdk_probe_cache_instance is None and env_var_to_bool('MX_JDK_PROBE_CACHE', 'true'):
+        _jdk_probe_cache_instance = JDKProbeCache(join(dot_mx_dir(), 'jdk-probes.json'), str(version))
+    return _jdk_probe_cache_instance
+
+
 def _probe_JDK(home):
     res = _probed_JDKs.get(home)
     if not res:
@@ -13049,40 +13910,53 @@ class JDKConfig(Comparable):
                 if m:
                     version = m.group(0)
         if version is None:
-            try:
-                output = _check_output_str([self.java, '-version'], stderr=subprocess.STDOUT)
-            except subprocess.CalledProcessError as e:
-                raise JDKConfigException(f'{e.returncode}: {e.output}')
+            probeCache = _jdk_probe_cache()
+            cached = probeCache.get(self.home, 'version') if probeCache else None
+            if cached:
+                version, self._is_openjdk = cached
+            else:
+                version, self._is_openjdk = self._probe_version()
+                if probeCache:
+                    probeCache.put(self.home, 'version', [version, self._is_openjdk])
 
-            def _checkOutput(out):
-                return 'java version' in out and 'warning' not in out
+        self.version = VersionSpec(version)
+        ver = self.version.parts[1] if self.version.parts[0] == 1 else self.version.parts[0]
+        self.javaCompliance = JavaCompliance(ver)
 
-            self._is_openjdk = 'openjdk' in output.lower()
+        self.debug_args = java_debug_args()
 
-            # hotspot can print a warning, e.g. if there's a .hotspot_compiler file in the cwd
-            output = output.split('\n')
-            version = None
-            for o in output:
-                if _checkOutput(o):
-                    assert version is None, version
-                    version = o
+    def _probe_version(self):
+        """
+        Runs ``java -version`` to get the version of this JDK and whether it is OpenJDK based.
+        """
+        try:
+            output = _check_output_str([self.java, '-version'], stderr=subprocess.STDOUT)
+        except subprocess.CalledProcessError as e:
+            raise JDKConfigException(f'{e.returncode}: {e.output}')
 
-            def _checkOutput0(out):
-                return 'version' in out and 'warning' not in out
+        def _checkOutput(out):
+            return 'java version' in out and 'warning' not in out
 
-            # fall back: check for 'version' if there is no 'java version' string
-            if not version:
-                for o in output:
-                    if _checkOutput0(o):
-                        assert version is None, version
-                        version = o
-            version = version.split()[2].strip('"')
+        is_openjdk = 'openjdk' in output.lower()
 
-        self.version = VersionSpec(version)
-        ver = self.version.parts[1] if self.version.parts[0] == 1 else self.version.parts[0]
-        self.javaCompliance = JavaCompliance(ver)
+        # hotspot can print a warning, e.g. if there's a .hotspot_compiler file in the cwd
+        output = output.split('\n')
+        version = None
+        for o in output:
+            if _checkOutput(o):
+                assert version is None, version
+                version = o
 
-        self.debug_args = java_debug_args()
+        def _checkOutput0(out):
+            return 'version' in out and 'warning' not in out
+
+        # fall back: check for 'version' if there is no 'java version' string
+        if not version:
+            for o in output:
+                if _checkOutput0(o):
+                    assert version is None, version
+                    version = o
+        return version.split()[2].strip('"'), is_openjdk
 
     @staticmethod
     def parse_release_file(release_file_path):
@@ -13116,16 +13990,24 @@ class JDKConfig(Comparable):
     def _init_classpaths(self):
         if not self._classpaths_initialized:
             if self.javaCompliance <= JavaCompliance(8):
-                _, binDir = _compile_mx_class('ClasspathDump', jdk=self)
-                remaining_attempts = 2
-                while remaining_attempts != 0:
-                    remaining_attempts -= 1
-                    try:
-                        self._bootclasspath, self._extdirs, self._endorseddirs = [x if x != 'null' else None for x in _check_output_str([self.java, '-cp', _cygpathU2W(binDir), 'ClasspathDump'], stderr=subprocess.PIPE).split('|')]
-                    except subprocess.CalledProcessError as e:
-                        if remaining_attempts == 0:
-                            abort(f'{str(e)}{os.linesep}Command output:{e.output}{os.linesep}')
-                        warn(f'{str(e)}{os.linesep}Command output:{e.output}{os.linesep}')
+                probeCache = _jdk_probe_cache()
+                cached = probeCache.get(self.home, 'classpaths') if probeCache else None
+                if cached:
+                    self._bootclasspath, self._extdirs, self._endorseddirs = cached
+                else:
+                    _, binDir = _compile_mx_class('ClasspathDump', jdk=self)
+                    remaining_attempts = 2
+                    while remaining_attempts != 0:
+                        remaining_attempts -= 1
+                        try:
+                            self._bootclasspath, self._extdirs, self._endorseddirs = [x if x != 'null' else None for x in _check_output_str([self.java, '-cp', _cygpathU2W(binDir), 'ClasspathDump'], stderr=subprocess.PIPE).split('|')]
+                            if probeCache:
+                                probeCache.put(self.home, 'classpaths', [self._bootclasspath, self._extdirs, self._endorseddirs])
+                            break
+                        except subprocess.CalledProcessError as e:
+                            if remaining_attempts == 0:
+                                abort(f'{str(e)}{os.linesep}Command output:{e.output}{os.linesep}')
+                            warn(f'{str(e)}{os.linesep}Command output:{e.output}{os.linesep}')
                 # All 3 system properties accessed by ClasspathDump are expected to exist
                 if not self._bootclasspath or not self._extdirs or not self._endorseddirs:
                     warn("Could not find all classpaths: boot='" + str(self._bootclasspath) + "' extdirs='" + str(self._extdirs) + "' endorseddirs='" + str(self._endorseddirs) + "'")
@@ -13263,39 +14145,51 @@ class JDKConfig(Comparable):
         Gets the lint warnings supported by this JDK.
         """
         if self._knownJavacLints is None:
-            try:
-                out = _check_output_str([self.javac, '-X'], stderr=subprocess.STDOUT)
-            except subprocess.CalledProcessError as e:
-                if e.output:
-                    log(e.output)
-                raise e
-            if self.javaCompliance < JavaCompliance(9):
-                lintre = re.compile(r"-Xlint:\{([a-z-]+(?:,[a-z-]+)*)\}")
-                m = lintre.search(out)
-                if not m:
-                    self._knownJavacLints = []
-                else:
-                    self._knownJavacLints = m.group(1).split(',')
+            probeCache = _jdk_probe_cache()
+            cached = probeCache.get(self.home, 'javacLints') if probeCache else None
+            if cached:
+                self._knownJavacLints, self._javacXModuleOptionExists = cached
             else:
-                self._knownJavacLints = []
-                lines = out.split(os.linesep)
-                inLintSection = False
-                for line in lines:
-                    if not inLintSection:
-                        if '-Xmodule' in line:
-                            self._javacXModuleOptionExists = True
-                        elif line.strip() in ['-Xlint:key,...', '-Xlint:<key>(,<key>)*']:
-                            inLintSection = True
-                    else:
-                        if line.startswith('         '):
-                            warning = line.split(maxsplit=1)[0]
-                            self._knownJavacLints.append(warning)
-                            self._knownJavacLints.append('-' + warning)
-                        elif line.strip().startswith('-X'):
-                            return self._knownJavacLints
-                warn('Did not find lint warnings in output of "javac -X"')
+                self._knownJavacLints = self._probe_javac_lints()
+                if probeCache:
+                    probeCache.put(self.home, 'javacLints', [self._knownJavacLints, self._javacXModuleOptionExists])
         return self._knownJavacLints
 
+    def _probe_javac_lints(self):
+        """
+        Runs ``javac -X`` to get the lint warnings supported by this JDK.
+        """
+        try:
+            out = _check_output_str([self.javac, '-X'], stderr=subprocess.STDOUT)
+        except subprocess.CalledProcessError as e:
+            if e.output:
+                log(e.output)
+            raise e
+        if self.javaCompliance < JavaCompliance(9):
+            lintre = re.compile(r"-Xlint:\{([a-z-]+(?:,[a-z-]+)*)\}")
+            m = lintre.search(out)
+            if not m:
+                return []
+            return m.group(1).split(',')
+        knownJavacLints = []
+        lines = out.split(os.linesep)
+        inLintSection = False
+        for line in lines:
+            if not inLintSection:
+                if '-Xmodule' in line:
+                    self._javacXModuleOptionExists = True
+                elif line.strip() in ['-Xlint:key,...', '-Xlint:<key>(,<key>)*']:
+                    inLintSection = True
+            else:
+                if line.startswith('         '):
+                    warning = line.split(maxsplit=1)[0]
+                    knownJavacLints.append(warning)
+                    knownJavacLints.append('-' + warning)
+                elif line.strip().startswith('-X'):
+                    return knownJavacLints
+        warn('Did not find lint warnings in output of "javac -X"')
+        return knownJavacLints
+
     def get_modules(self):
         """
         Gets the modules in this JDK.
@@ -13326,23 +14220,28 @@ class JDKConfig(Comparable):
                     return False
                 return True
 
-            if not _use_cache():
-                addExportsArg = '--add-exports=java.base/jdk.internal.module=ALL-UNNAMED'
-                out = LinesOutputCapture()
-                app = join(_mx_home, 'java', 'ListModules.java')
-                run([self.java, addExportsArg, '-Xint', app], out=out)
-                lines = out.lines
-                if isJDKImage:
-                    for dst, content in [(cache_source, self.home), (cache, '\n'.join(lines))]:
-                        try:
-                            with open(dst, 'w') as fp:
-                                fp.write(content)
-                        except IOError as e:
-                            warn('Error writing to ' + dst + ': ' + str(e))
-                            os.remove(dst)
-            else:
-                with open(cache) as fp:
-                    lines = fp.read().split('\n')
+            probeCache = _jdk_probe_cache() if isJDKImage else None
+            lines = probeCache.get(self.home, 'modules') if probeCache else None
+            if lines is None:
+                if not _use_cache():
+                    addExportsArg = '--add-exports=java.base/jdk.internal.module=ALL-UNNAMED'
+                    out = LinesOutputCapture()
+                    app = join(_mx_home, 'java', 'ListModules.java')
+                    run([self.java, addExportsArg, '-Xint', app], out=out)
+                    lines = out.lines
+                    if isJDKImage:
+                        for dst, content in [(cache_source, self.home), (cache, '\n'.join(lines))]:
+                            try:
+                                with open(dst, 'w') as fp:
+                                    fp.write(content)
+                            except IOError as e:
+                                warn('Error writing to ' + dst + ': ' + str(e))
+                                os.remove(dst)
+                else:
+                    with open(cache) as fp:
+                        lines = fp.read().split('\n')
+                if probeCache:
+                    probeCache.put(self.home, 'modules', lines)
 
             modules = {}
             name = None
@@ -13750,6 +14649,30 @@ def _build_with_report(cmd_args, build_report, parser=None):
                         "compilation that produces finer grained modification times than mx's build system. Shallow "
                         "dependency checking only applies to non-native projects. This option can be also set by defining"
                         "the environment variable MX_BUILD_SHALLOW_DEPENDENCY_CHECKS to true.")
+    parser.add_argument('--content-digests', action='store_const', const=True, help="decide whether Java projects and "
+                        "JAR distributions need to be built by comparing content digests of their inputs, outputs and dependencies "
+                        "with those recorded by the previous build instead of modification times. Dependents are not rebuilt "
+                        "if a rebuilt dependency produced identical output. This option can be also set by defining the "
+                        "environment variable MX_BUILD_CONTENT_DIGESTS to true.")
+    parser.add_argument('--build-cache', action='store_const', const=True, help="restore the outputs of Java projects "
+                        "from a cache shared by all builds of the current user (in the mx cache directory) if they were built "
+                        "before with identical inputs, and store the outputs of newly built projects in it. Implies "
+                        "--content-digests. The least recently used entries are evicted once the cache exceeds "
+                        "MX_BUILD_CACHE_MAX_SIZE (default 10g). This option can be also set by defining the environment "
+                        "variable MX_BUILD_CACHE to true.")
+    parser.add_argument('--incremental-java', action='store_const', const=True, help="when only some sources of a Java project "
+                        "changed, only compile them and the sources that depend on them, using a class level dependency graph "
+                        "recorded by the previous compilation. All sources are compiled if a dependency, the class path or the "
+                        "compiler options changed, if a changed class declares compile time constants or if most sources are "
+                        "affected. This option can be also set by defining the environment variable MX_BUILD_INCREMENTAL_JAVA to true.")
+    parser.add_argument('--java-abi-cutoff', action='store_const', const=True, help="do not rebuild a Java project because "
+                        "a Java project it depends on was rebuilt if the ABI of the latter (the non-private signatures, annotations "
+                        "and constants of its classes and the ABI of its own dependencies) did not change. This option can be "
+                        "also set by defining the environment variable MX_BUILD_JAVA_ABI_CUTOFF to true.")
+    parser.add_argument('--batch-compile', action='store_const', const=True, help="compile the sources of small Java projects "
+                        "that do not depend on each other and are compiled with the same javac options with a single javac "
+                        "invocation if they also have the same class path. This option can be also set by defining the environment variable "
+                        "MX_BUILD_BATCH_COMPILE to true.")
     parser.add_argument('--source', dest='compliance', help='Java compliance level for projects without an explicit one')
     parser.add_argument('--Wapi', action='store_true', dest='warnAPI', help='show warnings about using internal APIs')
     dependencies_group = parser.add_mutually_exclusive_group()
@@ -13927,6 +14850,10 @@ def _build_with_report(cmd_args, build_report, parser=None):
 
     walk_deps(visit=_createTask, visitEdge=_registerDep, roots=roots, ignoredEdges=[DEP_EXCLUDED])
 
+    batchedTasks = {}
+    if get_env('MX_BUILD_BATCH_COMPILE') == 'true' or args.batch_compile:
+        sortedTasks, batchedTasks = _batch_java_tasks(sortedTasks, args)
+
     if removed_non_default:
         removed = sorted(removed_non_default)
         build_report.add_info("non-default dependencies were removed from build", removed)
@@ -13985,20 +14912,19 @@ def _build_with_report(cmd_args, build_report, parser=None):
     if args.download_only:
         # Ensure all downloadable dependencies are present in the mx cache so that a subsequent
         # build can run without network access.
-        for t in sortedTasks:
-            if isinstance(t, LibraryDownloadTask):
-                t.build()
+        _downloader().map(LibraryDownloadTask.build, [t for t in sortedTasks if isinstance(t, LibraryDownloadTask)])
         return
 
     if args.dry_run:
         return
 
-    if not args.force_daemon and len(sortedTasks) == 1:
+    if not args.force_daemon and len(sortedTasks) == 1 and not _use_persistent_compiler_daemons():
         # Spinning up a daemon for a single task doesn't make sense
         if not args.no_daemon:
             logv('[Disabling use of compile daemon for single build task]')
             args.no_daemon = True
     daemons = {}
+    build_stats = BuildStatsDatabase(join(primary_suite().get_mx_output_dir(jdkDependent=False), 'build-stats.jsonl'))
 
     def _can_precheck_without_prepare(task):
         return isinstance(task, BuildTask) and task.canSkipPrepare()
@@ -14013,57 +14939,24 @@ def _build_with_report(cmd_args, build_report, parser=None):
     if args.parallelize and onlyDeps is None:
         _before_fork()
 
-        def checkTasks(tasks):
-            active = []
-            failed = []
-            for t in tasks:
-                if t.proc.is_alive():
-                    active.append(t)
-                else:
-                    t.pullSharedMemoryState()
-                    t.cleanSharedMemoryState()
-                    t._finished = True
-                    t._end_time = time.time()
-                    if t.exitcode != 0:
-                        failed.append(t)
-                    _removeSubprocess(t.sub)
-                    # Release the pipe file descriptors ASAP (only available on Python 3.7+)
-                    if hasattr(t.proc, 'close'):
-                        t.proc.close()
-            return active, failed
-
-        def remainingDepsDepth(task):
-            if task._d is None:
-                incompleteDeps = [d for d in task.deps if not getattr(d, '_finished', False)]
-                if len(incompleteDeps) == 0:
-                    task._d = 0
-                else:
-                    task._d = max(remainingDepsDepth(t) for t in incompleteDeps) + 1
-            return task._d
-
         cpus = cpu_count()
-
-        def sortWorklist(tasks):
-            for t in tasks:
-                if t.parallelism > cpus:
-                    abort(f'{t} requires more parallelism ({t.parallelism}) than available CPUs ({cpus})')
-                t._d = None
-            return sorted(tasks, key=remainingDepsDepth)
+        for t in sortedTasks:
+            if t.parallelism > cpus:
+                abort(f'{t} requires more parallelism ({t.parallelism}) than available CPUs ({cpus})')
+            t._finished = False
+        stats_key = _build_stats_key(args)
+        scheduler = TaskScheduler(sortedTasks, cpus,
+                                  cost=build_stats.cost_estimator(sortedTasks, *stats_key, _build_stats_task_key, lambda t: t.build_time),
+                                  demand=build_stats.cpu_demand_estimator(*stats_key, _build_stats_task_key),
+                                  aliases=batchedTasks)
 
         # Returns whether any task still requires the compiler daemon
         def anyJavaTask(tasks):
-            return any(isinstance(task, (JavaBuildTask, JARArchiveTask)) for task in tasks)
+            return any(isinstance(task, (JavaBuildTask, JavaBatchBuildTask, JARArchiveTask)) for task in tasks)
 
         totalTasks = len(sortedTasks)
-        worklist = sortWorklist(sortedTasks)
-        active = []
         failed = []
         remaining_java_tasks = True
-        def _activeCpus(_active):
-            cpus = 0
-            for t in _active:
-                cpus += t.parallelism
-            return cpus
 
         progressIdx = 0
         curProgressTask = None
@@ -14072,8 +14965,9 @@ def _build_with_report(cmd_args, build_report, parser=None):
         def showProgress():
             if not isInteractive or totalTasks < 2:
                 return
+            active = scheduler.running()
             running = len(active)
-            pending = len(worklist)
+            pending = len(scheduler.pending())
             err = len(failed)
             done = totalTasks - pending - running - err
             statusline = ""
@@ -14114,97 +15008,86 @@ def _build_with_report(cmd_args, build_report, parser=None):
             elif running == 0 and err > 0:
                 sys.stdout.write(statusline + " failed\n")
 
-        def joinTasks():
-            for t in active[:]:
-                showProgress()
-                t.proc.join(timeout=0.2 if isInteractive else None)
-                if t.proc.exitcode is None:
-                    continue
-                active.remove(t)
-                _removeSubprocess(t.sub)
-                if t.proc.exitcode != 0:
-                    failed.append(t)
-                # Release the pipe file descriptors ASAP (only available on Python 3.7+)
-                if hasattr(t.proc, 'close'):
-                    t.proc.close()
-
-        while len(worklist) != 0:
-            while True:
-                active, failed = checkTasks(active)
-                if len(failed) != 0:
-                    break
-                showProgress()
-                if _activeCpus(active) >= cpus:
-                    # Sleep for 0.2 second
-                    time.sleep(0.2)
-                else:
-                    break
-
-            if len(failed) != 0:
-                break
-
-            def executeTask(task):
+        def executeTask(task):
+            try:
                 if not isinstance(task.proc, Thread):
                     # Clear sub-process list cloned from parent process
                     del _currentSubprocesses[:]
                 task.enter()
+                cpu_start = time.thread_time()
                 try:
                     task.execute()
                 except TaskAbortException:
                     pass
                 finally:
+                    task._cpu_time = time.thread_time() - cpu_start
                     task.leave()
                 task.pushSharedMemoryState()
-
-            def depsDone(task):
-                for d in task.deps:
-                    if not getattr(d, '_finished', False):
-                        return False
-                return True
-
+            finally:
+                scheduler.completed(task)
+
+        def retireTask(t):
+            # The completion is signalled just before the task returns, so joining is quick
+            t.proc.join()
+            t.pullSharedMemoryState()
+            t.cleanSharedMemoryState()
+            t._finished = True
+            t._end_time = time.time()
+            scheduler.finished(t)
+            if t.exitcode != 0:
+                failed.append(t)
+            _removeSubprocess(t.sub)
+            # Release the pipe file descriptors ASAP (only available on Python 3.7+)
+            if hasattr(t.proc, 'close'):
+                t.proc.close()
+
+        while scheduler.has_pending() and len(failed) == 0:
             if remaining_java_tasks:
-                remaining_java_tasks = anyJavaTask(active) or anyJavaTask(worklist)
+                remaining_java_tasks = anyJavaTask(scheduler.running()) or anyJavaTask(scheduler.pending())
                 if not remaining_java_tasks:
                     logv("Terminating java daemons to free memory")
                     for daemon in daemons.values():
                         logv(f"Terminating java daemon {daemon}")
                         daemon.shutdown()
 
-            added_new_tasks = False
-            worklist.sort(key=lambda task: task.build_time, reverse=True)
-            for task in worklist[:]:
-                if depsDone(task) and _activeCpus(active) + task.parallelism <= cpus:
-                    worklist.remove(task)
-                    if _can_precheck_without_prepare(task):
-                        buildNeeded, _ = task.getBuildState()
-                        if not buildNeeded:
-                            _mark_task_skipped(task)
-                            added_new_tasks = True
-                            continue
-                    task.initSharedMemoryState()
-                    task.prepare(daemons)
-                    task.proc = multiprocessing.Process(target=executeTask, args=(task,))
-                    task._start_time = time.time()
-                    task._finished = False
-                    task.proc.start()
-                    active.append(task)
-                    task.sub = None if isinstance(task.proc, Thread) else _addSubprocess(task.proc, [str(task)])
-                    added_new_tasks = True
-                if _activeCpus(active) >= cpus:
-                    break
+            startedTasks = False
+            for task in scheduler.take_ready():
+                if _can_precheck_without_prepare(task):
+                    buildNeeded, _ = task.getBuildState()
+                    if not buildNeeded:
+                        _mark_task_skipped(task)
+                        scheduler.finished(task)
+                        startedTasks = True
+                        continue
+                task.initSharedMemoryState()
+                task.prepare(daemons)
+                task.proc = multiprocessing.Process(target=executeTask, args=(task,))
+                task._start_time = time.time()
+                scheduler.started(task)
+                task.proc.start()
+                task.sub = None if isinstance(task.proc, Thread) else _addSubprocess(task.proc, [str(task)])
+                startedTasks = True
+
+            if startedTasks:
+                # Skipped tasks may have made other tasks ready without anything completing
+                continue
 
-            if not added_new_tasks:
-                time.sleep(0.2)
+            if not scheduler.running():
+                abort('Build scheduler stalled: ' + ', '.join(str(t) for t in scheduler.pending()) + ' can never be started')
 
-            worklist = sortWorklist(worklist)
+            showProgress()
+            for t in scheduler.wait(timeout=0.2 if isInteractive else None):
+                retireTask(t)
 
         if len(failed) > 0:
             # cancel pending build subprocesses on failure
-            for t in active:
+            for t in scheduler.running():
                 t.cancelSubprocs(failed)
 
-        while len(active) > 0:
-            joinTasks()
+        while scheduler.running():
+            showProgress()
+            for t in scheduler.wait(timeout=0.2 if isInteractive else None):
+                retireTask(t)
         showProgress()
 
         def dump_task_stats(f):
@@ -14241,11 +15124,19 @@ def _build_with_report(cmd_args, build_report, parser=None):
                     t.prepare(daemons)
             else:
                 t.prepare(daemons)
+            t._start_time = time.time()
+            cpu_start = time.thread_time()
             t.execute()
+            t._cpu_time = time.thread_time() - cpu_start
+            t._end_time = time.time()
 
     for daemon in daemons.values():
         daemon.shutdown()
 
+    _record_build_stats(build_stats, sortedTasks, args)
+    if any(getattr(t, '_storedInBuildCache', False) for t in sortedTasks):
+        _trim_build_cache()
+
     if env_gc_after_build:
         warn(f'Running `mx gc-dists {env_gc_after_build}` after building ({env_gc_after_build_varname} is set)')
         mx_gc.gc_dists(env_gc_after_build.split())
@@ -14256,6 +15147,57 @@ def _build_with_report(cmd_args, build_report, parser=None):
         return args
     return None
 
+def _build_stats_key(args):
+    """
+    Gets the (jdk, config) part of the key under which build task durations are recorded.
+    The config distinguishes the Java compiler used since it dominates the cost of Java builds.
+    """
+    if args.error_prone:
+        compiler = 'error-prone'
+    elif args.jdt and not args.force_javac:
+        compiler = 'ecj'
+    else:
+        compiler = 'javac'
+    if not args.no_daemon:
+        compiler += '-daemon'
+    return _java_home(), compiler
+
+def _build_stats_task_key(task):
+    discriminant = task.subject._extra_artifact_discriminant()
+    return f'{task.name}/{discriminant}' if discriminant else task.name
+
+def _record_build_stats(build_stats, tasks, args):
+    """
+    Records the duration and resource usage of the tasks in `tasks` that did some work.
+    """
+    jdk, config = _build_stats_key(args)
+    for task in tasks:
+        if not isinstance(task, (BuildTask, TaskSequence)) or task.status in ('skipped', 'failed', 'cancelled'):
+            continue
+        if isinstance(task, TaskSequence) and all(t.status == 'skipped' for t in task.subtasks):
+            continue
+        if getattr(task, '_end_time', None) is None or getattr(task, '_start_time', None) is None:
+            continue
+        build_stats.record(TaskStat(_build_stats_task_key(task), jdk, config, task._start_time, task._end_time,
+                                    getattr(task, '_cpu_time', 0.0) + task.subprocessCpuTime, task.subprocessMaxRss))
+    try:
+        build_stats.flush()
+    except OSError as e:
+        warn(f'Could not write build statistics to {build_stats.path}: {e}')
+
+def _trim_build_cache():
+    """
+    Evicts the least recently used entries from the shared build cache if it exceeds its maximum size.
+    """
+    cache = BuildCache.default()
+    try:
+        removed = cache.evict(BuildCache.max_size())
+    except OSError as e:
+        warn(f'Could not trim build cache {cache.root}: {e}')
+        return
+    if removed:
+        logv(f'Evicted {len(removed)} entries from build cache {cache.root}')
+
 def build_suite(s):
     """build all projects in suite (for dynamic import)"""
     # Note we must use the "build" method in "s" and not the one
@@ -14591,7 +15533,7 @@ class TempDirCwd(TempDir):
         super(TempDirCwd, self).__exit__(exc_type, exc_value, traceback)
 
 
-from .mx_util import SafeFileCreation
+from .mx_util import SafeFileCreation, materialize_file
 
 class SafeDirectoryUpdater(object):
     """
@@ -14672,6 +15614,25 @@ def _derived_path(base_path, suffix, prefix='.', prepend_dirname=True):
         derived = join(dirname(base_path), derived)
     return derived
 
+_archive_executor_instance = None
+_archive_executor_lock = threading.Lock()
+
+def _archive_executor():
+    """
+    Gets the executor shared by all archive tasks of this mx process for staging and compressing archive
+    contents on `MX_ARCHIVE_THREADS` (default: the number of CPUs) threads or None if that number is 1.
+    """
+    global _archive_executor_instance
+    with _archive_executor_lock:
+        if _archive_executor_instance is None:
+            threads = int(get_env('MX_ARCHIVE_THREADS', str(cpu_count())))
+            if threads <= 1:
+                return None
+            from concurrent.futures import ThreadPoolExecutor
+            _archive_executor_instance = ThreadPoolExecutor(threads, thread_name_prefix='mx-archive')
+        return _archive_executor_instance
+
+
 class Archiver(SafeFileCreation):
     """
     Utility for creating and updating a zip or tar file atomically.
@@ -14689,6 +15650,7 @@ class Archiver(SafeFileCreation):
         self.duplicates_action = duplicates_action
         self._provenance_map = {} if duplicates_action else None
         self.context = context
+        self._gzf = None
 
     def _add_zip(self, filename, archive_name, provenance):
         self._add_provenance(archive_name, provenance)
@@ -14759,7 +15721,9 @@ class Archiver(SafeFileCreation):
             elif self.kind in ('tgz', 'tar.gz'):
                 if not self.compress:
                     warn(f"Archiver created with compress={self.compress} and kind={self.kind}, ignoring compression setting")
-                self.zf = tarfile.open(self.tmpPath, 'w:gz')
+                # Compress the tar stream as independent gzip members on multiple threads
+                self._gzf = ParallelGzipWriter(io_open(self.tmpPath, 'wb'), _archive_executor())
+                self.zf = tarfile.open(mode='w', fileobj=self._gzf)
                 self._add_f = self._add_tar
                 self._add_str = self._add_str_tar
                 self._add_link = self._add_link_tar
@@ -14771,6 +15735,8 @@ class Archiver(SafeFileCreation):
         if self.path:
             if self.zf:
                 self.zf.close()
+            if self._gzf:
+                self._gzf.close()
             SafeFileCreation.__exit__(self, exc_type, exc_value, traceback)
 
     def add(self, filename, archive_name, provenance):
@@ -17156,6 +18122,14 @@ _show_paths_examples = """
 - `mx paths suite:DEPENDENCY` selects `DEPENDENCY` in suite `suite`"""
 
 
+def _show_paths_roots(args):
+    specs = [a for a in args if not a.startswith('-')]
+    if len(specs) != 1 or '<' in specs[0]:
+        # leave errors to the command and string substitutions to the loaded suites
+        return None
+    return [specs[0].split('/', 1)[0]]
+
+
 def show_paths(args):
     """usage: mx paths [-h] dependency-spec
 
@@ -17563,6 +18537,10 @@ def print_simple_help():
     print('\'mx help\' lists all commands. See \'mx help <command>\' to read about a specific command')
 
 
+def _classpath_cli_roots(args):
+    return [a for a in args if not a.startswith('-')]
+
+
 def classpath_cli(args):
     """prints the classpath for a dependency
 
@@ -17664,6 +18642,11 @@ update_commands("mx", {
     'version': [show_version, ''],
 })
 
+_dependency_closure_loading.update({
+    'classpath': _classpath_cli_roots,
+    'paths': _show_paths_roots,
+})
+
 from . import mx_fetchjdk # pylint: disable=unused-import
 from . import mx_bisect # pylint: disable=unused-import
 from . import mx_gc # pylint: disable=unused-import
@@ -17865,7 +18848,9 @@ def main():
 
             _setup_binary_suites()
             if should_discover_suites:
-                primary = _discover_suites(primarySuiteMxDir, load=should_load_suites)
+                _init_suite_snapshot(primarySuiteMxDir)
+                lazy_roots = _lazy_suite_roots(_argParser.initialCommandAndArgs) if should_load_suites else None
+                primary = _discover_suites(primarySuiteMxDir, load=should_load_suites, lazy_roots=lazy_roots)
             else:
                 primary = SourceSuite(primarySuiteMxDir, load=False, primary=True)
             _primary_suite_init(primary)
@@ -17887,8 +18872,11 @@ def main():
     #     MXTestsSuite()
 
     if primarySuiteMxDir and not _mx_suite.primary and should_load_suites:
-        primary_suite().recursive_post_init()
-        _check_dependency_cycles()
+        if _lazy_suites:
+            _post_init_suites(list(_suites.values()))
+        else:
+            primary_suite().recursive_post_init()
+        _check_suite_graph()
 
     if getattr(_opts, 'check_command_availability', None):
         resolved_name, hits = _resolve_command_name(_opts.check_command_availability)
@@ -17958,6 +18946,7 @@ def main():
         for s_ in suites(includeBinary=False, include_mx=True):
             for d in s_.dists:
                 d.post_init()
+        _dependency_graph_index.freeze()
 
     def term_handler(signum, frame):
         abort(1, killsig=signal.SIGTERM)
@@ -0,0 +1,132 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+"""A persistent index of the digests of downloaded artifacts."""
+
+from __future__ import annotations
+
+__all__ = ["DigestIndex"]
+
+import json
+import os
+import threading
+from os.path import abspath, dirname, exists
+from typing import Any, Dict, List, Optional
+
+from .mx_util import SafeFileCreation
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class DigestIndex:
+    """
+    Records the digests of files so that verifying an artifact against its expected digest
+    costs one stat call instead of reading a ``<path>.<algorithm>`` digest file next to it.
+
+    An entry is keyed by the absolute path of a file and is used while the file (or the target
+    of a symlink) has the same size, mtime and inode as when the digest was recorded. Artifacts
+    are always created by renaming a complete temporary file, which gives them a new inode.
+
+    The index is read once when it is created. Recorded digests are written by `save`, which
+    merges them with the entries saved concurrently by other processes while holding an
+    exclusive lock on ``<path>.lock``.
+    """
+
+    version = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Any]] = self._read()
+        self._updates: Dict[str, List[Any]] = {}
+
+    def _read(self) -> Dict[str, List[Any]]:
+        if not exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as fp:
+                data = json.load(fp)
+            if data.get('version') != self.version or not isinstance(data.get('entries'), dict):
+                return {}
+            return data['entries']
+        except (OSError, ValueError):
+            # A corrupt index is equivalent to no index
+            return {}
+
+    @staticmethod
+    def _state(path: str) -> Optional[List[int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+    def get(self, path: str, digestName: str) -> Optional[str]:
+        """Gets the `digestName` digest recorded for `path` or None if there is none or `path` changed since."""
+        entry = self._entries.get(abspath(path))
+        if entry is None or entry[:3] != self._state(path):
+            return None
+        return entry[3].get(digestName)
+
+    def put(self, path: str, digestName: str, value: str) -> None:
+        """Records `value` as the `digestName` digest of the current content of `path`."""
+        state = self._state(path)
+        if state is None:
+            return
+        key = abspath(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            digests = dict(entry[3]) if entry is not None and entry[:3] == state else {}
+            if digests.get(digestName) == value:
+                return
+            digests[digestName] = value
+            self._entries[key] = self._updates[key] = state + [digests]
+
+    def save(self) -> None:
+        """Writes the digests recorded since the last call, dropping entries of files that no longer exist."""
+        with self._lock:
+            updates, self._updates = self._updates, {}
+        if not updates:
+            return
+        try:
+            os.makedirs(dirname(self.path), exist_ok=True)
+            with open(self.path + '.lock', 'ab') as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                entries = self._read()
+                entries.update(updates)
+                entries = {p: e for p, e in entries.items() if exists(p)}
+                with SafeFileCreation(self.path) as sfc:
+                    with open(sfc.tmpPath, 'w', encoding='utf-8') as fp:
+                        json.dump({'version': self.version, 'entries': entries}, fp)
+        except OSError:
+            # The index is only an optimization
+            pass
@@ -0,0 +1,467 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+"""
+An HTTP download engine that reuses connections, resumes interrupted downloads
+and fetches large files in parallel segments.
+"""
+
+from __future__ import annotations
+
+__all__ = ["DownloadError", "DownloadProgress", "Downloader"]
+
+import hashlib
+import http.client
+import json
+import os
+import re
+import socket
+import ssl
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class DownloadError(OSError):
+    """
+    Raised when a download fails. If `retry` is True, the download may succeed if
+    retried and will resume from the content received so far if possible.
+    """
+
+    def __init__(self, message: str, retry: bool = False):
+        super().__init__(message)
+        self.retry = retry
+
+
+class DownloadProgress:
+    """
+    Aggregates the progress of concurrent downloads. The `report` function is called with
+    the number of bytes read by all downloads in progress, their total length (-1 if the
+    length of any of them is unknown) and the number of downloads still in progress.
+    """
+
+    def __init__(self, report: Callable[[int, int, int], None], interval: float = 0.1):
+        self._report = report
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._downloads: Dict[int, List[int]] = {}
+        self._nextToken = 0
+        self._lastReport = 0.0
+
+    def begin(self, length: int, bytesRead: int = 0) -> int:
+        with self._lock:
+            token = self._nextToken
+            self._nextToken += 1
+            self._downloads[token] = [bytesRead, length]
+            return token
+
+    def update(self, token: int, n: int) -> None:
+        with self._lock:
+            self._downloads[token][0] += n
+            now = time.monotonic()
+            if now - self._lastReport >= self._interval:
+                self._lastReport = now
+                self._report(*self._totals(), len(self._downloads))
+
+    def end(self, token: int) -> None:
+        with self._lock:
+            totals = self._totals()
+            del self._downloads[token]
+            self._report(*totals, len(self._downloads))
+
+    def _totals(self) -> Tuple[int, int]:
+        bytesRead = sum(d[0] for d in self._downloads.values())
+        lengths = [d[1] for d in self._downloads.values()]
+        return bytesRead, -1 if -1 in lengths else sum(lengths)
+
+
+_redirect_status = (301, 302, 303, 307, 308)
+_retry_status = (500, 502, 503, 504)
+_content_range = re.compile(r'bytes (\d+)-(\d+)/(\d+|\*)')
+
+
+class _Response:
+    """An HTTP response that returns its connection to the pool once its body has been read."""
+
+    def __init__(self, url: str, response: Any, pool: Optional[_ConnectionPool] = None, key: Optional[Tuple[str, str]] = None, conn: Optional[http.client.HTTPConnection] = None):
+        self.url = url
+        self._response = response
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self.status = response.status if conn is not None else (response.code if isinstance(response, urllib.error.HTTPError) else response.status)
+        self.reason = getattr(response, 'reason', '')
+
+    def getheader(self, name: str) -> Optional[str]:
+        return self._response.headers.get(name)
+
+    def read(self, n: int) -> bytes:
+        return self._response.read(n)
+
+    def close(self) -> None:
+        if self._conn is None:
+            self._response.close()
+        elif self._response.isclosed() and not self._response.will_close:
+            self._pool.release(self._key, self._conn)
+        else:
+            self._conn.close()
+        self._conn = None
+
+    def discard(self) -> None:
+        """Reads and drops a short body (e.g. of a redirect) so that the connection can be reused."""
+        length = self.getheader('Content-Length')
+        if length is not None and length.isdigit() and int(length) <= 64 * 1024:
+            self.read(int(length))
+        self.close()
+
+
+class _ConnectionPool:
+    """Keeps idle HTTP/1.1 connections open for reuse, per scheme and host."""
+
+    def __init__(self, timeout: float, maxIdle: int):
+        self.timeout = timeout
+        self.maxIdle = maxIdle
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._sslContext: Optional[ssl.SSLContext] = None
+
+    def acquire(self, key: Tuple[str, str]) -> Tuple[http.client.HTTPConnection, bool]:
+        """Gets a connection for `key` and whether it was used before."""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+            if key[0] == 'https' and self._sslContext is None:
+                self._sslContext = ssl.create_default_context()
+        scheme, netloc = key
+        parts = urllib.parse.urlsplit(f'{scheme}://{netloc}')
+        if scheme == 'https':
+            return http.client.HTTPSConnection(parts.hostname, parts.port, timeout=self.timeout, context=self._sslContext), False
+        return http.client.HTTPConnection(parts.hostname, parts.port, timeout=self.timeout), False
+
+    def release(self, key: Tuple[str, str], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.maxIdle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+class Downloader:
+    """
+    Downloads files over HTTP(S), reusing connections to the same host across downloads.
+
+    A download into a `partial` file is resumed with a range request from where a previous
+    attempt stopped, provided the server identified the content by an ETag or Last-Modified
+    header. Files of at least `segmentThreshold` bytes from servers that accept range requests
+    are fetched in `segments` parallel parts. At most `workers` downloads run at the same time.
+
+    URLs with schemes other than http and https as well as URLs that have to go through a
+    proxy are opened with `opener` (`urllib.request.urlopen` by default) instead.
+    """
+
+    chunkSize = 1024 * 1024
+    maxRedirects = 10
+
+    def __init__(self, workers: int = 4, segments: int = 4, segmentThreshold: int = 32 * 1024 * 1024, timeout: float = 10,
+                 opener: Optional[Callable[..., Any]] = None):
+        self.workers = max(1, workers)
+        self.segments = max(1, segments)
+        self.segmentThreshold = segmentThreshold
+        self.timeout = timeout
+        self.opener = opener or urllib.request.urlopen
+        self.userAgent = f'Python-urllib/{sys.version_info.major}.{sys.version_info.minor}'
+        self._pool = _ConnectionPool(timeout, maxIdle=self.workers)
+        self._slots = threading.BoundedSemaphore(self.workers)
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def map(self, function: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """Applies `function` to each of `items` on a pool of `workers` threads."""
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(function, items))
+
+    def fetch(self, url: str, path: str, partial: Optional[str] = None, progress: Optional[DownloadProgress] = None,
+              digestName: Optional[str] = None) -> Optional[str]:
+        """
+        Downloads the content of `url` to `path`.
+
+        :param partial: the file in which the content is accumulated before it is moved to `path`.
+               It is kept if the download fails so that the next attempt can resume it.
+        :param digestName: the name of a hash algorithm with which to hash the content while it
+               is being downloaded
+        :return: the hex digest of the content if `digestName` is not None and the content was
+                 received in order, None otherwise
+        :raises DownloadError: if the download failed
+        """
+        with self._slots:
+            try:
+                if partial is None or fcntl is None:
+                    return self._download(url, path, None, progress, digestName)
+                with open(partial, 'ab') as fp:
+                    try:
+                        fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        # The partial file may have been completed and renamed by its previous owner
+                        locked = os.path.exists(partial) and os.path.samestat(os.fstat(fp.fileno()), os.stat(partial))
+                    except OSError:
+                        locked = False
+                    if not locked:
+                        # Another downloader is using the partial file
+                        return self._download(url, path, None, progress, digestName)
+                    try:
+                        digest = self._download(url, partial, partial + '.json', progress, digestName)
+                    except BaseException:
+                        if os.path.getsize(partial) == 0:
+                            _remove(partial)
+                            _remove(partial + '.json')
+                        raise
+                    os.replace(partial, path)
+                    _remove(partial + '.json')
+                    return digest
+            except (http.client.HTTPException, socket.timeout, ConnectionError) as e:
+                raise DownloadError(f'Download of {url} interrupted: {e!r}', retry=True) from e
+
+    def _download(self, url: str, target: str, metaPath: Optional[str], progress: Optional[DownloadProgress], digestName: Optional[str]) -> Optional[str]:
+        offset = os.path.getsize(target) if os.path.exists(target) else 0
+        meta = _read_meta(metaPath) if offset else None
+        headers = {}
+        if meta is not None and meta.get('url') == url and meta.get('validator'):
+            headers['Range'] = f'bytes={offset}-'
+            headers['If-Range'] = meta['validator']
+        else:
+            offset = 0
+
+        response = self._request(url, headers)
+        try:
+            if response.status == 206 and offset:
+                m = _content_range.match(response.getheader('Content-Range') or '')
+                if not m or int(m.group(1)) != offset:
+                    _truncate(target, metaPath)
+                    raise DownloadError(f'Unexpected content range from {url}: {response.getheader("Content-Range")}', retry=True)
+            elif response.status == 200:
+                offset = 0
+            elif response.status == 416 and offset:
+                _truncate(target, metaPath)
+                raise DownloadError(f'Cannot resume download of {url}', retry=True)
+            else:
+                raise DownloadError(f'HTTP Error {response.status}: {response.reason}', retry=response.status in _retry_status)
+
+            lengthHeader = response.getheader('Content-Length')
+            length = offset + int(lengthHeader.strip()) if lengthHeader else -1
+            validator = _validator(response)
+            if metaPath is not None:
+                if validator:
+                    _write_meta(metaPath, {'url': url, 'validator': validator})
+                else:
+                    _remove(metaPath)
+
+            token = progress.begin(length, offset) if progress else None
+            try:
+                if offset == 0 and self.segments > 1 and length >= self.segmentThreshold and validator and response.getheader('Accept-Ranges') == 'bytes':
+                    try:
+                        self._fetch_segments(response, target, length, validator, progress, token)
+                    except BaseException:
+                        # Segments may have been written out of order
+                        _truncate(target, metaPath)
+                        raise
+                    return None
+                hasher = hashlib.new(digestName) if digestName else None
+                if hasher and offset:
+                    _hash_file(hasher, target, offset)
+                with open(target, 'ab' if offset else 'wb') as fp:
+                    bytesRead = offset + self._copy(response, fp, length - offset if length != -1 else -1, progress, token, hasher)
+            finally:
+                if progress:
+                    progress.end(token)
+            if length not in (-1, bytesRead):
+                raise DownloadError(f'Download of {url} truncated: read {bytesRead} of {length} bytes.', retry=True)
+            return hasher.hexdigest() if hasher else None
+        finally:
+            response.close()
+
+    def _copy(self, response: _Response, fp: Any, length: int, progress: Optional[DownloadProgress], token: Optional[int], hasher: Any = None) -> int:
+        """Copies `length` bytes (or everything if -1) from `response` to `fp`, adding them to `hasher` if it is not None."""
+        bytesRead = 0
+        while length == -1 or bytesRead < length:
+            chunk = response.read(self.chunkSize if length == -1 else min(self.chunkSize, length - bytesRead))
+            if not chunk:
+                break
+            fp.write(chunk)
+            if hasher:
+                hasher.update(chunk)
+            bytesRead += len(chunk)
+            if progress:
+                progress.update(token, len(chunk))
+        return bytesRead
+
+    def _fetch_segments(self, response: _Response, target: str, length: int, validator: str, progress: Optional[DownloadProgress], token: Optional[int]) -> None:
+        url = response.url
+        segmentSize = -(-length // self.segments)
+        with open(target, 'wb') as fp:
+            fp.truncate(length)
+        errors = []
+
+        def _segment(start: int, end: int, first: Optional[_Response]) -> None:
+            try:
+                segment = first or self._request(url, {'Range': f'bytes={start}-{end - 1}', 'If-Range': validator})
+                try:
+                    if first is None:
+                        m = _content_range.match(segment.getheader('Content-Range') or '') if segment.status == 206 else None
+                        if not m or int(m.group(1)) != start:
+                            raise DownloadError(f'Range request for {url} failed: HTTP {segment.status}', retry=True)
+                    with open(target, 'r+b') as out:
+                        out.seek(start)
+                        if self._copy(segment, out, end - start, progress, token) != end - start:
+                            raise DownloadError(f'Download of {url} truncated in bytes {start}-{end - 1}', retry=True)
+                finally:
+                    if first is None:
+                        segment.close()
+            except BaseException as e:  # pylint: disable=broad-except
+                errors.append(e)
+
+        threads = [threading.Thread(target=_segment, args=(start, min(start + segmentSize, length), None), daemon=True)
+                   for start in range(segmentSize, length, segmentSize)]
+        for t in threads:
+            t.start()
+        # The first segment is read from the response that is already open
+        _segment(0, min(segmentSize, length), response)
+        for t in threads:
+            t.join()
+        if errors:
+            raise errors[0]
+
+    def _request(self, url: str, headers: Dict[str, str]) -> _Response:
+        """Sends a GET request for `url`, following redirects."""
+        for _ in range(self.maxRedirects + 1):
+            parts = urllib.parse.urlsplit(url)
+            if parts.scheme not in ('http', 'https') or _is_proxied(parts):
+                return self._urllib_request(url, headers)
+            response = self._send(url, parts, headers)
+            location = response.getheader('Location')
+            if response.status not in _redirect_status or not location:
+                return response
+            response.discard()
+            url = urllib.parse.urljoin(url, location)
+        raise DownloadError(f'Too many redirects downloading {url}')
+
+    def _send(self, url: str, parts: urllib.parse.SplitResult, headers: Dict[str, str]) -> _Response:
+        key = (parts.scheme, parts.netloc)
+        target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        headers = dict(headers, **{'User-Agent': self.userAgent, 'Accept-Encoding': 'identity'})
+        while True:
+            conn, reused = self._pool.acquire(key)
+            try:
+                conn.request('GET', target, headers=headers)
+                return _Response(url, conn.getresponse(), self._pool, key, conn)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if not reused:
+                    raise
+                # The server closed the idle connection, try again with a new one
+            except BaseException:
+                conn.close()
+                raise
+
+    def _urllib_request(self, url: str, headers: Dict[str, str]) -> _Response:
+        try:
+            return _Response(url, self.opener(urllib.request.Request(url, headers=headers), timeout=self.timeout))
+        except urllib.error.HTTPError as e:
+            return _Response(url, e)
+
+
+def _is_proxied(parts: urllib.parse.SplitResult) -> bool:
+    return parts.scheme in urllib.request.getproxies() and not urllib.request.proxy_bypass(parts.hostname or '')
+
+
+def _validator(response: _Response) -> Optional[str]:
+    """Gets the value identifying the content of `response` that can be used in an If-Range header."""
+    etag = response.getheader('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return response.getheader('Last-Modified')
+
+
+def _hash_file(hasher: Any, path: str, length: int) -> None:
+    """Adds the first `length` bytes of `path` to `hasher`."""
+    buf = bytearray(Downloader.chunkSize)
+    view = memoryview(buf)
+    with open(path, 'rb') as fp:
+        while length > 0:
+            n = fp.readinto(view[:min(len(buf), length)])
+            if not n:
+                break
+            hasher.update(view[:n])
+            length -= n
+
+
+def _read_meta(path: Optional[str]) -> Optional[Dict[str, Any]]:
+    if path is None:
+        return None
+    try:
+        with open(path, encoding='utf-8') as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(path: str, meta: Dict[str, Any]) -> None:
+    with open(path, 'w', encoding='utf-8') as fp:
+        json.dump(meta, fp)
+
+
+def _truncate(target: str, metaPath: Optional[str]) -> None:
+    with open(target, 'wb'):
+        pass
+    if metaPath is not None:
+        _remove(metaPath)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
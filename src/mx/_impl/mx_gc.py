@@ -30,6 +30,7 @@ import os
 import re
 
 from . import mx, mx_fetchjdk
+from .build.cache import BuildCache, parse_size
 from datetime import datetime, date, timedelta
 
 
@@ -272,10 +273,30 @@ def gc_cache(args):
         description='''Garbage collect entries in the mx download cache.
         By default, it collects cache entries not referenced by the current configuration (see `--keep-current`).
         The cache directory defaults to ~/.mx/cache and can be overridden with MX_CACHE_DIR.
+        Entries of the build cache (see `mx build --build-cache`) are collected individually.
         ''')
+    parser.add_argument('--build-cache-size', type=parse_size, metavar='SIZE',
+                        help='only collect the least recently used build cache entries that need to be removed for the build cache '
+                             'to be at most SIZE bytes (a k, m or g suffix is allowed)')
     _gc_collect_generic(args, parser, _gc_cache_entries)
 
 
+def _gc_build_cache_entries(parsed_args):
+    """Returns a list of entries in the build cache, least recently used first."""
+    entries = BuildCache.default().entries()
+    max_size = getattr(parsed_args, 'build_cache_size', None)
+    if max_size is not None:
+        excess = sum(e.size for e in entries) - max_size
+        lru = []
+        for e in entries:
+            if excess <= 0:
+                break
+            lru.append(e)
+            excess -= e.size
+        entries = lru
+    return [CollectionCandidate(e.path, datetime.fromtimestamp(e.lastUse), e.size) for e in entries]
+
+
 def _gc_cache_entry_name(path, cache_dir):
     if not path:
         return None
@@ -342,11 +363,13 @@ def _gc_cache_entries(parsed_args):
     if not os.path.isdir(cache_dir):
         return []
 
+    result = _gc_build_cache_entries(parsed_args)
+    if getattr(parsed_args, 'build_cache_size', None) is not None:
+        return result
     current_entries = _gc_current_cache_entries(cache_dir) if parsed_args.keep_current else set()
-    result = []
     for entry in os.listdir(cache_dir):
         try:
-            if entry in current_entries:
+            if entry in current_entries or entry == BuildCache.dirName:
                 continue
             full_path = os.path.join(cache_dir, entry)
             if os.path.islink(full_path):
@@ -31,8 +31,11 @@ __all__ = [
     "JARDistribution",
 ]
 
+import io
+import json
 import os
 import shutil
+import threading
 import zipfile
 import time
 import re
@@ -40,11 +43,16 @@ import pickle
 
 from os.path import join, exists, basename, dirname, isdir, islink
 from argparse import ArgumentTypeError
+from concurrent.futures import Future
+from functools import partial
 from stat import S_IMODE
 
 from . import mx, mx_util, mx_javamodules
 from . import mx_subst
 from .support import path
+from .build.compress import deflate_entry, ordered_map
+from .build.fileindex import is_racy
+from .build.rawzip import RawZipReader, write_raw_entry
 
 
 class JARDistribution(mx.Distribution, mx.ClasspathDependency):
@@ -219,6 +227,10 @@ class JARDistribution(mx.Distribution, mx.ClasspathDependency):
             self.sourcesPath,
             self.original_path() + _staging_dir_suffix,
             self.sourcesPath + _staging_dir_suffix,
+            self.original_path() + _previous_archive_suffix,
+            self.sourcesPath + _previous_archive_suffix,
+            self.original_path() + _entry_states_suffix,
+            self.sourcesPath + _entry_states_suffix,
             self._stripped_path(),
             self.strip_mapping_file(),
             self._config_save_file(),
@@ -250,6 +262,8 @@ class JARDistribution(mx.Distribution, mx.ClasspathDependency):
 
             __process__(arcname, contents_supplier, is_source)
                 Notifies of an entry destined for the binary (`is_source` is False) or source archive (`is_source` is True).
+                Calling `contents_supplier` returns the contents of the entry as a byte array. To avoid holding
+                large entries in memory, ``contents_supplier.open()`` returns a binary stream of the contents instead.
                 Returns True if this object consumes the contents supplied by `contents_supplier`,
                 False if the caller should add the contents to the relevant archive.
 
@@ -268,7 +282,8 @@ class JARDistribution(mx.Distribution, mx.ClasspathDependency):
             __closing__()
                 Called just before the `services` are written to the binary archive and both archives are finalized.
                 If the archive participant wants to add extra entries to the archive, it returns a 2-tuple
-                with each value being a dict of (arcname, contents) describing the extra entries.
+                with each value being a dict of (arcname, contents) describing the extra entries. The contents
+                of an entry are a str, a byte array, a binary stream or a callable returning one of these.
         """
         ap_type = archiveparticipant.__class__.__name__
         if ap_type == 'FastRArchiveParticipant':
@@ -370,6 +385,11 @@ class JARDistribution(mx.Distribution, mx.ClasspathDependency):
                 if jmd:
                     setattr(self, '.javaModule', jmd)
 
+            # Only record the entry states once make_java_module has completed the jar
+            bin_archive.save_states()
+            if src_archive is not bin_archive:
+                src_archive.save_states()
+
             if self.is_stripped():
                 self.strip_jar()
         finally:
@@ -759,8 +779,9 @@ class _StagingGuard:
 
     def __exit__(self, exc_type, exc_value, traceback):
         if self._can_write:
-            if exists(self.entry.staged):
-                self.entries[self.entry.name] = self.entry
+            entry = self.entry
+            if entry.raw or entry.staged in entry.archive.pending or exists(entry.staged):
+                self.entries[entry.name] = entry
 
 class _ArchiveStager(object):
     """
@@ -790,6 +811,16 @@ class _ArchiveStager(object):
 
         # Map from overlays to the projects that define them
         self.overlays = {}
+
+        # Entries of jars can be copied from the jar to the archive unless the archive is
+        # exploded or the distribution is a module, whose classes must be staged to compile
+        # its module-info.class
+        self.raw_jar_entries = not exploded and not mx_javamodules.get_module_name(self.dist)
+
+        # Map from the paths of the directories of constituents to the (future) result of walking them
+        self.listings = {}
+        # Map from jar paths to (a future for) an open ZipFile for the jar and a lock guarding reads from it
+        self.jars = {}
         self.stage_archive()
 
     def stage_archive(self):
@@ -832,11 +863,31 @@ class _ArchiveStager(object):
                 if 'organization' in developer:
                     self.manifest.setdefault(f'{group}-Vendor', developer['organization'])
 
-        for dep in head + tail:
-            self.stage_dep(dep)
-
-        for a in dist.archiveparticipants:
-            self.close_archiveparticipant(a)
+        # Constituents are listed in parallel and then added to the archives in order so that conflicts
+        # between entries are resolved as if they were staged sequentially. The files of the resulting
+        # entries are then created in parallel.
+        executor = mx._archive_executor()
+        try:
+            self.list_deps(executor, head + tail)
+            for dep in head + tail:
+                self.stage_dep(dep)
+            self.bin_archive.stage_pending(executor)
+            self.src_archive.stage_pending(executor)
+
+            for a in dist.archiveparticipants:
+                self.close_archiveparticipant(a)
+        finally:
+            # Content suppliers of jar entries can be used until the archive participants are closed
+            for jar in self.jars.values():
+                if isinstance(jar, Future):
+                    if jar.cancel() or jar.exception():
+                        continue
+                    jar = jar.result()
+                jar[0].close()
+            self.jars.clear()
+            for listing in self.listings.values():
+                listing.cancel()
+            self.listings.clear()
 
         _accumulate_services(self.services)
 
@@ -852,6 +903,68 @@ class _ArchiveStager(object):
         if self.bin_archive is not self.src_archive:
             self.src_archive.finalize_archive_or_directory(None)
 
+    def list_deps(self, executor, deps):
+        """
+        Starts listing the class and source directories of the Java projects in `deps`
+        as well as the jars of the libraries and JAR distributions in `deps` on `executor`.
+        """
+        if executor is None:
+            return
+
+        def open_jar(jar_path):
+            return zipfile.ZipFile(jar_path, 'r'), threading.Lock()
+
+        for dep in deps:
+            if hasattr(dep, "doNotArchive") and dep.doNotArchive:
+                continue
+            if dep.isJavaProject():
+                dirs = [dep.output_dir()] + dep.source_dirs()
+                if dep.source_gen_dir():
+                    dirs.append(dep.source_gen_dir())
+                for d in dirs:
+                    if d not in self.listings:
+                        self.listings[d] = executor.submit(lambda d=d: list(os.walk(d)))
+            elif dep.isLibrary() or dep.isJARDistribution():
+                if dep.isLibrary():
+                    # Do not download missing libraries on another thread
+                    jar_paths = (dep.get_path(resolve=False), dep.get_source_path(resolve=False))
+                else:
+                    jar_paths = (dep.path, dep.sourcesPath)
+                for jar_path in jar_paths:
+                    if jar_path and jar_path not in self.jars and os.path.isfile(jar_path):
+                        self.jars[jar_path] = executor.submit(open_jar, jar_path)
+
+    def walk(self, dirpath):
+        """
+        Gets the result of ``os.walk(dirpath)`` as a list, using the listing started by `list_deps` if available.
+        """
+        listing = self.listings.get(dirpath)
+        if listing is None:
+            return list(os.walk(dirpath))
+        return listing.result()
+
+    def open_jar(self, jar_path):
+        """
+        Gets an open ZipFile for `jar_path` and a lock that must be held while reading from it
+        on a thread other than the one staging the archive. The jar is closed once the archive
+        participants have been closed.
+        """
+        jar = self.jars.get(jar_path)
+        if isinstance(jar, Future):
+            try:
+                jar = jar.result()
+            except BaseException:
+                del self.jars[jar_path]
+                raise
+            if not os.path.samestat(os.fstat(jar[0].fp.fileno()), os.stat(jar_path)):
+                # The jar was replaced after it was opened
+                jar[0].close()
+                jar = None
+            self.jars[jar_path] = jar
+        if jar is None:
+            jar = self.jars[jar_path] = (zipfile.ZipFile(jar_path, 'r'), threading.Lock())
+        return jar
+
     def close_archiveparticipant(self, a):
         """
         Closes the archive participant `a` just prior to finalizing the archive (see `_Archive.finalize_archive_or_directory`).
@@ -896,7 +1009,11 @@ class _ArchiveStager(object):
             contents = contents()
         with open(staged, 'w' if isinstance(contents, str) else 'wb') as fp:
             assert arcname not in archive.entries, (arcname, archive.path)
-            fp.write(contents)
+            if hasattr(contents, 'read'):
+                with contents:
+                    shutil.copyfileobj(contents, fp, _copy_block_size)
+            else:
+                fp.write(contents)
         archive.entries[arcname] = entry
 
     def add_jar(self, dep, jar_path, is_sources_jar=False):
@@ -910,34 +1027,40 @@ class _ArchiveStager(object):
         """
         jar_timestamp = mx.TimeStampFile(jar_path)
         archive = self.src_archive if is_sources_jar else self.bin_archive
-        with zipfile.ZipFile(jar_path, 'r') as zf:
-            for arcname in zf.namelist():
-                if arcname.endswith('/'):
-                    if not self.exploded:
-                        # Use a self reference for a directory that needs an explicit entry in the archive
-                        archive.entries[arcname] = arcname
-                    continue
-                if not is_sources_jar and arcname == 'module-info.class':
-                    mx.logv(jar_path + ' contains ' + arcname + '. It will not be included in ' + self.bin_archive.path)
-                    continue
-                service = arcname[len('META-INF/services/'):]
-                if not is_sources_jar and arcname.startswith('META-INF/services/') and not arcname == 'META-INF/services/' and '/' not in service:
-                    # Note: do not treat subdirectories of META-INF/services in any special way and just copy them to
-                    # the result as if they were just regular resource files. They are not part of the specification,
-                    # but some libraries are known to use them for internal purposes.
-                    # (e.g., the org.jline.terminal.spi.TerminalProvider class in JLine3).
-                    self.services.setdefault(service, []).extend(zf.read(arcname).decode().splitlines())
-                else:
-                    entry = _ArchiveEntry(dep, arcname, archive, jar_path + '!' + arcname)
-                    with _StagingGuard(entry) as guard:
-                        if guard:
-                            staged = entry.staged
-                            if not exists(staged) or jar_timestamp.isNewerThan(staged):
-                                zf.extract(arcname, entry.archive.staging_dir)
-                            contents = _FileContentsSupplier(staged)
-                            if not _process_archiveparticipants(self.dist, entry.archive, arcname, contents.get, staged, is_source=is_sources_jar):
-                                if self.versioned_meta_inf_re.match(arcname):
-                                    mx.warn(f"META-INF resources can not be versioned ({arcname} from {jar_path}). The resulting JAR will be invalid.")
+        zf, lock = self.open_jar(jar_path)
+        for info in zf.infolist():
+            arcname = info.filename
+            if arcname.endswith('/'):
+                if not self.exploded:
+                    # Use a self reference for a directory that needs an explicit entry in the archive
+                    archive.entries[arcname] = arcname
+                continue
+            if not is_sources_jar and arcname == 'module-info.class':
+                mx.logv(jar_path + ' contains ' + arcname + '. It will not be included in ' + self.bin_archive.path)
+                continue
+            service = arcname[len('META-INF/services/'):]
+            if not is_sources_jar and arcname.startswith('META-INF/services/') and not arcname == 'META-INF/services/' and '/' not in service:
+                # Note: do not treat subdirectories of META-INF/services in any special way and just copy them to
+                # the result as if they were just regular resource files. They are not part of the specification,
+                # but some libraries are known to use them for internal purposes.
+                # (e.g., the org.jline.terminal.spi.TerminalProvider class in JLine3).
+                self.services.setdefault(service, []).extend(zf.read(arcname).decode().splitlines())
+            else:
+                entry = _ArchiveEntry(dep, arcname, archive, jar_path + '!' + arcname)
+                with _StagingGuard(entry) as guard:
+                    if guard:
+                        staged = entry.staged
+                        # Unless it needs to be staged, an entry is only read if an archive participant asks for it
+                        raw = self.raw_jar_entries and info.compress_type == archive.compression
+                        contents = _JarEntryContentsSupplier(zf, info)
+                        if not _process_archiveparticipants(self.dist, entry.archive, arcname, contents, staged, is_source=is_sources_jar):
+                            entry.raw = raw
+                            if raw:
+                                archive.pending.pop(staged, None)
+                            else:
+                                archive.pending[staged] = partial(_extract_jar_entry, zf, lock, info, staged, jar_timestamp)
+                            if self.versioned_meta_inf_re.match(arcname):
+                                mx.warn(f"META-INF resources can not be versioned ({arcname} from {jar_path}). The resulting JAR will be invalid.")
 
     def add_file(self, dep, filepath, relpath, archivePrefix, arcnameCheck=None, includeServices=False):
         """
@@ -970,8 +1093,8 @@ class _ArchiveStager(object):
             with _StagingGuard(entry) as guard:
                 if guard:
                     staged = entry.staged
-                    if not _process_archiveparticipants(self.dist, self.bin_archive, arcname, contents.get, staged):
-                        self.stage_file(filepath, staged)
+                    if not _process_archiveparticipants(self.dist, self.bin_archive, arcname, contents, staged):
+                        self.stage_file(self.bin_archive, filepath, staged)
                         if self.versioned_meta_inf_re.match(arcname):
                             mx.warn(f"META-INF resources can not be versioned ({filepath}). The resulting JAR will be invalid.")
 
@@ -981,7 +1104,7 @@ class _ArchiveStager(object):
 
         :param Dependency dep: the Dependency owning the Java sources
         """
-        for root, _, files in os.walk(srcDir):
+        for root, _, files in self.walk(srcDir):
             relpath = root[len(srcDir) + 1:]
             for f in files:
                 if f.endswith('.java'):
@@ -992,11 +1115,14 @@ class _ArchiveStager(object):
                         with _StagingGuard(entry) as guard:
                             staged = entry.staged
                             if guard:
-                                if not _process_archiveparticipants(self.dist, self.src_archive, arcname, contents.get, staged, is_source=True):
-                                    self.stage_file(contents.path, staged)
+                                if not _process_archiveparticipants(self.dist, self.src_archive, arcname, contents, staged, is_source=True):
+                                    self.stage_file(self.src_archive, contents.path, staged)
 
-    def stage_file(self, src, dst):
-        _stage_file_impl(src, dst)
+    def stage_file(self, archive, src, dst):
+        """
+        Schedules the staging of `src` at `dst` by `archive.stage_pending`.
+        """
+        archive.pending[dst] = partial(_stage_file_impl, src, dst)
 
     def stage_dep(self, dep):
         """
@@ -1089,7 +1215,7 @@ class _ArchiveStager(object):
                     return arcname not in self.overlays
 
             def add_classes(archivePrefix, includeServices):
-                for root, _, files in os.walk(outputDir):
+                for root, _, files in self.walk(outputDir):
                     reldir = root[len(outputDir) + 1:]
                     for f in files:
                         if f.endswith(".bc"):
@@ -1142,11 +1268,14 @@ class _ArchiveStager(object):
             mx.abort(f'Dependency not supported: {dep.name} ({dep.__class__.__name__})')
 
 class _FileContentsSupplier(object):
-    def __init__(self, path, eager=False):
+    """
+    The `contents_supplier` passed to archive participants for a file. Calling it returns the
+    contents of the file as a byte array while `open` returns a binary stream of the contents
+    without reading them into memory.
+    """
+    def __init__(self, path):
         self.path = path
         self.contents = None
-        if eager:
-            self.get()
 
     def get(self):
         if self.contents is None:
@@ -1154,10 +1283,33 @@ class _FileContentsSupplier(object):
                 self.contents = fp.read()
         return self.contents
 
-    def restore(self):
-        assert self.contents is not None, ('must create with eager=True:', self.path)
-        with open(self.path, 'wb') as fp:
-            fp.write(self.contents)
+    __call__ = get
+
+    def open(self):
+        if self.contents is not None:
+            return io.BytesIO(self.contents)
+        return open(self.path, 'rb')
+
+class _JarEntryContentsSupplier(object):
+    """
+    The `contents_supplier` passed to archive participants for an entry of a jar.
+    """
+    def __init__(self, zf, info):
+        self.zf = zf
+        self.info = info
+        self.contents = None
+
+    def get(self):
+        if self.contents is None:
+            self.contents = self.zf.read(self.info)
+        return self.contents
+
+    __call__ = get
+
+    def open(self):
+        if self.contents is not None:
+            return io.BytesIO(self.contents)
+        return self.zf.open(self.info)
 
 def _accumulate_services(services):
     """
@@ -1198,6 +1350,75 @@ def _accumulate_services(services):
 # Suffix added to a distributions archive path to create the staging directory for the archive
 _staging_dir_suffix = '.files'
 
+# Suffix added to a distributions archive path for the archive of the previous build while the archive is rebuilt
+_previous_archive_suffix = '.previous'
+
+# Suffix added to a distributions archive path for the file recording the staged files the archive was created from
+_entry_states_suffix = '.entries'
+
+# Staged files larger than this are streamed into an archive instead of being compressed in memory
+_stream_threshold = 256 * 1024
+
+# Size of the blocks in which file contents are copied
+_copy_block_size = 1024 * 1024
+
+def _file_state(st):
+    return [st.st_mtime_ns, st.st_size, S_IMODE(st.st_mode)]
+
+class _PreviousArchive(object):
+    """
+    The archive from the previous build of a distribution together with the (mtime, size, mode)
+    of the staged file each of its entries was created from. An entry whose staged file is
+    unchanged is copied to the new archive without recompressing it.
+    """
+
+    version = 1
+
+    def __init__(self, archive, states):
+        self.reader = RawZipReader(archive.path + _previous_archive_suffix)
+        self.compression = archive.compression
+        self.states = states
+        self.reused = 0
+
+    @staticmethod
+    def open(archive):
+        """
+        Gets the previous archive for `archive` or None if there is none or its entries cannot be trusted.
+        """
+        previous = archive.path + _previous_archive_suffix
+        try:
+            with open(archive.path + _entry_states_suffix) as fp:
+                data = json.load(fp)
+            if data.get('version') != _PreviousArchive.version or data.get('archive') != _file_state(os.stat(previous))[:2]:
+                return None
+            return _PreviousArchive(archive, data['entries'])
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return None
+
+    def reusable(self, arcname, state):
+        """
+        Determines if the entry for `arcname` can be copied since its staged file still has `state`.
+        """
+        if self.states.get(arcname) != state:
+            return False
+        info = self.reader.getinfo(arcname)
+        return info is not None and info.compress_type == self.compression
+
+    def copy(self, arcname, zf):
+        """
+        Copies the entry for `arcname` to `zf`.
+        """
+        self.reader.copy_to(self.reader.getinfo(arcname), zf)
+        self.reused += 1
+
+    def close(self):
+        self.reader.close()
+
+    @staticmethod
+    def save_states(archive, states):
+        with mx_util.SafeFileCreation(archive.path + _entry_states_suffix) as sfc, open(sfc.tmpPath, 'w') as fp:
+            json.dump({'version': _PreviousArchive.version, 'archive': _file_state(os.stat(archive.path))[:2], 'entries': states}, fp)
+
 class _Archive(object):
     """
     The path to a distribution's archive and its staging directory as well as the metadata for
@@ -1209,7 +1430,17 @@ class _Archive(object):
         self.exploded = exploded
         self.staging_dir = path if exploded else mx_util.ensure_dir_exists(path + _staging_dir_suffix)
         self.entries = {} # Map from archive entry names to _ArchiveEntry objects
+        self.pending = {} # Map from staged paths to callables creating them
         self.compression = compression
+        self.states = None # Map from archive entry names to the states of the staged files they were created from
+
+    def stage_pending(self, executor):
+        """
+        Creates the staged files in `self.pending` on `executor`.
+        """
+        pending, self.pending = self.pending, {}
+        for _ in ordered_map(executor, lambda stage: stage(), pending.values()):
+            pass
 
     def clean(self):
         path = self.path
@@ -1234,8 +1465,8 @@ class _Archive(object):
             if exists(exploded_marker):
                 mx.rmtree(path)
             else:
-                # Remove jar file
-                os.remove(path)
+                # Keep the jar file so that unchanged entries can be copied from it
+                os.replace(path, path + _previous_archive_suffix)
 
     def finalize_archive_or_directory(self, manifest):
         """
@@ -1259,21 +1490,54 @@ class _Archive(object):
                 with open(os.path.join(metainf, 'MANIFEST.MF'), 'w') as f:
                     f.write(manifest_contents)
         else:
-            with zipfile.ZipFile(self.path, 'w', compression=self.compression) as zf:
-                if manifest_contents:
-                    zf.writestr("META-INF/MANIFEST.MF", manifest_contents)
-
-                # Add explicit archive entries for directories and
-                # remove them from self.entries in the process
-                new_entries = {}
-                for name, entry in self.entries.items():
-                    if name == entry:
-                        assert entry.endswith('/'), entry
-                        zf.writestr(entry, '')
-                    else:
-                        new_entries[name] = entry
-                self.entries = new_entries
+            previous = _PreviousArchive.open(self)
+            states = {}
+            try:
+                self._write_archive(manifest_contents, previous, states)
+            finally:
+                if previous:
+                    previous.close()
+                    mx.logv(f'Reused {previous.reused} of {len(states)} entries of {self.path}')
+                if exists(self.path + _previous_archive_suffix):
+                    os.remove(self.path + _previous_archive_suffix)
+            self.states = states
+
+    def save_states(self):
+        """
+        Records the states of the staged files the archive was created from so that the next build
+        can copy the entries of unchanged files. This must only be done once the archive is complete,
+        i.e. after `mx_javamodules.make_java_module` added the module descriptor to it.
+        """
+        if self.states is not None:
+            _PreviousArchive.save_states(self, self.states)
+
+    def _write_archive(self, manifest_contents, previous, states):
+        """
+        Writes the archive from the files in `self.staging_dir`, copying the entries whose staged
+        file did not change from `previous` and recording the state of each staged file in `states`.
+        The state of a staged file that is racy (see `is_racy`) is not recorded since a modification
+        that does not change its size could go unnoticed, so its entry is recompressed by the next build.
+        The other staged files are compressed on the threads of `mx._archive_executor()` and
+        written in the order of `os.walk` so that the archive does not depend on the number of threads.
+        Files larger than `_stream_threshold` are compressed while they are written to keep the memory
+        needed independent of the size of the staged files.
+        """
+        with zipfile.ZipFile(self.path, 'w', compression=self.compression) as zf:
+            if manifest_contents:
+                zf.writestr("META-INF/MANIFEST.MF", manifest_contents)
+
+            # Add explicit archive entries for directories and
+            # remove them from self.entries in the process
+            new_entries = {}
+            for name, entry in self.entries.items():
+                if name == entry:
+                    assert entry.endswith('/'), entry
+                    zf.writestr(entry, '')
+                else:
+                    new_entries[name] = entry
+            self.entries = new_entries
 
+            def staged_files():
                 for dirpath, _, filenames in os.walk(self.staging_dir):
                     for filename in filenames:
                         if filename == self.jdk_8268216:
@@ -1281,12 +1545,49 @@ class _Archive(object):
                             continue
                         filepath = join(dirpath, filename)
                         arcname = filepath[len(self.staging_dir) + 1:]
-                        with open(filepath, 'rb') as fp:
-                            contents = fp.read()
-                        info = zipfile.ZipInfo(arcname, time.localtime(os.path.getmtime(filepath))[:6])
-                        info.compress_type = self.compression
-                        info.external_attr = S_IMODE(os.stat(filepath).st_mode) << 16
-                        zf.writestr(info, contents)
+                        st = os.stat(filepath)
+                        state = _file_state(st)
+                        if not is_racy(st.st_mtime_ns, time.time_ns()):
+                            states[arcname] = state
+                        if previous and previous.reusable(arcname, state):
+                            yield arcname, filepath, None
+                        else:
+                            info = zipfile.ZipInfo(arcname, time.localtime(st.st_mtime)[:6])
+                            info.compress_type = self.compression
+                            info.external_attr = S_IMODE(st.st_mode) << 16
+                            # Allows ZipFile.open to decide whether the entry needs ZIP64 extensions
+                            info.file_size = st.st_size
+                            yield arcname, filepath, info
+
+            def compress(staged_file):
+                _, filepath, info = staged_file
+                if info is None or info.file_size > _stream_threshold:
+                    return staged_file, None
+                with open(filepath, 'rb') as fp:
+                    return staged_file, deflate_entry(info, fp.read())
+
+            for (arcname, filepath, info), data in ordered_map(mx._archive_executor(), compress, staged_files()):
+                if info is None:
+                    previous.copy(arcname, zf)
+                elif data is None:
+                    with open(filepath, 'rb') as src, zf.open(info, 'w') as dst:
+                        shutil.copyfileobj(src, dst, _copy_block_size)
+                else:
+                    write_raw_entry(zf, info, io.BytesIO(data), len(data))
+
+            # Copy the entries that were not extracted from their jars
+            readers = {}
+            try:
+                for entry in self.entries.values():
+                    if entry.raw:
+                        jar_path, arcname = entry.origin.split('!', 1)
+                        reader = readers.get(jar_path)
+                        if reader is None:
+                            reader = readers[jar_path] = RawZipReader(jar_path)
+                        reader.copy_to(reader.getinfo(arcname), zf)
+            finally:
+                for reader in readers.values():
+                    reader.close()
 
     # Name of non-symlink dummy file required workaround JDK-8267583 and JDK-8268216.
     jdk_8268216 = 'JDK_8268216'
@@ -1308,8 +1609,8 @@ class _Archive(object):
         staged_dir_files = {}
 
         for name, entry in self.entries.items():
-            if name == entry:
-                # Entry for a directory
+            if name == entry or entry.raw:
+                # Entry for a directory or an entry copied from a jar
                 continue
             staged_dir = dirname(entry.staged)
             staged_dir_files.setdefault(staged_dir, set()).add(basename(entry.staged))
@@ -1352,6 +1653,8 @@ class _ArchiveEntry(object):
         self.name = name
         self.archive = archive
         self.origin = origin
+        # True if the entry is copied from the jar denoted by `origin` instead of being staged
+        self.raw = False
         relpath = self.name if os.sep == '/' else self.name.replace('/', os.sep)
         # absolute path to the staged contents of this entry.
         self.staged = join(self.archive.staging_dir, relpath)
@@ -1469,7 +1772,8 @@ def _process_archiveparticipants(dist, archive, arcname, contents_supplier, stag
     responsibility for adding/omitting `contents` under the name `arcname` to/from the archive.
 
     :param str arcname: name in archive for `contents`
-    :param str contents_supplier: a callable that returns a byte array to write to the archive under `arcname`
+    :param contents_supplier: a callable that returns a byte array to write to the archive under `arcname`
+           and whose ``open`` method returns a binary stream of that byte array
     :param str staged: path to file in which contents are staged. This will be deleted if it exists and a participant claims responsibility
     :return: True if a participant claimed responsibility, False otherwise
 
@@ -1483,6 +1787,7 @@ def _process_archiveparticipants(dist, archive, arcname, contents_supplier, stag
             claimer = a
     if claimer is None:
         return False
+    archive.pending.pop(staged, None)
     if exists(staged):
         os.remove(staged)
     return True
@@ -1527,9 +1832,21 @@ def _source_pos(code):
     """
     return f'{code.co_filename}:{code.co_firstlineno}'
 
+def _extract_jar_entry(zf, lock, info, dst, jar_timestamp):
+    """
+    Extracts the entry for `info` from `zf` to `dst` unless `dst` is newer than the jar.
+    """
+    if exists(dst) and not islink(dst) and not jar_timestamp.isNewerThan(dst):
+        return
+    mx_util.ensure_dir_exists(dirname(dst))
+    if islink(dst):
+        os.remove(dst)
+    with lock, zf.open(info) as src, open(dst, 'wb') as fp:
+        shutil.copyfileobj(src, fp, _copy_block_size)
+
 def _stage_file_impl(src, dst):
     """
-    Copies or symlinks `src` to `dst`.
+    Symlinks `src` to `dst` or, if symlinks are not available, reflinks, hardlinks or copies it.
     """
     # GR-36461: If the directories are the same, then nothing should be done.
     if not exists(src):
@@ -1543,9 +1860,10 @@ def _stage_file_impl(src, dst):
         if exists(dst):
             mx.rmtree(dst)
         if isdir(src):
-            shutil.copytree(src, dst)
+            shutil.copytree(src, dst, copy_function=mx_util.materialize_file)
         else:
-            shutil.copy(src, dst)
+            strategy = mx_util.materialize_file(src, dst)
+            mx.logvv(f'Materialized {dst} from {src} ({strategy})')
     else:
         if exists(dst):
             if islink(dst):
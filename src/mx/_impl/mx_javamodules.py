@@ -54,6 +54,7 @@ from zipfile import ZipFile
 from . import mx, mx_util
 
 from .support import path
+from .build.rawzip import RawZipReader
 
 # Temporary imports and (re)definitions while porting mx from Python 2 to Python 3
 import itertools
@@ -574,7 +575,7 @@ def make_java_module(dist, jdk, archive, javac_daemon=None, alt_module_info_name
     if info is None:
         return None
 
-    from .mx_jardistribution import _FileContentsSupplier, _Archive, _staging_dir_suffix
+    from .mx_jardistribution import _Archive, _staging_dir_suffix
 
     times = []
     with mx.Timer('total', times):
@@ -984,6 +985,14 @@ def make_java_module(dist, jdk, archive, javac_daemon=None, alt_module_info_name
                                 os.mkdir(path)
                                 _Archive.create_jdk_8268216(path)
 
+                        def set_aside(dst, restore_files):
+                            """
+                            Moves `dst` out of the staging directory and returns a callable that moves it back.
+                            """
+                            aside = join(build_directory, f'{version}.restore.{len(restore_files)}')
+                            os.replace(dst, aside)
+                            return lambda: os.replace(aside, dst)
+
                         def sync_file(src, dst, restore_files):
                             """
                             Ensures that `dst` points at or contains the same contents as `src`.
@@ -997,8 +1006,7 @@ def make_java_module(dist, jdk, archive, javac_daemon=None, alt_module_info_name
                             if not mx.can_symlink():
                                 mx_util.ensure_dir_exists(dirname(dst))
                                 if exists(dst):
-                                    restore_files[dst] = _FileContentsSupplier(dst, eager=True).restore
-                                    os.remove(dst)
+                                    restore_files[dst] = set_aside(dst, restore_files)
                                 else:
                                     restore_files[dst] = None
                                 shutil.copy(src, dst)
@@ -1012,9 +1020,9 @@ def make_java_module(dist, jdk, archive, javac_daemon=None, alt_module_info_name
                                                 os.symlink(target, dst)
 
                                             restore_files[dst] = restore_link
+                                        os.remove(dst)
                                     else:
-                                        restore_files[dst] = _FileContentsSupplier(dst, eager=True).restore
-                                    os.remove(dst)
+                                        restore_files[dst] = set_aside(dst, restore_files)
                                 else:
                                     restore_files[dst] = None
                                     create_missing_dirs(dirname(dst))
@@ -1227,10 +1235,10 @@ def make_java_module(dist, jdk, archive, javac_daemon=None, alt_module_info_name
                     # Full rewrite needed to drop versioned service entries. Use
                     # SafeFileCreation (write-to-temp + atomic rename) for safety.
                     with mx.Timer('finalize_jar', times), mx_util.SafeFileCreation(module_jar) as sfc:
-                        with ZipFile(module_jar, 'r') as inzf, ZipFile(sfc.tmpPath, 'w', inzf.compression) as outzf:
-                            for info in inzf.infolist():
+                        with RawZipReader(module_jar) as reader, ZipFile(sfc.tmpPath, 'w') as outzf:
+                            for info in reader.infolist():
                                 if info.filename not in files_to_remove:
-                                    outzf.writestr(info, inzf.read(info))
+                                    reader.copy_to(info, outzf)
                             for arcname, contents in pending_module_infos:
                                 outzf.writestr(arcname, contents)
                 else:
@@ -1242,10 +1250,10 @@ def make_java_module(dist, jdk, archive, javac_daemon=None, alt_module_info_name
                             zf.writestr(arcname, contents)
             elif files_to_remove:
                 with mx.Timer('finalize_jar', times), mx_util.SafeFileCreation(module_jar) as sfc:
-                    with ZipFile(module_jar, 'r') as inzf, ZipFile(sfc.tmpPath, 'w', inzf.compression) as outzf:
-                        for info in inzf.infolist():
+                    with RawZipReader(module_jar) as reader, ZipFile(sfc.tmpPath, 'w') as outzf:
+                        for info in reader.infolist():
                             if info.filename not in files_to_remove:
-                                outzf.writestr(info, inzf.read(info))
+                                reader.copy_to(info, outzf)
         finally:
             if not mx.get_opts().verbose:
                 # Preserve build directory so that javac command can be re-executed
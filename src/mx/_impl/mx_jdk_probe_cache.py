@@ -0,0 +1,110 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+"""A persistent cache of what mx learns about a JDK by running its tools."""
+
+from __future__ import annotations
+
+__all__ = ["JDKProbeCache"]
+
+import json
+import os
+from os.path import exists, join
+from typing import Any, Dict, List, Optional
+
+from .mx_util import SafeFileCreation
+
+
+class JDKProbeCache:
+    """
+    Caches the results of probing JDKs with subprocesses (``java -version``, ``javac -X``,
+    ``ClasspathDump`` and ``ListModules``) across mx invocations.
+
+    Entries are keyed by the real path of the JDK home. An entry is only used while the
+    ``release``, ``lib/modules`` and ``bin/java`` files of the JDK have the same modification
+    time and size as when the entry was recorded and the mx version is the same. Each
+    recorded value is written to disk immediately, merged with the entries written
+    concurrently by other mx invocations.
+    """
+
+    version = 1
+
+    def __init__(self, path: str, mxVersion: str):
+        self.path = path
+        self.mxVersion = mxVersion
+        self._entries: Dict[str, Dict[str, Any]] = self._read()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        if not exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as fp:
+                data = json.load(fp)
+            if data.get('version') != self.version or not isinstance(data.get('jdks'), dict):
+                return {}
+            return data['jdks']
+        except (OSError, ValueError):
+            # A corrupt cache is equivalent to no cache
+            return {}
+
+    def _stamp(self, home: str) -> List[Any]:
+        stamp: List[Any] = [self.mxVersion]
+        for name in ('release', join('lib', 'modules'), join('bin', 'java.exe' if os.name == 'nt' else 'java')):
+            try:
+                st = os.stat(join(home, name))
+                stamp.append([name, st.st_mtime_ns, st.st_size])
+            except OSError:
+                stamp.append([name, None, None])
+        return stamp
+
+    def get(self, home: str, name: str) -> Optional[Any]:
+        """Gets the value of probe `name` recorded for the JDK at `home` or None if there is none or it is stale."""
+        entry = self._entries.get(home)
+        if entry is None or name not in entry.get('values', {}) or entry.get('stamp') != self._stamp(home):
+            return None
+        return entry['values'][name]
+
+    def put(self, home: str, name: str, value: Any) -> None:
+        """Records the JSON serializable `value` of probe `name` for the JDK at `home`."""
+        stamp = self._stamp(home)
+        entries = self._read()
+        entries.update({h: e for h, e in self._entries.items() if h not in entries})
+        entry = entries.get(home)
+        if entry is None or entry.get('stamp') != stamp:
+            entry = {'stamp': stamp, 'values': {}}
+            entries[home] = entry
+        entry['values'][name] = value
+        self._entries = entries
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with SafeFileCreation(self.path) as sfc:
+                with open(sfc.tmpPath, 'w', encoding='utf-8') as fp:
+                    json.dump({'version': self.version, 'jdks': entries}, fp)
+        except OSError:
+            # The cache is only an optimization
+            pass
@@ -0,0 +1,202 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+"""
+A single-pass parser for ``suite.py`` files.
+
+Other tools require ``suite.py`` files to be parseable without running a Python interpreter,
+so the value of their ``suite`` variable must be a JSON-like structure of dicts, lists,
+strings, numbers and booleans written in Python syntax (see `Suite._is_jsonifiable_contents`).
+This module parses that subset directly, so that a conforming file neither has to be
+imported nor converted to JSON to be validated.
+"""
+
+from __future__ import annotations
+
+__all__ = ["SuiteFileSyntaxError", "parse_suite_file", "parse_suite_value"]
+
+import ast
+import re
+from typing import Any, Dict, Optional
+
+
+class SuiteFileSyntaxError(ValueError):
+    """Raised for content that is not part of the JSON-like subset of Python accepted in ``suite.py`` files."""
+
+    def __init__(self, message: str, content: str, pos: int):
+        self.line = content.count('\n', 0, pos) + 1
+        self.column = pos - content.rfind('\n', 0, pos)
+        super().__init__(f'{message}: line {self.line} column {self.column}')
+
+
+_token = re.compile(r'''
+    (?P<skip>(?:[ \t\f\r\n]+|\#[^\n]*)+)
+  | (?P<string>"""(?:[^"\\]|\\.|"(?!""))*"""|\'\'\'(?:[^'\\]|\\.|'(?!\'\'))*\'\'\'|"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<number>-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?(?![0-9A-Za-z_.]))
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<punct>[{}\[\]:,=])
+''', re.VERBOSE | re.DOTALL)
+
+_EOF = 'EOF'
+
+
+class _Parser:
+    def __init__(self, content: str, pos: int = 0):
+        self.content = content
+        self.pos = pos
+        self.kind = None
+        self.text = None
+        self.start = pos
+        self.newline = True
+        self.advance()
+
+    def advance(self) -> None:
+        """Moves to the next token, noting whether it is the first token on its line."""
+        content = self.content
+        self.newline = self.pos == 0
+        while True:
+            if self.pos == len(content):
+                self.kind, self.text, self.start = _EOF, '', self.pos
+                return
+            m = _token.match(content, self.pos)
+            if m is None:
+                raise SuiteFileSyntaxError(f'Unexpected character {content[self.pos]!r}', content, self.pos)
+            self.pos = m.end()
+            kind = m.lastgroup
+            if kind == 'skip':
+                self.newline = self.newline or '\n' in m.group()
+                continue
+            self.kind, self.text, self.start = kind, m.group(), m.start()
+            return
+
+    def error(self, message: str) -> SuiteFileSyntaxError:
+        found = 'end of file' if self.kind == _EOF else repr(self.text)
+        return SuiteFileSyntaxError(f'{message}, found {found}', self.content, self.start)
+
+    def expect(self, punct: str) -> None:
+        if self.kind != 'punct' or self.text != punct:
+            raise self.error(f"Expected '{punct}'")
+        self.advance()
+
+    def value(self) -> Any:
+        kind, text = self.kind, self.text
+        if kind == 'punct' and text == '{':
+            return self.dict()
+        if kind == 'punct' and text == '[':
+            return self.list()
+        if kind == 'string':
+            self.advance()
+            return _string_value(text)
+        if kind == 'number':
+            self.advance()
+            return int(text) if text.lstrip('-').isdigit() else float(text)
+        if kind == 'name' and text in ('True', 'False'):
+            self.advance()
+            return text == 'True'
+        raise self.error('Expected a dict, list, string, number or boolean')
+
+    def dict(self) -> Dict[str, Any]:
+        self.advance()
+        result = {}
+        while not (self.kind == 'punct' and self.text == '}'):
+            if self.kind != 'string':
+                raise self.error('Expected a string key')
+            key = _string_value(self.text)
+            self.advance()
+            self.expect(':')
+            result[key] = self.value()
+            if self.kind == 'punct' and self.text == ',':
+                self.advance()
+            elif not (self.kind == 'punct' and self.text == '}'):
+                raise self.error("Expected ',' or '}'")
+        self.advance()
+        return result
+
+    def list(self) -> list:
+        self.advance()
+        result = []
+        while not (self.kind == 'punct' and self.text == ']'):
+            result.append(self.value())
+            if self.kind == 'punct' and self.text == ',':
+                self.advance()
+            elif not (self.kind == 'punct' and self.text == ']'):
+                raise self.error("Expected ',' or ']'")
+        self.advance()
+        return result
+
+
+def _string_value(token: str) -> str:
+    if '\\' in token:
+        return ast.literal_eval(token)
+    if token[:3] in ('"""', "'''"):
+        return token[3:-3]
+    return token[1:-1]
+
+
+def parse_suite_file(content: str) -> Dict[str, Any]:
+    """
+    Parses a ``suite.py`` file that consists only of comments, docstrings and assignments
+    of JSON-like values to variables.
+
+    :return: the variables assigned in `content`
+    :raises SuiteFileSyntaxError: if `content` contains anything else, in which case it
+            has to be imported to get its variables
+    """
+    parser = _Parser(content)
+    variables = {}
+    while parser.kind != _EOF:
+        if not parser.newline:
+            raise parser.error('Expected a new line')
+        if parser.kind == 'string':
+            # docstring
+            parser.advance()
+        elif parser.kind == 'name' and parser.content[parser.start - 1:parser.start] in ('', '\n'):
+            name = parser.text
+            parser.advance()
+            parser.expect('=')
+            variables[name] = parser.value()
+        else:
+            raise parser.error('Expected an assignment')
+    return variables
+
+
+_assignment = re.compile(r'^([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*', re.MULTILINE)
+
+
+def parse_suite_value(content: str, name: str = 'suite') -> Optional[Any]:
+    """
+    Parses the value assigned to the variable `name` in a ``suite.py`` file, ignoring the
+    rest of the file.
+
+    :return: the value or None if there is no assignment to `name`
+    :raises SuiteFileSyntaxError: if the value is not JSON-like
+    """
+    for m in _assignment.finditer(content):
+        if m.group(1) == name:
+            return _Parser(content, m.end()).value()
+    return None
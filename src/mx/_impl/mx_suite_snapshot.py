@@ -0,0 +1,206 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+"""A persistent snapshot of the parsed suite files of a workspace."""
+
+from __future__ import annotations
+
+__all__ = ["SuiteFileSnapshot"]
+
+import hashlib
+import json
+import os
+import re
+import time
+from os.path import exists
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .build.fileindex import INDEX_LOAD_ERRORS, is_racy
+from .mx_util import SafeFileCreation
+
+FileState = Tuple[int, int, str]
+"""(st_mtime_ns, st_size, sha256) of a file."""
+
+
+class SuiteFileSnapshot:
+    """
+    Caches the parsing of the suite files of a workspace across invocations:
+
+    * the ``suite`` dict of every jsonifiable ``suite.py`` file (as parsed by `mx_suite_parser.parse_suite_file`),
+      keyed by the content digest of the file
+    * the key of the last suite graph that was checked for dependency cycles
+
+    The resolved dependency graph (projects, libraries, distributions, their resolved dependencies
+    and removed dependencies) is not cached. It is still built on every invocation since the
+    extensions of the suites can modify it with arbitrary code when they are loaded.
+
+    The graph key (see `graph_key`) covers the contents of all ``suite.py``, ``env`` and extension
+    files of the loaded suites, the mx version and the relevant environment variables. Content
+    digests are cached with the (mtime, size) of the file so that unchanged files are not read,
+    except for files that were racy (see `build.fileindex.is_racy`) when they were hashed.
+    """
+
+    version = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self._files: Dict[str, FileState] = {}
+        self._suites: Dict[str, Tuple[str, str, bool, Optional[str], List[str]]] = {}
+        self._acyclicGraph: Optional[str] = None
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as fp:
+                data = json.load(fp)
+            if data.get('version') != self.version:
+                return
+            self._files = {p: (e[0], e[1], e[2]) for p, e in data['files'].items()}
+            self._suites = {p: (e[0], e[1], e[2], e[3], e[4]) for p, e in data['suites'].items()}
+            self._acyclicGraph = data['acyclicGraph']
+        except INDEX_LOAD_ERRORS:
+            # A corrupt snapshot is equivalent to no snapshot
+            self._files = {}
+            self._suites = {}
+            self._acyclicGraph = None
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        data = {
+            'version': self.version,
+            'files': {p: list(e) for p, e in self._files.items()},
+            'suites': {p: list(e) for p, e in self._suites.items()},
+            'acyclicGraph': self._acyclicGraph,
+        }
+        with SafeFileCreation(self.path) as sfc:
+            with open(sfc.tmpPath, 'w', encoding='utf-8') as fp:
+                json.dump(data, fp)
+        self._dirty = False
+
+    def file_digest(self, path: str) -> Optional[str]:
+        """Gets the sha256 digest of the contents of `path` or None if it does not exist."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._forget_file(path)
+            return None
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        h = hashlib.sha256()
+        try:
+            with open(path, 'rb') as fp:
+                h.update(fp.read())
+        except OSError:
+            self._forget_file(path)
+            return None
+        digest = h.hexdigest()
+        if not is_racy(st.st_mtime_ns, time.time_ns()):
+            self._files[path] = (st.st_mtime_ns, st.st_size, digest)
+            self._dirty = True
+        else:
+            self._forget_file(path)
+        return digest
+
+    def _forget_file(self, path: str) -> None:
+        if self._files.pop(path, None) is not None:
+            self._dirty = True
+
+    def suite_dict(self, suitePy: str) -> Optional[Tuple[dict, bool, Optional[str]]]:
+        """
+        Gets the ``suite`` dict recorded for `suitePy` if the file is unchanged since it was recorded.
+
+        :return: a fresh copy of the unexpanded dict, whether the file is jsonifiable and the
+                 reason it is not, or None
+        """
+        entry = self._suites.get(suitePy)
+        if entry is None or entry[0] != self.file_digest(suitePy):
+            return None
+        return json.loads(entry[1]), entry[2], entry[3]
+
+    def record_suite_dict(self, suitePy: str, digest: Optional[str], suiteDict: dict, jsonifiable: bool, error: Optional[str]) -> None:
+        """
+        Records the ``suite`` dict loaded from `suitePy` before any of its values were expanded.
+
+        Only dicts of jsonifiable files are recorded. Other files are imported, which can run
+        arbitrary code whose result does not only depend on the contents of `suitePy`, so they
+        must be imported every time. A dict that does not survive a JSON round trip unchanged
+        (e.g. because it contains tuples) is not recorded either.
+
+        :param digest: the digest of `suitePy` as of before it was loaded
+        """
+        if digest is None or not jsonifiable:
+            return
+        try:
+            encoded = json.dumps(suiteDict)
+        except (TypeError, ValueError):
+            return
+        if json.loads(encoded) != suiteDict:
+            return
+        envVars = sorted(set(SuiteFileSnapshot._envVarReference.findall(encoded)))
+        self._suites[suitePy] = (digest, encoded, jsonifiable, error, envVars)
+        self._dirty = True
+
+    _envVarReference = re.compile(r'\$\{?([A-Za-z_][A-Za-z0-9_]*)')
+
+    def referenced_env_vars(self, suitePys: Iterable[str]) -> List[str]:
+        """Gets the names of the environment variables referenced in the recorded dicts of `suitePys`."""
+        names = set()
+        for suitePy in suitePys:
+            entry = self._suites.get(suitePy)
+            if entry is not None:
+                names.update(entry[4])
+        return sorted(names)
+
+    def graph_key(self, files: Iterable[str], mxVersion: str, env: Dict[str, Optional[str]]) -> str:
+        """
+        Computes the key of a suite graph defined by `files`.
+
+        :param files: the ``suite.py``, ``env`` and extension files of all loaded suites
+        :param env: the values of the environment variables (and other settings) influencing the graph
+        """
+        h = hashlib.sha256()
+        h.update(f'mx {mxVersion}\n'.encode())
+        for path in sorted(set(files)):
+            h.update(f'{path}\0{self.file_digest(path) or "-"}\n'.encode())
+        for name in sorted(env):
+            h.update(f'{name}\0{"-" if env[name] is None else env[name]}\n'.encode())
+        return h.hexdigest()
+
+    def is_acyclic(self, graphKey: str) -> bool:
+        """Returns whether the graph with key `graphKey` was already checked for dependency cycles."""
+        return self._acyclicGraph == graphKey
+
+    def record_acyclic(self, graphKey: str) -> None:
+        if self._acyclicGraph != graphKey:
+            self._acyclicGraph = graphKey
+            self._dirty = True
@@ -39,6 +39,7 @@ __all__ = [
     "ensure_dirname_exists",
     "ensure_dir_exists",
     "SafeFileCreation",
+    "materialize_file",
     "Stage",
     "StageName",
     "Layer",
@@ -48,6 +49,7 @@ __all__ = [
 
 import os.path
 import errno
+import shutil
 import sys
 import tempfile
 from dataclasses import dataclass
@@ -55,6 +57,11 @@ from enum import Enum
 from typing import Optional, List, Callable
 from os.path import dirname, exists, join, isdir, basename
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 min_required_python_version = (3, 8)
 min_required_python_version_str = f'{".".join((str(d) for d in min_required_python_version))}'
 
@@ -211,6 +218,60 @@ class SafeFileCreation(object):
         assert self._tmp_fd is not None
         return self._tmp_fd
 
+_FICLONE = 0x40049409
+"""The Linux ioctl that makes a file share the extents of another file (a reflink)."""
+
+_link_unsupported_errnos = (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EACCES)
+
+
+def _reflink(src: str, dst: str) -> bool:
+    if fcntl is None:
+        return False
+    try:
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def materialize_file(src: str, dst: str, hardlink: bool = True) -> str:
+    """
+    Creates or atomically replaces `dst` with a file that has the contents and permissions of
+    `src`, as cheaply as the file system allows: a copy-on-write clone (reflink), else a hard link
+    to `src` (unless `hardlink` is False), else a copy.
+
+    A hard link shares all future modifications with `src`, so it should only be allowed where
+    a symlink to `src` would be acceptable as well.
+
+    :return: the strategy that was used: "reflink", "hardlink" or "copy"
+    """
+    fd, tmp = tempfile.mkstemp(suffix=basename(dst), dir=dirname(dst) or '.')
+    os.close(fd)
+    try:
+        if _reflink(src, tmp):
+            shutil.copymode(src, tmp)
+            strategy = 'reflink'
+        else:
+            strategy = 'copy'
+            if hardlink:
+                os.remove(tmp)
+                try:
+                    os.link(src, tmp)
+                    strategy = 'hardlink'
+                except OSError as e:
+                    if e.errno not in _link_unsupported_errnos:
+                        raise
+            if strategy == 'copy':
+                shutil.copy(src, tmp)
+        os.replace(tmp, dst)
+        return strategy
+    except BaseException:
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+        raise
+
+
 # Internal test support
 
 def _create_tmp_files(tmp_dir, num):
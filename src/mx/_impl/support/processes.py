@@ -30,8 +30,8 @@ __all__ = ["ERROR_TIMEOUT", "terminate_subprocesses", "waitOn"]
 import multiprocessing, os, signal, subprocess, time
 from typing import List, Optional, Sequence, Tuple, Union
 
-from .logging import log, log_error, logvv
-from .system import is_windows
+from .logging import getLogTask, log, log_error, logvv
+from .system import is_darwin, is_windows
 
 Pid = int
 Signal = int
@@ -141,6 +141,35 @@ def waitOn(p: Process) -> ReturnCode:
         while retcode is None:
             retcode = p.poll()
             time.sleep(0.05)
+    elif getLogTask() is not None and hasattr(os, "wait4"):
+        retcode = _waitAndRecordUsage(p, getLogTask())
     else:
         retcode = p.wait()
     return retcode
+
+
+def _waitAndRecordUsage(p: subprocess.Popen, task) -> ReturnCode:
+    """
+    Waits for `p` like `Popen.wait` but reaps it with `os.wait4` so that the CPU time and
+    peak memory usage of the process can be accounted to the build task `task`.
+
+    Like `Popen.wait`, the process is reaped while holding the lock of `p` that serializes
+    reaping, so that a concurrent `poll`, `send_signal` or `kill` never acts on a reaped pid.
+    """
+    waitpidLock = getattr(p, '_waitpid_lock', None)
+    if waitpidLock is None:
+        return p.wait()
+    with waitpidLock:
+        while p.returncode is None:
+            try:
+                _, status, usage = os.wait4(p.pid, 0)
+            except InterruptedError:
+                continue
+            except ChildProcessError:
+                # Reaped without going through `p`, leave it to `Popen.wait`
+                break
+            # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+            maxRss = usage.ru_maxrss // 1024 if is_darwin() else usage.ru_maxrss
+            task.recordSubprocessUsage(usage.ru_utime + usage.ru_stime, maxRss)
+            p._handle_exitstatus(status)
+    return p.wait()
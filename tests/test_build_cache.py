@@ -0,0 +1,215 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+import importlib
+import os
+import pathlib
+import sys
+import tempfile
+import unittest
+from argparse import Namespace
+from unittest import mock
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+importlib.import_module("mx._impl.mx")
+cache_module = importlib.import_module("mx._impl.build.cache")
+digests_module = importlib.import_module("mx._impl.build.digests")
+fileindex_module = importlib.import_module("mx._impl.build.fileindex")
+tasks_module = importlib.import_module("mx._impl.build.tasks")
+
+
+class FakeSuite:
+    def __init__(self, dir):
+        self.dir = dir
+
+    def get_mx_output_dir(self):
+        return os.path.join(self.dir, "mxbuild")
+
+    def getMxCompatibility(self):
+        return Namespace(newestInputIsTimeStampFile=lambda: True)
+
+
+class FakeSubject:
+    def __init__(self, name, suite):
+        self.name = name
+        self.suite = suite
+
+    def _extra_artifact_discriminant(self):
+        return ""
+
+    def __str__(self):
+        return self.name
+
+
+class ConcatTask(tasks_module.BuildTask):
+    """Writes the contents of `source` into the directory `<suite>/out`, counting the number of builds."""
+
+    def __init__(self, subject, args):
+        super().__init__(subject, args, 1)
+        self.source = os.path.join(subject.suite.dir, "src.txt")
+        self.outDir = os.path.join(subject.suite.dir, "out")
+        self.builds = 0
+        self.restores = 0
+
+    def __str__(self):
+        return f"Building {self.name}"
+
+    def contentInputs(self):
+        return [self.source]
+
+    def contentOutputs(self):
+        return [self.outDir]
+
+    def buildCacheKey(self):
+        return {"tool": "cat"}
+
+    def restoredFromBuildCache(self):
+        self.restores += 1
+
+    def needsBuild(self, newestInput):
+        return not os.path.exists(self.outDir), "no output"
+
+    def needsBuildByContent(self):
+        return False, None
+
+    def newestOutput(self):
+        return None
+
+    def build(self):
+        self.builds += 1
+        os.makedirs(os.path.join(self.outDir, "sub"), exist_ok=True)
+        with open(self.source, encoding="utf-8") as src, open(os.path.join(self.outDir, "sub", "out.txt"), "w", encoding="utf-8") as dst:
+            dst.write(src.read())
+
+    def clean(self, forBuild=False):
+        if os.path.exists(self.outDir):
+            cache_module._remove(self.outDir)
+
+
+def _args():
+    return Namespace(clean=False, force=False, only=None, build_cache=True, shallow_dependency_checks=None,
+                     build_logs="silent", print_timing=False)
+
+
+class BuildCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.cache = cache_module.BuildCache(os.path.join(self.root, "cache"))
+        self._default = cache_module.BuildCache.default
+        cache_module.BuildCache.default = staticmethod(lambda: self.cache)
+        patcher = mock.patch.object(fileindex_module, "RACY_WINDOW_NS", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        cache_module.BuildCache.default = self._default
+        self.tmp.cleanup()
+
+    def _checkout(self, name, contents):
+        suiteDir = os.path.join(self.root, name)
+        os.makedirs(suiteDir)
+        with open(os.path.join(suiteDir, "src.txt"), "w", encoding="utf-8") as fp:
+            fp.write(contents)
+        return ConcatTask(FakeSubject("P", FakeSuite(suiteDir)), _args())
+
+    def _output(self, task):
+        with open(os.path.join(task.outDir, "sub", "out.txt"), encoding="utf-8") as fp:
+            return fp.read()
+
+    def test_other_checkout_restores_from_cache(self):
+        first = self._checkout("first", "hello")
+        first.execute()
+        second = self._checkout("second", "hello")
+        second.execute()
+
+        self.assertEqual((first.builds, second.builds, second.restores), (1, 0, 1))
+        self.assertTrue(second.built)
+        self.assertEqual(self._output(second), "hello")
+        self.assertEqual(first.contentOutputDigest(), second.contentOutputDigest())
+
+    def test_modifying_restored_output_keeps_entry(self):
+        self._checkout("first", "hello").execute()
+        second = self._checkout("second", "hello")
+        second.execute()
+        with open(os.path.join(second.outDir, "sub", "out.txt"), "r+", encoding="utf-8") as fp:
+            fp.write("HELLO")
+
+        [entry] = self.cache.entries()
+        with open(os.path.join(entry.path, "files", "0", "sub", "out.txt"), encoding="utf-8") as fp:
+            self.assertEqual(fp.read(), "hello")
+        third = self._checkout("third", "hello")
+        third.execute()
+        self.assertEqual((third.builds, third.restores), (0, 1))
+        self.assertEqual(self._output(third), "hello")
+
+    def test_different_input_misses(self):
+        self._checkout("first", "hello").execute()
+        second = self._checkout("second", "world")
+        second.execute()
+
+        self.assertEqual((second.builds, second.restores), (1, 0))
+        self.assertEqual(self._output(second), "world")
+        self.assertEqual(len(self.cache.entries()), 2)
+
+    def test_corrupt_entry_is_discarded(self):
+        self._checkout("first", "hello").execute()
+        [entry] = self.cache.entries()
+        with open(os.path.join(entry.path, "files", "0", "sub", "out.txt"), "w", encoding="utf-8") as fp:
+            fp.write("corrupt")
+        second = self._checkout("second", "hello")
+        with mock.patch.object(cache_module, "warn"):
+            second.execute()
+
+        self.assertEqual((second.builds, second.restores), (1, 0))
+        self.assertEqual(self._output(second), "hello")
+
+    def test_evicts_least_recently_used(self):
+        paths = []
+        for i, name in enumerate(("a", "b", "c")):
+            self._checkout(name, name * 100).execute()
+            [new] = [e.path for e in self.cache.entries() if e.path not in paths]
+            os.utime(os.path.join(new, cache_module.BuildCache.manifestName), (1000 + i, 1000 + i))
+            paths.append(new)
+        # Using the oldest entry makes it the most recently used one
+        self._checkout("a2", "a" * 100).execute()
+        total = sum(e.size for e in self.cache.entries())
+
+        removed = self.cache.evict(total - 1)
+
+        self.assertEqual([e.path for e in removed], [paths[1]])
+
+    def test_parse_size(self):
+        self.assertEqual(cache_module.parse_size("512"), 512)
+        self.assertEqual(cache_module.parse_size("2k"), 2048)
+        self.assertEqual(cache_module.parse_size("1.5G"), 3 * 1024 ** 3 // 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+import importlib
+import pathlib
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+scheduler_module = importlib.import_module("mx._impl.build.scheduler")
+
+
+class FakeTask:
+    def __init__(self, name, build_time=1, parallelism=1, deps=None):
+        self.name = name
+        self.build_time = build_time
+        self.parallelism = parallelism
+        self.deps = deps or []
+
+    def __repr__(self):
+        return self.name
+
+
+class TaskSchedulerTest(unittest.TestCase):
+    def test_critical_path_priorities(self):
+        a = FakeTask("a", build_time=1)
+        b = FakeTask("b", build_time=10, deps=[a])
+        c = FakeTask("c", build_time=2, deps=[a])
+        d = FakeTask("d", build_time=3, deps=[b, c])
+        scheduler = scheduler_module.TaskScheduler([a, b, c, d], cpus=4)
+
+        self.assertEqual(scheduler.priorities[d], 3)
+        self.assertEqual(scheduler.priorities[b], 13)
+        self.assertEqual(scheduler.priorities[c], 5)
+        self.assertEqual(scheduler.priorities[a], 14)
+
+    def test_starts_longest_remaining_path_first(self):
+        short = FakeTask("short", build_time=5)
+        chain_head = FakeTask("chain_head", build_time=1)
+        chain_tail = FakeTask("chain_tail", build_time=10, deps=[chain_head])
+        scheduler = scheduler_module.TaskScheduler([short, chain_head, chain_tail], cpus=1)
+
+        self.assertEqual(scheduler.take_ready(), [chain_head])
+
+    def test_dependents_become_ready_when_finished(self):
+        a = FakeTask("a")
+        b = FakeTask("b", deps=[a])
+        scheduler = scheduler_module.TaskScheduler([a, b], cpus=2)
+
+        self.assertEqual(scheduler.take_ready(), [a])
+        scheduler.started(a)
+        self.assertEqual(scheduler.take_ready(), [])
+        scheduler.finished(a)
+        self.assertEqual(scheduler.take_ready(), [b])
+        self.assertFalse(scheduler.has_pending())
+
+    def test_backfills_tasks_that_fit_remaining_cpus(self):
+        wide = FakeTask("wide", build_time=10, parallelism=2)
+        narrow = FakeTask("narrow", build_time=1)
+        first = FakeTask("first", build_time=100)
+        scheduler = scheduler_module.TaskScheduler([first, wide, narrow], cpus=2)
+
+        self.assertEqual(scheduler.take_ready(), [first, narrow])
+        self.assertEqual(scheduler.pending(), [wide])
+
+    def test_wait_returns_completed_tasks(self):
+        a = FakeTask("a")
+        scheduler = scheduler_module.TaskScheduler([a], cpus=1)
+        scheduler.take_ready()
+        scheduler.started(a)
+        self.assertEqual(scheduler.wait(timeout=0.01), [])
+        threading.Thread(target=scheduler.completed, args=(a,)).start()
+        self.assertEqual(scheduler.wait(timeout=5), [a])
+
+    def test_dependencies_on_aliased_tasks(self):
+        a = FakeTask("a")
+        b = FakeTask("b")
+        batch = FakeTask("batch", deps=[])
+        c = FakeTask("c", deps=[a, b])
+        scheduler = scheduler_module.TaskScheduler([batch, c], cpus=2, aliases={a: batch, b: batch})
+
+        self.assertEqual(scheduler.priorities[batch], 2)
+        self.assertEqual(scheduler.take_ready(), [batch])
+        scheduler.started(batch)
+        self.assertEqual(scheduler.take_ready(), [])
+        scheduler.finished(batch)
+        self.assertEqual(scheduler.take_ready(), [c])
+
+
+if __name__ == "__main__":
+    unittest.main()
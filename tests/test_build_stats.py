@@ -0,0 +1,165 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+import importlib
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+stats_module = importlib.import_module("mx._impl.build.stats")
+TaskStat = stats_module.TaskStat
+processes_module = importlib.import_module("mx._impl.support.processes")
+
+
+class FakeTask:
+    def __init__(self, name, build_time=1, parallelism=1):
+        self.name = name
+        self.build_time = build_time
+        self.parallelism = parallelism
+
+
+class BuildStatsDatabaseTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "mxbuild", "build-stats.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_measurements_persist_across_instances(self):
+        db = stats_module.BuildStatsDatabase(self.path)
+        db.record(TaskStat("A", "jdk21", "javac", 100.0, 104.0, 2.0, 1024))
+        db.record(TaskStat("A", "jdk21", "javac", 200.0, 206.0, 3.0, 2048))
+        db.record(TaskStat("A", "jdk21", "javac", 300.0, 305.0, 2.0, 1024))
+        db.flush()
+
+        reloaded = stats_module.BuildStatsDatabase(self.path)
+        self.assertEqual(reloaded.estimated_duration("A", "jdk21", "javac"), 5.0)
+        self.assertIsNone(reloaded.estimated_duration("B", "jdk21", "javac"))
+
+    def test_falls_back_to_other_configurations(self):
+        db = stats_module.BuildStatsDatabase(self.path)
+        db.record(TaskStat("A", "jdk17", "ecj", 0.0, 8.0, 8.0, 0))
+
+        self.assertEqual(db.estimated_duration("A", "jdk21", "javac"), 8.0)
+
+    def test_ignores_truncated_lines(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w", encoding="utf-8") as fp:
+            fp.write('{"task": "A", "jdk": "j", "config": "c", "start": 0, "end": 2, "cpu": 1, "maxrss": 0}\n{"task": "B", "jd')
+
+        db = stats_module.BuildStatsDatabase(self.path)
+        self.assertEqual(db.estimated_duration("A", "j", "c"), 2.0)
+
+    def test_unmeasured_tasks_scaled_by_static_cost(self):
+        measured = FakeTask("measured", build_time=2)
+        unmeasured = FakeTask("unmeasured", build_time=5)
+        db = stats_module.BuildStatsDatabase(self.path)
+        db.record(TaskStat("measured", "j", "c", 0.0, 20.0, 0.0, 0))
+
+        estimate = db.cost_estimator([measured, unmeasured], "j", "c", lambda t: t.name, lambda t: t.build_time)
+
+        self.assertEqual(estimate(measured), 20.0)
+        self.assertEqual(estimate(unmeasured), 50.0)
+
+    def test_cpu_demand_bounded_by_parallelism(self):
+        busy = FakeTask("busy", parallelism=8)
+        idle = FakeTask("idle", parallelism=8)
+        db = stats_module.BuildStatsDatabase(self.path)
+        db.record(TaskStat("busy", "j", "c", 0.0, 10.0, 200.0, 0))
+        db.record(TaskStat("idle", "j", "c", 0.0, 10.0, 25.0, 0))
+
+        demand = db.cpu_demand_estimator("j", "c", lambda t: t.name)
+
+        self.assertEqual(demand(busy), 8)
+        self.assertEqual(demand(idle), 3)
+        self.assertEqual(demand(FakeTask("new", parallelism=4)), 4)
+
+    def test_compaction_keeps_recent_samples(self):
+        db = stats_module.BuildStatsDatabase(self.path)
+        for i in range(500):
+            db.record(TaskStat("A", "j", "c", float(i), float(i) + 1 + i % 2, 0.0, 0))
+            db.flush()
+
+        with open(self.path, encoding="utf-8") as fp:
+            lines = fp.readlines()
+        self.assertLessEqual(len(lines), 400)
+        self.assertEqual(len(stats_module.BuildStatsDatabase(self.path)._samples[("A", "j", "c")]), db.samplesPerKey)
+
+    def test_compaction_keeps_concurrently_appended_samples(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w", encoding="utf-8") as fp:
+            for i in range(500):
+                fp.write(json.dumps(TaskStat("A", "j", "c", float(i), float(i) + 1, 0.0, 0)._asdict()) + "\n")
+        first = stats_module.BuildStatsDatabase(self.path)
+        second = stats_module.BuildStatsDatabase(self.path)
+        second.record(TaskStat("B", "j", "c", 0.0, 2.0, 0.0, 0))
+        second.flush()
+        first.record(TaskStat("C", "j", "c", 0.0, 3.0, 0.0, 0))
+        first.flush()
+
+        db = stats_module.BuildStatsDatabase(self.path)
+        self.assertEqual(db.estimated_duration("B", "j", "c"), 2.0)
+        self.assertEqual(db.estimated_duration("C", "j", "c"), 3.0)
+        self.assertEqual(len(db._samples[("A", "j", "c")]), db.samplesPerKey)
+
+
+@unittest.skipUnless(hasattr(os, "wait4"), "requires os.wait4")
+class SubprocessUsageTest(unittest.TestCase):
+    def test_concurrent_poll_sees_exit_status(self):
+        usage = []
+        task = types.SimpleNamespace(recordSubprocessUsage=lambda cpu, maxRss: usage.append((cpu, maxRss)))
+        p = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.2); raise SystemExit(3)"])
+        polled = []
+
+        def poll():
+            while p.poll() is None:
+                time.sleep(0.01)
+            polled.append(p.returncode)
+
+        poller = threading.Thread(target=poll)
+        poller.start()
+        self.assertEqual(processes_module._waitAndRecordUsage(p, task), 3)
+        poller.join(10)
+
+        self.assertEqual(polled, [3])
+        self.assertEqual(len(usage), 1)
+        self.assertGreater(usage[0][1], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+import importlib
+import os
+import pathlib
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+mx = importlib.import_module("mx._impl.mx")
+
+
+class ClasspathEntrySetTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _file(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as fp:
+            fp.write(content)
+        return path
+
+    def test_equal_files_are_the_same_entry(self):
+        a = self._file("a.jar", "content")
+        copy = self._file("copy.jar", "content")
+        other = self._file("other.jar", "CONTENT")
+        link = os.path.join(self.tmp.name, "link.jar")
+        os.link(a, link)
+        entries = mx._ClasspathEntrySet([a])
+        self.assertIn(a, entries)
+        self.assertIn(copy, entries)
+        self.assertIn(link, entries)
+        self.assertNotIn(other, entries)
+
+    def test_missing_files_and_directories(self):
+        missing = os.path.join(self.tmp.name, "missing.jar")
+        classes = os.path.join(self.tmp.name, "classes")
+        os.mkdir(classes)
+        entries = mx._ClasspathEntrySet([missing, classes])
+        self.assertIn(missing, entries)
+        self.assertNotIn(os.path.join(self.tmp.name, "missing2.jar"), entries)
+        # like filecmp.cmp, directories are never considered equal
+        self.assertNotIn(classes, entries)
+        self._file("missing.jar", "now exists")
+        self.assertNotIn(missing, entries)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+import importlib
+import os
+import pathlib
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+importlib.import_module("mx._impl.mx")
+daemon_module = importlib.import_module("mx._impl.build.daemon")
+protocol = importlib.import_module("mx._impl.build.protocol")
+
+
+class FakeDaemon(socketserver.ThreadingTCPServer):
+    """Answers pings like com.oracle.mxtool.compilerserver.CompilerDaemon."""
+
+    daemon_threads = True
+
+    def __init__(self, response, token="secret"):
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                if self.rfile.readline() != f"MX DAEMON/AUTH: {token}\n".encode():
+                    return
+                if self.rfile.readline() == b"MX DAEMON/PING\n":
+                    self.wfile.write(response)
+
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class PersistentDaemonRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.registry = daemon_module.PersistentDaemonRegistry(os.path.join(self.tmp.name, "daemons"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_ping(self):
+        healthy = FakeDaemon(b"MX DAEMON/PONG\n")
+        unhealthy = FakeDaemon(b"")
+        try:
+            self.assertTrue(daemon_module.ping_daemon(healthy.port, "secret"))
+            self.assertFalse(daemon_module.ping_daemon(healthy.port, "wrong"))
+            self.assertFalse(daemon_module.ping_daemon(healthy.port))
+            self.assertFalse(daemon_module.ping_daemon(unhealthy.port, "secret"))
+        finally:
+            healthy.stop()
+            unhealthy.stop()
+        self.assertFalse(daemon_module.ping_daemon(healthy.port, "secret", timeout=1))
+
+    def test_key_depends_on_all_components(self):
+        key = daemon_module.PersistentDaemonRegistry.key
+        self.assertEqual(key(["java", "-Xmx1g"]), key(["java", "-Xmx1g"]))
+        self.assertNotEqual(key(["java", "-Xmx1g"]), key(["java", "-Xmx2g"]))
+        self.assertNotEqual(key(["ab", "c"]), key(["a", "bc"]))
+
+    @unittest.skipUnless(daemon_module.PersistentDaemonRegistry.is_supported(), "requires fcntl")
+    def test_lookup(self):
+        key = "k"
+        with self.registry.locked(key):
+            self.assertIsNone(self.registry.lookup(key))
+            with open(self.registry.port_file(key), "w", encoding="utf-8") as fp:
+                fp.write("1234 42 secret\n")
+            self.assertEqual(self.registry.lookup(key), (1234, 42, "secret"))
+            self.assertEqual(os.stat(self.registry.root).st_mode & 0o777, 0o700)
+            self.registry.remove(key)
+            self.assertIsNone(self.registry.lookup(key))
+
+
+class MultiplexedConnectionTest(unittest.TestCase):
+    def _serve(self, handler, token=None):
+        server = socket.create_server(("127.0.0.1", 0))
+        self.addCleanup(server.close)
+
+        def run():
+            conn, _ = server.accept()
+            with conn, conn.makefile("rb") as stream:
+                if token is not None:
+                    self.assertEqual(stream.readline(), f"MX DAEMON/AUTH: {token}\n".encode())
+                self.assertEqual(stream.readline(), b"MX DAEMON/MUX\n")
+                conn.sendall(b"MX DAEMON/MUX-OK\n")
+                handler(conn, stream)
+
+        threading.Thread(target=run, daemon=True).start()
+        return socket.create_connection(server.getsockname())
+
+    def test_concurrent_requests(self):
+        def handler(conn, stream):
+            requests = [protocol.read_frame(stream) for _ in range(2)]
+            # Answer in reverse order to check that responses are dispatched by request id
+            for requestId, frameType, payload in reversed(requests):
+                self.assertEqual(frameType, protocol.FRAME_COMPILE)
+                name = payload.decode().split("\0")[-1]
+                protocol.write_frame(conn, requestId, protocol.FRAME_OUTPUT, f"{name}.java:3: error: boom\n".encode())
+                protocol.write_frame(conn, requestId, protocol.FRAME_DIAGNOSTIC, "\0".join(["error", f"{name}.java", "3", "boom"]).encode())
+                protocol.write_frame(conn, requestId, protocol.FRAME_DONE, b"1" if name == "A" else b"0")
+
+        mux = protocol.MultiplexedConnection(self._serve(handler))
+        results = {}
+
+        def compile(name):
+            output = []
+            results[name] = mux.compile(["-d", "out", name], output.append) + (output,)
+
+        threads = [threading.Thread(target=compile, args=(n,)) for n in ("A", "B")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+        mux.close()
+
+        retcode, diagnostics, output = results["A"]
+        self.assertEqual(retcode, 1)
+        self.assertEqual(diagnostics, [protocol.Diagnostic("error", "A.java", 3, "boom")])
+        self.assertEqual(output, ["A.java:3: error: boom\n"])
+        self.assertEqual(results["B"][0], 0)
+
+    def test_authenticated_connection(self):
+        def handler(conn, stream):
+            requestId, _, _ = protocol.read_frame(stream)
+            protocol.write_frame(conn, requestId, protocol.FRAME_DONE, b"0")
+
+        mux = protocol.MultiplexedConnection(self._serve(handler, token="secret"), "secret")
+        self.assertEqual(mux.compile(["x"], lambda line: None), (0, []))
+        mux.close()
+
+    def test_lost_connection(self):
+        mux = protocol.MultiplexedConnection(self._serve(lambda conn, stream: protocol.read_frame(stream)))
+        self.assertEqual(mux.compile(["x"], lambda line: None), (-1, []))
+        self.assertTrue(mux.closed)
+        with self.assertRaises(ConnectionError):
+            mux.compile(["x"], lambda line: None)
+        mux.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
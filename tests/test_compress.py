@@ -0,0 +1,137 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+import gzip
+import importlib
+import io
+import os
+import pathlib
+import sys
+import tarfile
+import tempfile
+import unittest
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+mx = importlib.import_module("mx._impl.mx")
+compress = importlib.import_module("mx._impl.build.compress")
+rawzip = importlib.import_module("mx._impl.build.rawzip")
+
+
+class CompressTest(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(4)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_ordered_map(self):
+        items = list(range(200))
+        for executor in (None, self.executor):
+            self.assertEqual([i * i for i in items], list(compress.ordered_map(executor, lambda i: i * i, iter(items), window=8)))
+
+    def test_deflated_entries_match_writestr(self):
+        contents = {"A.class": os.urandom(100) * 50, "B.txt": b"", "C.bin": os.urandom(5000)}
+
+        def create(parallel):
+            out = io.BytesIO()
+            with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                for name, data in contents.items():
+                    info = zipfile.ZipInfo(name, (2020, 2, 2, 2, 2, 2))
+                    info.compress_type = zipfile.ZIP_STORED if name.endswith(".bin") else zipfile.ZIP_DEFLATED
+                    info.external_attr = 0o644 << 16
+                    if parallel:
+                        compressed = compress.deflate_entry(info, data)
+                        rawzip.write_raw_entry(zf, info, io.BytesIO(compressed), len(compressed))
+                    else:
+                        zf.writestr(info, data)
+            return out.getvalue()
+
+        self.assertEqual(create(False), create(True))
+
+    def test_gzip_header_is_fixed(self):
+        data = b"hello" * 100
+        out = io.BytesIO()
+        out.close = lambda: None
+        with compress.ParallelGzipWriter(out, None, compresslevel=9) as writer:
+            writer.write(data)
+        member = out.getvalue()
+        # No flags, zero mtime, maximum compression and unknown OS on every Python version
+        self.assertEqual(b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x02\xff", member[:10])
+        self.assertEqual(zlib.crc32(data).to_bytes(4, "little") + len(data).to_bytes(4, "little"), member[-8:])
+        self.assertEqual(data, gzip.decompress(member))
+
+    def test_unsupported_compression_type(self):
+        info = zipfile.ZipInfo("A.class")
+        info.compress_type = zipfile.ZIP_BZIP2
+        with self.assertRaises(ValueError):
+            compress.deflate_entry(info, b"data")
+
+    def test_parallel_gzip(self):
+        data = os.urandom(10000) * 30
+        outputs = []
+        for executor in (None, self.executor):
+            out = io.BytesIO()
+            out.close = lambda: None
+            with compress.ParallelGzipWriter(out, executor, blockSize=64 * 1024, window=2) as writer:
+                for i in range(0, len(data), 7000):
+                    writer.write(data[i:i + 7000])
+                self.assertEqual(len(data), writer.tell())
+            outputs.append(out.getvalue())
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(data, gzip.decompress(outputs[0]))
+
+    def test_empty_gzip(self):
+        out = io.BytesIO()
+        out.close = lambda: None
+        compress.ParallelGzipWriter(out, self.executor).close()
+        self.assertEqual(b"", gzip.decompress(out.getvalue()))
+
+    def test_tgz_archiver(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "file.txt")
+            with open(source, "wb") as fp:
+                fp.write(b"x" * 3000000)
+            os.utime(source, (0, 0))
+            archives = []
+            for executor in (None, self.executor):
+                path = os.path.join(tmp, f"layout{len(archives)}.tgz")
+                with mock.patch.object(mx, "_archive_executor", return_value=executor):
+                    with mx.Archiver(path, kind="tgz", compress=True, reset_user_group=True) as arc:
+                        arc.add(source, "dir/file.txt", "test")
+                with open(path, "rb") as fp:
+                    archives.append(fp.read())
+                with tarfile.open(path) as tf:
+                    self.assertEqual(b"x" * 3000000, tf.extractfile("dir/file.txt").read())
+            self.assertEqual(archives[0], archives[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
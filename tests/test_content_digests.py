@@ -0,0 +1,192 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+import importlib
+import os
+import pathlib
+import sys
+import tempfile
+import unittest
+from argparse import Namespace
+from unittest import mock
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+importlib.import_module("mx._impl.mx")
+digests_module = importlib.import_module("mx._impl.build.digests")
+fileindex_module = importlib.import_module("mx._impl.build.fileindex")
+tasks_module = importlib.import_module("mx._impl.build.tasks")
+
+
+class FakeSuite:
+    def __init__(self, mx_output_dir):
+        self.mx_output_dir = mx_output_dir
+        self.dir = os.path.dirname(mx_output_dir)
+
+    def get_mx_output_dir(self):
+        return self.mx_output_dir
+
+    def getMxCompatibility(self):
+        return Namespace(newestInputIsTimeStampFile=lambda: True)
+
+
+class FakeSubject:
+    def __init__(self, name, suite):
+        self.name = name
+        self.suite = suite
+
+    def _extra_artifact_discriminant(self):
+        return ""
+
+    def __str__(self):
+        return self.name
+
+
+class CopyTask(tasks_module.BuildTask):
+    """Copies `source` to `target`, counting the number of builds."""
+
+    def __init__(self, subject, args, source, target):
+        super().__init__(subject, args, 1)
+        self.source = source
+        self.target = target
+        self.builds = 0
+
+    def __str__(self):
+        return f"Copying {self.name}"
+
+    def contentInputs(self):
+        return [self.source]
+
+    def contentOutputs(self):
+        return [self.target]
+
+    def needsBuild(self, newestInput):
+        if not os.path.exists(self.target) or os.path.getmtime(self.target) < os.path.getmtime(self.source):
+            return True, "stale"
+        if newestInput and os.path.getmtime(self.target) < newestInput.timestamp:
+            return True, "dependency newer"
+        return False, None
+
+    def needsBuildByContent(self):
+        return False, None
+
+    def newestOutput(self):
+        return None
+
+    def build(self):
+        self.builds += 1
+        with open(self.source, encoding="utf-8") as src, open(self.target, "w", encoding="utf-8") as dst:
+            dst.write(src.read())
+
+    def clean(self, forBuild=False):
+        pass
+
+
+def _args():
+    return Namespace(clean=False, force=False, only=None, content_digests=True, shallow_dependency_checks=None,
+                     build_logs="silent", print_timing=False)
+
+
+class ContentDigestsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.suite = FakeSuite(os.path.join(self.root, "mxbuild"))
+        patcher = mock.patch.object(fileindex_module, "RACY_WINDOW_NS", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _file(self, name, contents):
+        path = os.path.join(self.root, name)
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(contents)
+        return path
+
+    def _touch(self, path, delta=10):
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + delta * 10**9))
+
+    def _tasks(self, a_src, b_src):
+        a = CopyTask(FakeSubject("A", self.suite), _args(), a_src, os.path.join(self.root, "a.out"))
+        b = CopyTask(FakeSubject("B", self.suite), _args(), b_src, os.path.join(self.root, "b.out"))
+        b.deps.append(a)
+        return a, b
+
+    def _build(self, *tasks):
+        for t in tasks:
+            t.execute()
+
+    def test_directory_digest_covers_names_and_contents(self):
+        d = os.path.join(self.root, "d")
+        os.makedirs(os.path.join(d, "sub"))
+        self._file(os.path.join("d", "sub", "x"), "1")
+        digests = digests_module.ContentDigests(os.path.join(self.root, "digests.json"))
+        before = digests.file_digest(d)
+        os.rename(os.path.join(d, "sub", "x"), os.path.join(d, "sub", "y"))
+        self.assertNotEqual(before, digests.file_digest(d))
+        self.assertIsNone(digests.file_digest(os.path.join(self.root, "missing")))
+
+    def test_touched_inputs_do_not_cause_rebuild(self):
+        a_src, b_src = self._file("a.src", "a"), self._file("b.src", "b")
+        self._build(*self._tasks(a_src, b_src))
+        self._touch(a_src)
+        self._touch(b_src)
+
+        a, b = self._tasks(a_src, b_src)
+        self._build(a, b)
+
+        self.assertEqual((a.builds, b.builds), (0, 0))
+        self.assertEqual(a.getBuildState(), (False, "content unchanged"))
+
+    def test_changed_input_rebuilds_and_cascades(self):
+        a_src, b_src = self._file("a.src", "a"), self._file("b.src", "b")
+        self._build(*self._tasks(a_src, b_src))
+        self._file("a.src", "a2")
+
+        a, b = self._tasks(a_src, b_src)
+        self._build(a, b)
+
+        self.assertEqual((a.builds, b.builds), (1, 1))
+
+    def test_identical_output_stops_cascade(self):
+        a_src, b_src = self._file("a.src", "a"), self._file("b.src", "b")
+        self._build(*self._tasks(a_src, b_src))
+        os.remove(os.path.join(self.root, "a.out"))
+
+        a, b = self._tasks(a_src, b_src)
+        self._build(a, b)
+
+        self.assertEqual((a.builds, b.builds), (1, 0))
+        self.assertFalse(a.built)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+import importlib
+import pathlib
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+mx = importlib.import_module("mx._impl.mx")
+
+
+class _Dist:
+    def __init__(self, name, *deps):
+        self.name = name
+        self.deps = list(deps)
+        self.buildDependencies = []
+        self.optionalDependencies = []
+
+    def isDistribution(self):
+        return True
+
+    def __repr__(self):
+        return self.name
+
+
+class DependencyGraphIndexTest(unittest.TestCase):
+    def test_queries_are_memoized_once_frozen(self):
+        index = mx._DependencyGraphIndex()
+        calls = []
+
+        def _compute():
+            calls.append(1)
+            return ["a", "b"]
+
+        self.assertEqual(["a", "b"], index.get("k", _compute))
+        self.assertEqual(["a", "b"], index.get("k", _compute))
+        self.assertEqual(2, len(calls))
+
+        index.freeze()
+        result = index.get("k", _compute)
+        result.append("c")
+        self.assertEqual(["a", "b"], index.get("k", _compute))
+        self.assertEqual(3, len(calls))
+
+        index.invalidate()
+        index.get("k", _compute)
+        self.assertEqual(4, len(calls))
+
+    def test_sorted_dists_is_invalidated_by_remove_dependency(self):
+        a = _Dist("A")
+        b = _Dist("B", a)
+        c = _Dist("C", b, a)
+        index = mx._DependencyGraphIndex()
+        index.freeze()
+        with mock.patch.object(mx, "_dependency_graph_index", index), mock.patch.dict(mx._dists, {"C": c, "B": b, "A": a}, clear=True):
+            self.assertEqual([a, b, c], mx.sorted_dists())
+            mx._dists.pop("A")
+            # the graph was not changed through removeDependency, so the memoized order is used
+            self.assertEqual([a, b, c], mx.sorted_dists())
+            mx.Distribution.removeDependency(c, a)
+            mx.Distribution.removeDependency(b, a)
+            self.assertEqual([b, c], mx.sorted_dists())
+
+    def test_thawed_index_does_not_memoize(self):
+        index = mx._DependencyGraphIndex()
+        index.freeze()
+        index.get("k", lambda: ["a"])
+        self.assertTrue(index.thaw())
+        self.assertEqual(["b"], index.get("k", lambda: ["b"]))
+        self.assertEqual(["c"], index.get("k", lambda: ["c"]))
+        self.assertFalse(index.thaw())
+        index.freeze()
+        self.assertEqual(["d"], index.get("k", lambda: ["d"]))
+
+    def test_registering_suite_metadata_invalidates(self):
+        index = mx._DependencyGraphIndex()
+        index.freeze()
+        index.get("k", lambda: ["a"])
+        suite = mock.Mock(libs=[], jreLibs=[], jdkLibs=[], dists=[], distTemplates=[], licenseDefs=[], repositoryDefs=[])
+        with mock.patch.object(mx, "_dependency_graph_index", index):
+            mx.Suite._register_metadata(suite)
+        self.assertEqual(["b"], index.get("k", lambda: ["b"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+import hashlib
+import importlib
+import os
+import pathlib
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+mx = importlib.import_module("mx._impl.mx")
+index_module = importlib.import_module("mx._impl.mx_digest_index")
+DigestIndex = index_module.DigestIndex
+
+
+class DigestIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "dotmx", "digest-index.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        tmp = path + ".new"
+        with open(tmp, "wb") as fp:
+            fp.write(content)
+        # Like downloads, replace files by renaming
+        os.replace(tmp, path)
+        return path
+
+    def test_round_trip(self):
+        lib = self._write("lib.jar", b"content")
+        index = DigestIndex(self.path)
+        self.assertIsNone(index.get(lib, "sha512"))
+        index.put(lib, "sha512", "abc")
+        index.put(lib, "sha1", "def")
+        self.assertEqual("abc", index.get(lib, "sha512"))
+        index.save()
+        reloaded = DigestIndex(self.path)
+        self.assertEqual("abc", reloaded.get(lib, "sha512"))
+        self.assertEqual("def", reloaded.get(lib, "sha1"))
+
+    def test_replaced_file_is_not_trusted(self):
+        lib = self._write("lib.jar", b"content")
+        index = DigestIndex(self.path)
+        index.put(lib, "sha512", "abc")
+        self._write("lib.jar", b"content")
+        self.assertIsNone(index.get(lib, "sha512"))
+
+    def test_symlink_follows_target(self):
+        lib = self._write("lib.jar", b"content")
+        link = os.path.join(self.tmp.name, "link.jar")
+        os.symlink(lib, link)
+        index = DigestIndex(self.path)
+        index.put(link, "sha512", "abc")
+        self.assertEqual("abc", index.get(link, "sha512"))
+        self._write("lib.jar", b"other")
+        self.assertIsNone(index.get(link, "sha512"))
+
+    def test_concurrent_saves_are_merged(self):
+        first_lib = self._write("first.jar", b"first")
+        second_lib = self._write("second.jar", b"second")
+        gone = self._write("gone.jar", b"gone")
+        first = DigestIndex(self.path)
+        second = DigestIndex(self.path)
+        first.put(first_lib, "sha512", "1")
+        first.put(gone, "sha512", "3")
+        first.save()
+        os.remove(gone)
+        second.put(second_lib, "sha512", "2")
+        second.save()
+        reloaded = DigestIndex(self.path)
+        self.assertEqual("1", reloaded.get(first_lib, "sha512"))
+        self.assertEqual("2", reloaded.get(second_lib, "sha512"))
+        self.assertNotIn(os.path.abspath(gone), reloaded._entries)
+
+    def test_corrupt_index_is_ignored(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as fp:
+            fp.write("{not json")
+        lib = self._write("lib.jar", b"content")
+        index = DigestIndex(self.path)
+        self.assertIsNone(index.get(lib, "sha512"))
+        index.put(lib, "sha512", "abc")
+        index.save()
+        self.assertEqual("abc", DigestIndex(self.path).get(lib, "sha512"))
+
+    def test_check_file_with_digest_uses_index(self):
+        lib = self._write("lib.jar", b"content")
+        digest = mx.Digest("sha256", hashlib.sha256(b"content").hexdigest())
+        index = DigestIndex(self.path)
+        with mock.patch.object(mx, "_digest_index", return_value=index):
+            self.assertTrue(mx._check_file_with_digest(lib, digest))
+            self.assertEqual(digest.value, index.get(lib, "sha256"))
+            os.remove(lib + ".sha256")
+            with mock.patch.object(mx, "digest_of_file", side_effect=AssertionError("digest recomputed")):
+                self.assertTrue(mx._check_file_with_digest(lib, digest, newFile=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
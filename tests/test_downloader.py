@@ -0,0 +1,262 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+import hashlib
+import importlib
+import os
+import pathlib
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+mx = importlib.import_module("mx._impl.mx")
+download_module = importlib.import_module("mx._impl.mx_download")
+Downloader = download_module.Downloader
+DownloadError = download_module.DownloadError
+DownloadProgress = download_module.DownloadProgress
+
+
+class _Server(ThreadingHTTPServer):
+    """A local stand-in for a download server that supports keep-alive and range requests."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.files = {}
+        self.etags = {}
+        self.redirects = {}
+        self.truncate = {}
+        self.requests = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    def url(self, name):
+        return f"http://127.0.0.1:{self.server_address[1]}/{name}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def do_GET(self):
+        server = self.server
+        name = self.path.lstrip("/")
+        with server.lock:
+            server.requests.append((name, self.headers.get("Range"), self.headers.get("If-Range")))
+        if name in server.redirects:
+            self.send_response(302)
+            self.send_header("Location", "/" + server.redirects[name])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if name not in server.files:
+            self.send_error(503 if name == "unavailable" else 404)
+            return
+        content = server.files[name]
+        etag = server.etags.get(name)
+        start, end = 0, len(content)
+        rangeHeader = self.headers.get("Range")
+        if rangeHeader and etag and self.headers.get("If-Range") in (None, etag):
+            first, last = rangeHeader[len("bytes="):].split("-")
+            start, end = int(first), int(last) + 1 if last else len(content)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end - 1}/{len(content)}")
+        else:
+            self.send_response(200)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start))
+        self.end_headers()
+        cut = server.truncate.pop(name, None)
+        if cut is not None:
+            self.wfile.write(content[start:cut])
+            self.close_connection = True
+            return
+        self.wfile.write(content[start:end])
+
+
+class DownloaderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = _Server()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.downloader = Downloader(workers=2, segments=1)
+        # Do not send requests for the local server to a proxy configured in the environment
+        patcher = mock.patch.object(download_module, "_is_proxied", return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.downloader.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def _read(self, path):
+        with open(path, "rb") as fp:
+            return fp.read()
+
+    def test_connections_are_reused(self):
+        for i in range(3):
+            self.server.files[f"lib{i}.jar"] = bytes([i]) * 1000
+        for i in range(3):
+            self.downloader.fetch(self.server.url(f"lib{i}.jar"), self._path(f"lib{i}.jar"))
+            self.assertEqual(bytes([i]) * 1000, self._read(self._path(f"lib{i}.jar")))
+        self.assertEqual(1, self.server.connections)
+
+    def test_redirect(self):
+        self.server.files["real.jar"] = b"content"
+        self.server.redirects["alias.jar"] = "real.jar"
+        self.downloader.fetch(self.server.url("alias.jar"), self._path("lib.jar"))
+        self.assertEqual(b"content", self._read(self._path("lib.jar")))
+
+    def test_http_errors(self):
+        with self.assertRaises(DownloadError) as cm:
+            self.downloader.fetch(self.server.url("missing.jar"), self._path("lib.jar"), partial=self._path("lib.jar.tmp"))
+        self.assertFalse(cm.exception.retry)
+        self.assertFalse(os.path.exists(self._path("lib.jar.tmp")))
+        with self.assertRaises(DownloadError) as cm:
+            self.downloader.fetch(self.server.url("unavailable"), self._path("lib.jar"))
+        self.assertTrue(cm.exception.retry)
+
+    def test_resume(self):
+        content = os.urandom(100000)
+        self.server.files["lib.jar"] = content
+        self.server.etags["lib.jar"] = '"v1"'
+        self.server.truncate["lib.jar"] = 30000
+        path, partial = self._path("lib.jar"), self._path("lib.jar.tmp")
+        with self.assertRaises(DownloadError) as cm:
+            self.downloader.fetch(self.server.url("lib.jar"), path, partial=partial)
+        self.assertTrue(cm.exception.retry)
+        self.assertEqual(30000, os.path.getsize(partial))
+
+        digest = self.downloader.fetch(self.server.url("lib.jar"), path, partial=partial, digestName="sha256")
+        self.assertEqual(content, self._read(path))
+        self.assertEqual(hashlib.sha256(content).hexdigest(), digest)
+        self.assertEqual(("lib.jar", "bytes=30000-", '"v1"'), self.server.requests[-1])
+        self.assertFalse(os.path.exists(partial))
+        self.assertFalse(os.path.exists(partial + ".json"))
+
+    def test_resume_of_changed_content_restarts(self):
+        self.server.files["lib.jar"] = b"a" * 1000
+        self.server.etags["lib.jar"] = '"v1"'
+        self.server.truncate["lib.jar"] = 300
+        path, partial = self._path("lib.jar"), self._path("lib.jar.tmp")
+        with self.assertRaises(DownloadError):
+            self.downloader.fetch(self.server.url("lib.jar"), path, partial=partial)
+        self.server.files["lib.jar"] = b"b" * 1000
+        self.server.etags["lib.jar"] = '"v2"'
+        self.downloader.fetch(self.server.url("lib.jar"), path, partial=partial)
+        self.assertEqual(b"b" * 1000, self._read(path))
+
+    def test_segments(self):
+        content = os.urandom(100000)
+        self.server.files["jdk.tar.gz"] = content
+        self.server.etags["jdk.tar.gz"] = '"jdk"'
+        downloader = Downloader(segments=4, segmentThreshold=50000)
+        self.addCleanup(downloader.close)
+        reports = []
+        progress = DownloadProgress(lambda *args: reports.append(args), interval=0)
+        digest = downloader.fetch(self.server.url("jdk.tar.gz"), self._path("jdk.tar.gz"), partial=self._path("jdk.tar.gz.tmp"), progress=progress, digestName="sha1")
+        self.assertEqual(content, self._read(self._path("jdk.tar.gz")))
+        # Segments are not received in order
+        self.assertIsNone(digest)
+        ranges = sorted(r for _, r, _ in self.server.requests if r)
+        self.assertEqual(["bytes=25000-49999", "bytes=50000-74999", "bytes=75000-99999"], ranges)
+        self.assertEqual((100000, 100000, 0), reports[-1])
+
+    def test_streamed_digest(self):
+        content = os.urandom(3 * Downloader.chunkSize // 2)
+        self.server.files["lib.jar"] = content
+        digest = self.downloader.fetch(self.server.url("lib.jar"), self._path("lib.jar"), digestName="sha512")
+        self.assertEqual(hashlib.sha512(content).hexdigest(), digest)
+        self.assertEqual(digest, mx.digest_of_file(self._path("lib.jar"), "sha512"))
+
+    def test_recorded_digest_is_not_recomputed(self):
+        path = self._path("lib.jar")
+        with open(path, "wb") as fp:
+            fp.write(b"content")
+        value = hashlib.sha256(b"content").hexdigest()
+        with mock.patch.object(mx, "_digest_index", return_value=None):
+            mx._write_digest_file(path, "sha256", value)
+            with mock.patch.object(mx, "digest_of_file", side_effect=AssertionError("digest recomputed")):
+                self.assertTrue(mx._check_file_with_digest(path, mx.Digest("sha256", value), newFile=True))
+
+    def test_progress_is_aggregated(self):
+        reports = []
+        progress = DownloadProgress(lambda *args: reports.append(args), interval=0)
+        first = progress.begin(100)
+        second = progress.begin(50, bytesRead=10)
+        progress.update(first, 40)
+        self.assertEqual((50, 150, 2), reports[-1])
+        progress.end(first)
+        self.assertEqual((50, 150, 1), reports[-1])
+        third = progress.begin(-1)
+        progress.update(third, 5)
+        self.assertEqual((15, -1, 2), reports[-1])
+        progress.end(second)
+        progress.end(third)
+        self.assertEqual(0, reports[-1][2])
+
+    def test_map_is_bounded(self):
+        active = [0]
+        peak = [0]
+        lock = threading.Lock()
+        barrier = threading.Event()
+
+        def work(i):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            barrier.wait(0.05)
+            with lock:
+                active[0] -= 1
+            return i * 2
+
+        self.assertEqual([0, 2, 4, 6, 8], self.downloader.map(work, range(5)))
+        self.assertLessEqual(peak[0], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
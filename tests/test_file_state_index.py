@@ -0,0 +1,130 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+import importlib
+import os
+import pathlib
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+fileindex_module = importlib.import_module("mx._impl.build.fileindex")
+
+
+class FileStateIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.src = os.path.join(self.root, "src")
+        self.out = os.path.join(self.root, "bin")
+        os.makedirs(os.path.join(self.src, "pkg"))
+        os.makedirs(os.path.join(self.out, "pkg"))
+        self.source = self._write(os.path.join(self.src, "pkg", "A.java"), "class A {}")
+        self.output = self._write(os.path.join(self.out, "pkg", "A.class"), "")
+        self.index_path = os.path.join(self.root, "index", "p.json")
+        patcher = mock.patch.object(fileindex_module, "RACY_WINDOW_NS", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @staticmethod
+    def _write(path, contents):
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(contents)
+        return path
+
+    def _index(self):
+        return fileindex_module.FileStateIndex(self.index_path)
+
+    def _record(self):
+        index = self._index()
+        index.record_state([self.source], [self.output], os.path.getmtime(self.output), self.output)
+        index.save()
+
+    def test_walk_matches_os_walk(self):
+        index = self._index()
+        self.assertEqual(
+            sorted((d, sorted(f)) for d, f in index.walk(self.src)),
+            sorted((d, sorted(f)) for d, _, f in os.walk(self.src, followlinks=True)),
+        )
+        index.save()
+        cached = self._index()
+        self.assertEqual([f for _, f in cached.walk(self.src)], [f for _, f in index.walk(self.src)])
+
+    def test_walk_notices_new_files(self):
+        index = self._index()
+        list(index.walk(self.src))
+        index.save()
+        b = self._write(os.path.join(self.src, "pkg", "B.java"), "class B {}")
+        os.utime(os.path.join(self.src, "pkg"), ns=(0, os.stat(b).st_mtime_ns + 10**9))
+
+        files = {os.path.join(d, f) for d, names in self._index().walk(self.src) for f in names}
+        self.assertIn(b, files)
+
+    def test_unchanged_state_survives_reload(self):
+        self._record()
+        state = self._index().unchanged_state([self.source])
+        self.assertIsNotNone(state)
+        self.assertEqual(state.newestOutput, self.output)
+
+    def test_modified_input_invalidates_state(self):
+        self._record()
+        st = os.stat(self.source)
+        os.utime(self.source, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertIsNone(self._index().unchanged_state([self.source]))
+
+    def test_added_input_invalidates_state(self):
+        self._record()
+        b = self._write(os.path.join(self.src, "pkg", "B.java"), "class B {}")
+        self.assertIsNone(self._index().unchanged_state([self.source, b]))
+
+    def test_deleted_output_invalidates_state(self):
+        self._record()
+        os.remove(self.output)
+        os.utime(os.path.join(self.out, "pkg"), ns=(0, 1))
+        self.assertIsNone(self._index().unchanged_state([self.source]))
+
+    def test_racy_inputs_are_not_recorded(self):
+        index = fileindex_module.FileStateIndex(self.index_path)
+        with mock.patch.object(fileindex_module, "RACY_WINDOW_NS", 2 * 1000 * 1000 * 1000):
+            index.record_state([self.source], [self.output], None, None)
+            self.assertIsNone(index.unchanged_state([self.source]))
+
+    def test_is_racy(self):
+        with mock.patch.object(fileindex_module, "RACY_WINDOW_NS", 10):
+            self.assertTrue(fileindex_module.is_racy(100, 105))
+            self.assertFalse(fileindex_module.is_racy(100, 110))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+
+import importlib
+import os
+import pathlib
+import struct
+import sys
+import tempfile
+import unittest
+from argparse import Namespace
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+importlib.import_module("mx._impl.mx")
+classfile = importlib.import_module("mx._impl.build.classfile")
+tasks_module = importlib.import_module("mx._impl.build.tasks")
+
+PUBLIC = 0x0001
+PRIVATE = 0x0002
+STATIC_FINAL = 0x0018
+
+
+class ClassFileBuilder:
+    """Creates class files with fields, methods and annotations for testing."""
+
+    def __init__(self, name, access=PUBLIC | 0x0020):
+        self.pool = []
+        self.indexes = {}
+        self.name = name
+        self.access = access
+        self.fields = []
+        self.methods = []
+        self.attributes = []
+
+    def _add(self, key, entry, slots=1):
+        if key not in self.indexes:
+            self.pool.append(entry)
+            self.indexes[key] = len(self.pool)
+            for _ in range(slots - 1):
+                self.pool.append(b'')
+        return self.indexes[key]
+
+    def utf8(self, s):
+        data = s.encode()
+        return self._add(('utf8', s), struct.pack('>BH', 1, len(data)) + data)
+
+    def clazz(self, s):
+        return self._add(('class', s), struct.pack('>BH', 7, self.utf8(s)))
+
+    def integer(self, v):
+        return self._add(('int', v), struct.pack('>Bi', 3, v))
+
+    def attribute(self, name, data):
+        return struct.pack('>HI', self.utf8(name), len(data)) + data
+
+    def annotation(self, typeName, intValue):
+        return struct.pack('>HHHHBH', 1, self.utf8(typeName), 1, self.utf8('value'), ord('I'), self.integer(intValue))
+
+    def field(self, access, name, desc, constant=None):
+        attributes = []
+        if constant is not None:
+            attributes.append(self.attribute('ConstantValue', struct.pack('>H', self.integer(constant))))
+        self.fields.append((access, name, desc, attributes))
+        return self
+
+    def method(self, access, name, desc, code=b'\xb1', annotation=None):
+        # Reference some constants from the body to shift the constant pool layout
+        attributes = [self.attribute('Code', struct.pack('>HHI', 1, 1, len(code)) + code + struct.pack('>HH', 0, 0))]
+        if annotation is not None:
+            attributes.append(self.attribute('RuntimeVisibleAnnotations', self.annotation(*annotation)))
+        self.methods.append((access, name, desc, attributes))
+        return self
+
+    def inner(self, innerName, outerName, simpleName, access):
+        data = struct.pack('>HHHHH', 1, self.clazz(innerName), self.clazz(outerName) if outerName else 0,
+                           self.utf8(simpleName) if simpleName else 0, access)
+        self.attributes.append(self.attribute('InnerClasses', data))
+        return self
+
+    def build(self):
+        thisClass = self.clazz(self.name)
+        superClass = self.clazz('java/lang/Object')
+
+        def members(entries):
+            out = struct.pack('>H', len(entries))
+            for access, name, desc, attributes in entries:
+                out += struct.pack('>HHHH', access, self.utf8(name), self.utf8(desc), len(attributes)) + b''.join(attributes)
+            return out
+        fields = members(self.fields)
+        methods = members(self.methods)
+        attributes = self.attributes + [self.attribute('SourceFile', struct.pack('>H', self.utf8(self.name.split('/')[-1].split('$')[0] + '.java')))]
+        body = struct.pack('>HHHH', self.access, thisClass, superClass, 0) + fields + methods
+        body += struct.pack('>H', len(attributes)) + b''.join(attributes)
+        return b'\xca\xfe\xba\xbe' + struct.pack('>HHH', 0, 61, len(self.pool) + 1) + b''.join(self.pool) + body
+
+
+def abi(builder):
+    return classfile.parse_class_file(builder.build()).abi
+
+
+class ClassFileAbiTest(unittest.TestCase):
+    def base(self):
+        return ClassFileBuilder('p/A').field(PUBLIC, 'f', 'I').method(PUBLIC, 'm', '()V')
+
+    def test_private_changes_do_not_affect_abi(self):
+        reference = abi(self.base())
+        changed = ClassFileBuilder('p/A')
+        changed.utf8('a string constant used by a method body')
+        changed.method(PRIVATE, 'helper', '()I').method(PUBLIC, 'm', '()V', code=b'\x00\xb1').field(PUBLIC, 'f', 'I')
+        changed.field(PRIVATE, 'cache', 'Ljava/lang/Object;')
+        self.assertEqual(reference, abi(changed))
+
+    def test_public_changes_affect_abi(self):
+        reference = abi(self.base())
+        self.assertNotEqual(reference, abi(self.base().method(PUBLIC, 'n', '()V')))
+        self.assertNotEqual(reference, abi(ClassFileBuilder('p/A').field(PUBLIC, 'f', 'J').method(PUBLIC, 'm', '()V')))
+        self.assertNotEqual(reference, abi(ClassFileBuilder('p/A', access=0x0020).field(PUBLIC, 'f', 'I').method(PUBLIC, 'm', '()V')))
+
+    def test_constants_and_annotations_affect_abi(self):
+        self.assertNotEqual(abi(self.base().field(STATIC_FINAL | PUBLIC, 'C', 'I', constant=1)),
+                            abi(self.base().field(STATIC_FINAL | PUBLIC, 'C', 'I', constant=2)))
+        self.assertNotEqual(abi(self.base().method(PUBLIC, 'n', '()V', annotation=('Lp/Ann;', 1))),
+                            abi(self.base().method(PUBLIC, 'n', '()V', annotation=('Lp/Ann;', 2))))
+
+    def test_invisible_classes(self):
+        self.assertIsNone(abi(ClassFileBuilder('p/A$1', access=0x0020).inner('p/A$1', None, None, 0)))
+        self.assertIsNone(abi(ClassFileBuilder('p/A$P', access=0x0020).inner('p/A$P', 'p/A', 'P', PRIVATE)))
+        self.assertIsNotNone(abi(ClassFileBuilder('p/A$Q', access=0x0020).inner('p/A$Q', 'p/A', 'Q', PUBLIC)))
+
+    def test_directory_fingerprint(self):
+        with tempfile.TemporaryDirectory() as d:
+            os.makedirs(os.path.join(d, 'p'))
+
+            def write(name, builder):
+                with open(os.path.join(d, 'p', name), 'wb') as fp:
+                    fp.write(builder.build())
+            write('A.class', self.base())
+            write('A$1.class', ClassFileBuilder('p/A$1', access=0x0020).inner('p/A$1', None, None, 0))
+            reference = classfile.abi_fingerprint(d)
+            write('A$1.class', ClassFileBuilder('p/A$1', access=0x0020).inner('p/A$1', None, None, 0).method(0, 'run', '()V'))
+            self.assertEqual(reference, classfile.abi_fingerprint(d))
+            write('B.class', ClassFileBuilder('p/B'))
+            self.assertNotEqual(reference, classfile.abi_fingerprint(d))
+
+
+class FakeSuite:
+    def __init__(self, mx_output_dir):
+        self.mx_output_dir = mx_output_dir
+
+    def get_mx_output_dir(self):
+        return self.mx_output_dir
+
+    def getMxCompatibility(self):
+        return Namespace(newestInputIsTimeStampFile=lambda: True)
+
+
+class FakeSubject:
+    def __init__(self, name, suite):
+        self.name = name
+        self.suite = suite
+
+    def _extra_artifact_discriminant(self):
+        return ""
+
+    def isNativeProject(self):
+        return False
+
+    def __str__(self):
+        return self.name
+
+
+class AbiTask(tasks_module.BuildTask):
+    """A task that is stale if its dependencies have newer outputs and whose ABI is given by `abi`."""
+
+    def __init__(self, name, suite, abi=None, stale=False):
+        super().__init__(FakeSubject(name, suite), Namespace(clean=False, force=False, only=None, shallow_dependency_checks=None,
+                                                             build_logs="silent", print_timing=False), 1)
+        self.abi = abi
+        self.stale = stale
+        self.builds = 0
+
+    def __str__(self):
+        return f"Building {self.name}"
+
+    def abiFingerprint(self):
+        return self.abi
+
+    def usesDependencyAbi(self):
+        return True
+
+    def needsBuild(self, newestInput):
+        if self.stale:
+            return True, "stale"
+        if newestInput is not None:
+            return True, f"{newestInput} is newer"
+        return False, None
+
+    def newestOutput(self):
+        return Namespace(timestamp=1, isNewerThan=lambda other: True) if self.built else None
+
+    def build(self):
+        self.builds += 1
+
+    def clean(self, forBuild=False):
+        pass
+
+
+class AbiCutoffTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.suite = FakeSuite(self.tmp.name)
+
+    def tasks(self, abi, stale):
+        a = AbiTask('A', self.suite, abi=abi, stale=stale)
+        b = AbiTask('B', self.suite)
+        b.deps.append(a)
+        return a, b
+
+    def run_build(self, abi, stale=True):
+        a, b = self.tasks(abi, stale)
+        a.execute()
+        b.execute()
+        return a.builds, b.builds
+
+    def test_unchanged_abi_stops_rebuild(self):
+        self.run_build('v1')
+        self.assertEqual(self.run_build('v1'), (1, 0))
+        self.assertEqual(self.run_build('v2'), (1, 1))
+        self.assertEqual(self.run_build('v2', stale=False), (0, 0))
+
+    def test_unknown_abi(self):
+        self.run_build('v1')
+        self.assertEqual(self.run_build(None), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
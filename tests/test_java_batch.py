@@ -0,0 +1,195 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+
+import importlib
+import os
+import pathlib
+import struct
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+importlib.import_module("mx._impl.mx")
+batch = importlib.import_module("mx._impl.build.batch")
+classfile = importlib.import_module("mx._impl.build.classfile")
+
+
+def make_class_file(name, sourceFile=None):
+    """Creates a minimal class file for `name` with an optional SourceFile attribute."""
+    pool = []
+
+    def utf8(s):
+        data = s.encode()
+        pool.append(struct.pack('>BH', 1, len(data)) + data)
+        return len(pool)
+
+    def clazz(s):
+        index = utf8(s)
+        pool.append(struct.pack('>BH', 7, index))
+        return len(pool)
+
+    thisClass = clazz(name)
+    superClass = clazz('java/lang/Object')
+    pool.append(struct.pack('>Bq', 5, 42))
+    pool.append(b'')  # Long constants take up two entries
+    attributes = b''
+    attributeCount = 0
+    if sourceFile:
+        attributes = struct.pack('>HIH', utf8('SourceFile'), 2, utf8(sourceFile))
+        attributeCount = 1
+    header = b'\xca\xfe\xba\xbe' + struct.pack('>HHH', 0, 61, len(pool) + 1)
+    body = struct.pack('>HHHHHHH', 0x21, thisClass, superClass, 0, 0, 0, attributeCount)
+    return header + b''.join(pool) + body + attributes
+
+
+class FakeTask:
+    def __init__(self, name, deps=None, key='javac', size=1):
+        self.name = name
+        self.deps = deps or []
+        self.key = key
+        self.size = size
+
+    def __repr__(self):
+        return self.name
+
+
+def plan(tasks):
+    return batch.plan_batches(tasks, lambda t: t.key, lambda t: t.size)
+
+
+class ClassFileTest(unittest.TestCase):
+    def test_parse(self):
+        cf = classfile.parse_class_file(make_class_file('p/q/A$Inner', 'A.java'))
+        self.assertEqual(cf.name, 'p/q/A$Inner')
+        self.assertEqual(cf.sourceFile, 'A.java')
+        self.assertIsNone(classfile.parse_class_file(make_class_file('B')).sourceFile)
+
+    def test_malformed(self):
+        with self.assertRaises(classfile.ClassFormatError):
+            classfile.parse_class_file(b'not a class file')
+        with self.assertRaises(classfile.ClassFormatError):
+            classfile.parse_class_file(make_class_file('A', 'A.java')[:-3])
+
+
+class PlanBatchesTest(unittest.TestCase):
+    def test_only_independent_tasks_are_batched(self):
+        a = FakeTask('a')
+        b = FakeTask('b')
+        c = FakeTask('c', deps=[a])
+        d = FakeTask('d', deps=[b])
+        e = FakeTask('e', deps=[c])
+        self.assertEqual(plan([a, b, c, d, e]), [[a, b], [c, d]])
+
+    def test_keys_and_sizes(self):
+        a = FakeTask('a', key=None)
+        b = FakeTask('b', key='ecj')
+        c = FakeTask('c')
+        d = FakeTask('d', size=batch.maxSourcesPerProject + 1)
+        e = FakeTask('e', size=0)
+        f = FakeTask('f', key='ecj')
+        self.assertEqual(plan([a, b, c, d, e, f]), [[b, f]])
+
+    def test_batch_limits(self):
+        tasks = [FakeTask(str(i), size=batch.maxSourcesPerProject) for i in range(10)]
+        perBatch = batch.maxSourcesPerBatch // batch.maxSourcesPerProject
+        batches = plan(tasks)
+        self.assertEqual([len(b) for b in batches], [perBatch, len(tasks) - perBatch])
+
+    def test_schedule_order(self):
+        a = FakeTask('a')
+        b = FakeTask('b')
+        c = FakeTask('c', deps=[a])
+        x = FakeTask('x', deps=[b])
+        batchTask = FakeTask('batch', deps=[])
+        aliases = {a: batchTask, b: batchTask}
+        order = batch.schedule_order([a, c, b, x], aliases)
+        self.assertEqual(order, [batchTask, c, x])
+
+
+class MergeCompileArgsTest(unittest.TestCase):
+    def test_merge(self):
+        sep = os.pathsep
+        a = ['-g', '-d', 'a/bin', '-classpath', sep.join(['x.jar', 'y.jar']), '-proc:none', '@a/files']
+        b = ['-g', '-d', 'b/bin', '-classpath', sep.join(['x.jar', 'y.jar']), '-proc:none', '@b/files']
+        self.assertEqual(batch.merge_compile_args([a, b], 'out', 'files'),
+                         ['-d', 'out', '-classpath', sep.join(['x.jar', 'y.jar']), '-g', '-proc:none', '@files'])
+
+    def test_different_class_paths_are_not_merged(self):
+        sep = os.pathsep
+        a = ['-g', '-d', 'a/bin', '-classpath', sep.join(['x.jar', 'y.jar']), '@a/files']
+        b = ['-g', '-d', 'b/bin', '-classpath', sep.join(['y.jar', 'z.jar']), '@b/files']
+        self.assertIsNone(batch.merge_compile_args([a, b], 'out', 'files'))
+        # The output directories of the projects themselves do not matter
+        a = ['-g', '-d', 'a/bin', '-classpath', sep.join(['a/bin', 'x.jar']), '@a/files']
+        b = ['-g', '-d', 'b/bin', '-classpath', sep.join(['b/bin', 'x.jar']), '@b/files']
+        self.assertEqual(batch.merge_compile_args([a, b], 'out', 'files'), ['-d', 'out', '-classpath', 'x.jar', '-g', '@files'])
+
+    def test_boot_class_path(self):
+        a = ['-g', '-d', 'a/bin', '-Xbootclasspath/p:x.jar', '@a/files']
+        b = ['-g', '-d', 'b/bin', '-Xbootclasspath/p:x.jar', '@b/files']
+        self.assertEqual(batch.merge_compile_args([a, b], 'out', 'files'),
+                         ['-d', 'out', '-Xbootclasspath/p:x.jar', '-g', '@files'])
+        a = ['-g', '-d', 'a/bin', '-classpath', 'y.jar', '-Xbootclasspath/p:x.jar', '@a/files']
+        b = ['-g', '-d', 'b/bin', '-classpath', 'y.jar', '-Xbootclasspath/p:x.jar', '@b/files']
+        self.assertIsNone(batch.merge_compile_args([a, b], 'out', 'files'))
+
+    def test_incompatible(self):
+        a = ['-g', '-d', 'a/bin', '-classpath', 'x.jar', '--add-exports=java.base/jdk.internal.misc=ALL-UNNAMED', '@a/files']
+        b = ['-g', '-d', 'b/bin', '-classpath', 'x.jar', '@b/files']
+        self.assertIsNone(batch.merge_compile_args([a, b], 'out', 'files'))
+        self.assertIsNone(batch.merge_compile_args([['-g', '-d', 'a/bin', '@a/files']], 'out', 'files'))
+
+
+class SplitClassesTest(unittest.TestCase):
+    def test_split(self):
+        with tempfile.TemporaryDirectory() as stage:
+            def write(rel, data):
+                path = os.path.join(stage, rel)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as fp:
+                    fp.write(data)
+            write('p/A.class', make_class_file('p/A', 'A.java'))
+            write('p/A$1.class', make_class_file('p/A$1', 'A.java'))
+            write('p/Helper.class', make_class_file('p/Helper', 'A.java'))
+            write('q/B.class', make_class_file('q/B', 'B.java'))
+            write('q/B$Inner.class', make_class_file('q/B$Inner'))
+            owners = {('p', 'A.java'): 'projectA', ('q', 'B.java'): 'projectB'}
+            result = batch.split_classes(stage, owners)
+            self.assertEqual(sorted(result['projectA']), ['p/A$1.class', 'p/A.class', 'p/Helper.class'])
+            self.assertEqual(sorted(result['projectB']), ['q/B$Inner.class', 'q/B.class'])
+
+            write('r/C.class', make_class_file('r/C', 'C.java'))
+            with self.assertRaises(ValueError):
+                batch.split_classes(stage, owners)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+
+import importlib
+import os
+import pathlib
+import struct
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+importlib.import_module("mx._impl.mx")
+classfile = importlib.import_module("mx._impl.build.classfile")
+incremental = importlib.import_module("mx._impl.build.incremental")
+
+
+def make_class_file(name, sourceFile, superName='java/lang/Object', interfaces=(), references=(), descriptors=(), constant=False):
+    """Creates a class file declaring `name` that refers to the given classes."""
+    pool = []
+
+    def utf8(s):
+        data = s.encode()
+        pool.append(struct.pack('>BH', 1, len(data)) + data)
+        return len(pool)
+
+    def clazz(s):
+        index = utf8(s)
+        pool.append(struct.pack('>BH', 7, index))
+        return len(pool)
+
+    thisClass = clazz(name)
+    superClass = clazz(superName)
+    interfaceIndexes = [clazz(i) for i in interfaces]
+    for r in references:
+        clazz(r)
+    for d in descriptors:
+        utf8(d)
+    fields = struct.pack('>H', 0)
+    if constant:
+        fields = struct.pack('>HHHHHHIH', 1, 0x0019, utf8('VALUE'), utf8('I'), 1, utf8('ConstantValue'), 2, 1)
+    attributes = struct.pack('>HHIH', 1, utf8('SourceFile'), 2, utf8(sourceFile))
+    header = b'\xca\xfe\xba\xbe' + struct.pack('>HHH', 0, 61, len(pool) + 1)
+    body = struct.pack('>HHHH', 0x21, thisClass, superClass, len(interfaceIndexes))
+    body += b''.join(struct.pack('>H', i) for i in interfaceIndexes)
+    return header + b''.join(pool) + body + fields + struct.pack('>H', 0) + attributes
+
+
+class ClassFileTest(unittest.TestCase):
+    def test_dependencies(self):
+        data = make_class_file('p/B', 'B.java', superName='p/A', interfaces=['p/I'], references=['[Lp/C;'],
+                               descriptors=['(Lp/D;Ljava/util/List<Lp/E;>;)V'], constant=True)
+        cf = classfile.parse_class_file(data)
+        self.assertEqual(cf.supertypes, ('p/A', 'p/I'))
+        self.assertTrue({'p/A', 'p/I', 'p/C', 'p/D', 'p/E', 'java/util/List'}.issubset(cf.references))
+        self.assertNotIn('p/B', cf.references)
+        self.assertTrue(cf.hasConstants)
+        self.assertFalse(classfile.parse_class_file(make_class_file('p/A', 'A.java')).hasConstants)
+
+
+class JavaDependencyGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.src = os.path.join(self.tmp.name, 'src')
+        self.out = os.path.join(self.tmp.name, 'bin')
+        self.javafiles = {}
+        self.past = time.time() - 60
+
+    def source(self, name, content='class'):
+        path = os.path.join(self.src, 'p', name + '.java')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as fp:
+            fp.write(content)
+        os.utime(path, (self.past, self.past))
+        self.javafiles[path] = os.path.join(self.out, 'p', name + '.class')
+        return path
+
+    def compile(self, name, **kwargs):
+        path = os.path.join(self.out, 'p', name + '.class')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fp:
+            fp.write(make_class_file('p/' + name, name.split('$')[0] + '.java', **kwargs))
+
+    def modify(self, path, content):
+        with open(path, 'w') as fp:
+            fp.write(content)
+        os.utime(path, (self.past + 10, self.past + 10))
+
+    def build_project(self):
+        """A <- B (subclass), B <- C (reference), D independent, K declares constants used by E."""
+        sources = {n: self.source(n) for n in 'ABCDEK'}
+        self.compile('A')
+        self.compile('A$1', references=['p/A'])
+        self.compile('B', superName='p/A')
+        self.compile('C', references=['p/B'])
+        self.compile('D')
+        self.compile('E')
+        self.compile('K', constant=True)
+        graph = incremental.JavaDependencyGraph(os.path.join(self.tmp.name, 'graph.json'))
+        graph.record('key', self.out, self.javafiles)
+        graph.save()
+        return sources
+
+    def plan(self, key='key'):
+        graph = incremental.JavaDependencyGraph(os.path.join(self.tmp.name, 'graph.json'))
+        return graph, graph.plan(key, self.javafiles.keys())
+
+    def test_unchanged(self):
+        self.build_project()
+        _, (work, reason) = self.plan()
+        self.assertIsNone(work)
+        self.assertEqual(reason, 'no source changed')
+        _, (work, _) = self.plan('other')
+        self.assertIsNone(work)
+
+    def test_change_propagates_to_subtypes_and_referrers(self):
+        sources = self.build_project()
+        # Make the project large enough for an incremental compilation to be worthwhile
+        for i in range(10):
+            self.source(f'X{i}')
+            self.compile(f'X{i}')
+        graph = incremental.JavaDependencyGraph(os.path.join(self.tmp.name, 'graph.json'))
+        graph.record('key', self.out, self.javafiles)
+        graph.save()
+
+        self.modify(sources['A'], 'changed')
+        graph, (work, _) = self.plan()
+        self.assertEqual(work.sources, sorted([sources['A'], sources['B'], sources['C']]))
+        self.assertEqual(work.staleClassFiles, ['p/A$1.class', 'p/A.class', 'p/B.class', 'p/C.class'])
+
+        for f in work.staleClassFiles:
+            os.remove(os.path.join(self.out, f))
+        self.compile('A')
+        self.compile('B', superName='p/A')
+        self.compile('C', references=['p/B'])
+        graph.record('key', self.out, self.javafiles, work.sources, work.deletedSources)
+        graph.save()
+        _, (work, reason) = self.plan()
+        self.assertIsNone(work, reason)
+
+        self.modify(sources['C'], 'changed again')
+        _, (work, _) = self.plan()
+        self.assertEqual(work.sources, [sources['C']])
+
+    def test_deleted_source(self):
+        sources = self.build_project()
+        for i in range(10):
+            self.source(f'X{i}')
+            self.compile(f'X{i}')
+        graph = incremental.JavaDependencyGraph(os.path.join(self.tmp.name, 'graph.json'))
+        graph.record('key', self.out, self.javafiles)
+        os.remove(sources['C'])
+        del self.javafiles[sources['C']]
+        work, _ = graph.plan('key', self.javafiles.keys())
+        self.assertEqual(work.sources, [])
+        self.assertEqual(work.deletedSources, [sources['C']])
+        self.assertEqual(work.staleClassFiles, ['p/C.class'])
+
+    def test_constants_require_full_compilation(self):
+        sources = self.build_project()
+        self.modify(sources['K'], 'changed')
+        _, (work, reason) = self.plan()
+        self.assertIsNone(work)
+        self.assertIn('p.K', reason)
+
+    def test_too_many_affected_sources(self):
+        sources = self.build_project()
+        for name in 'ADE':
+            self.modify(sources[name], 'changed')
+        _, (work, reason) = self.plan()
+        self.assertIsNone(work)
+        self.assertIn('sources affected', reason)
+
+
+if __name__ == "__main__":
+    unittest.main()
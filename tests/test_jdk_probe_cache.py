@@ -0,0 +1,112 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+import importlib
+import os
+import pathlib
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+importlib.import_module("mx._impl.mx")
+probe_cache_module = importlib.import_module("mx._impl.mx_jdk_probe_cache")
+JDKProbeCache = probe_cache_module.JDKProbeCache
+
+
+class JDKProbeCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "dotmx", "jdk-probes.json")
+        self.home = os.path.join(self.tmp.name, "jdk")
+        self._write("release", 'JAVA_VERSION="21.0.1"\n')
+        self._write("lib/modules", "modules")
+        self._write("bin/java", "java")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, rel, content, home=None):
+        path = os.path.join(home or self.home, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as fp:
+            fp.write(content)
+        return path
+
+    def test_round_trip(self):
+        cache = JDKProbeCache(self.path, "7.0.0")
+        self.assertIsNone(cache.get(self.home, "version"))
+        cache.put(self.home, "version", ["21.0.1", True])
+        cache.put(self.home, "javacLints", [["cast", "-cast"], False])
+        reloaded = JDKProbeCache(self.path, "7.0.0")
+        self.assertEqual(["21.0.1", True], reloaded.get(self.home, "version"))
+        self.assertEqual([["cast", "-cast"], False], reloaded.get(self.home, "javacLints"))
+
+    def test_changed_jdk_is_stale(self):
+        cache = JDKProbeCache(self.path, "7.0.0")
+        cache.put(self.home, "version", ["21.0.1", True])
+        self._write("release", 'JAVA_VERSION="21.0.10"\n')
+        self.assertIsNone(JDKProbeCache(self.path, "7.0.0").get(self.home, "version"))
+        self.assertIsNone(cache.get(self.home, "version"))
+
+    def test_stale_entry_is_replaced(self):
+        cache = JDKProbeCache(self.path, "7.0.0")
+        cache.put(self.home, "version", ["21.0.1", True])
+        self._write("lib/modules", "updated modules")
+        cache.put(self.home, "modules", ["module java.base"])
+        reloaded = JDKProbeCache(self.path, "7.0.0")
+        self.assertIsNone(reloaded.get(self.home, "version"))
+        self.assertEqual(["module java.base"], reloaded.get(self.home, "modules"))
+
+    def test_other_mx_version_is_stale(self):
+        JDKProbeCache(self.path, "7.0.0").put(self.home, "version", ["21.0.1", True])
+        self.assertIsNone(JDKProbeCache(self.path, "7.0.1").get(self.home, "version"))
+
+    def test_corrupt_file_is_ignored(self):
+        self._write(os.path.basename(self.path), "{not json", home=os.path.dirname(self.path))
+        cache = JDKProbeCache(self.path, "7.0.0")
+        self.assertIsNone(cache.get(self.home, "version"))
+        cache.put(self.home, "version", ["21.0.1", True])
+        self.assertEqual(["21.0.1", True], JDKProbeCache(self.path, "7.0.0").get(self.home, "version"))
+
+    def test_concurrent_writers_are_merged(self):
+        otherHome = os.path.join(self.tmp.name, "other-jdk")
+        self._write("release", 'JAVA_VERSION="17.0.9"\n', home=otherHome)
+        first = JDKProbeCache(self.path, "7.0.0")
+        second = JDKProbeCache(self.path, "7.0.0")
+        first.put(self.home, "version", ["21.0.1", True])
+        second.put(otherHome, "version", ["17.0.9", True])
+        second.put(self.home, "modules", ["module java.base"])
+        reloaded = JDKProbeCache(self.path, "7.0.0")
+        self.assertEqual(["21.0.1", True], reloaded.get(self.home, "version"))
+        self.assertEqual(["module java.base"], reloaded.get(self.home, "modules"))
+        self.assertEqual(["17.0.9", True], reloaded.get(otherHome, "version"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+import importlib
+import os
+import pathlib
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+mx = importlib.import_module("mx._impl.mx")
+
+
+class _DiscoveredSuite:
+    def __init__(self, name, imports=(), **suiteDict):
+        self.name = name
+        self.suite_imports = [mx.SuiteImport(i, version=None, urlinfos=None) for i in imports]
+        self._preloaded_suite_dict = suiteDict
+
+    def _get_early_suite_dict_property(self, name, default=None):
+        return self._preloaded_suite_dict.get(name, default)
+
+
+class LazySuitesTest(unittest.TestCase):
+    def setUp(self):
+        suites = [
+            _DiscoveredSuite("vm", ["compiler", "truffle"], distributions={"VM": {}}),
+            _DiscoveredSuite("compiler", ["truffle"], projects={"org.graalvm.compiler": {}}, distributions={"GRAAL": {}}),
+            _DiscoveredSuite("truffle", ["sdk"], distributions={"TRUFFLE_API": {}}),
+            _DiscoveredSuite("sdk", libraries={"JLINE": {}}, distributions={"GRAAL_SDK": {}}),
+        ]
+        self.discovered = {s.name: s for s in suites}
+
+    def test_closure_contains_defining_suites_and_their_imports(self):
+        self.assertEqual({"sdk"}, mx._lazy_suite_closure(self.discovered, ["GRAAL_SDK"], "sdk"))
+        self.assertEqual({"sdk"}, mx._lazy_suite_closure(self.discovered, ["JLINE"], "sdk"))
+        self.assertEqual({"truffle", "sdk"}, mx._lazy_suite_closure(self.discovered, ["TRUFFLE_API", "GRAAL_SDK"], "sdk"))
+        self.assertEqual({"compiler", "truffle", "sdk"}, mx._lazy_suite_closure(self.discovered, ["org.graalvm.compiler"], "sdk"))
+        self.assertEqual({"truffle", "sdk"}, mx._lazy_suite_closure(self.discovered, ["truffle:TRUFFLE_API"], "sdk"))
+
+    def test_closure_contains_primary_suite(self):
+        self.assertEqual({"truffle", "sdk"}, mx._lazy_suite_closure(self.discovered, ["JLINE"], "truffle"))
+        self.assertEqual({"truffle", "sdk"}, mx._lazy_suite_closure(self.discovered, [], "truffle"))
+
+    def test_unknown_root_loads_all_suites(self):
+        self.assertIsNone(mx._lazy_suite_closure(self.discovered, ["GRAAL_SDK", "DYNAMIC_DIST"], "sdk"))
+
+    def test_deferred_suite_is_loaded_by_its_own_load(self):
+        deferred = mock.Mock(suite_imports=[])
+        deferred.name = "binary"
+        with mock.patch.dict(mx._lazy_suites, {"binary": deferred}), \
+                mock.patch.object(mx, "_register_suite"), mock.patch.object(mx, "_post_init_suites"):
+            self.assertEqual([deferred], mx._load_lazy_suites(["binary"]))
+        # Suite._load is overridden by BinarySuite to load its distributions
+        deferred._load.assert_called_once_with(parse_env=False)
+
+    def test_command_roots(self):
+        self.assertEqual(["GRAAL_SDK"], mx._show_paths_roots(["--output", "GRAAL_SDK"]))
+        self.assertEqual(["sdk:GRAAL_SDK"], mx._show_paths_roots(["sdk:GRAAL_SDK/*.jar"]))
+        self.assertIsNone(mx._show_paths_roots(["<jdk_base>"]))
+        self.assertEqual(["GRAAL", "TRUFFLE_API"], mx._classpath_cli_roots(["--lines", "GRAAL", "TRUFFLE_API"]))
+
+    def test_lazy_loading_is_opt_in(self):
+        with mock.patch.dict(os.environ, {"MX_LAZY_SUITES": "false"}):
+            self.assertIsNone(mx._lazy_suite_roots(["paths", "GRAAL_SDK"]))
+        with mock.patch.dict(os.environ, {"MX_LAZY_SUITES": "true"}):
+            self.assertEqual(["GRAAL_SDK"], mx._lazy_suite_roots(["paths", "GRAAL_SDK"]))
+            self.assertIsNone(mx._lazy_suite_roots(["build", "--dependencies", "GRAAL_SDK"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
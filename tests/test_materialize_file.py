@@ -0,0 +1,99 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+import errno
+import importlib
+import os
+import pathlib
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+importlib.import_module("mx._impl.mx")
+util_module = importlib.import_module("mx._impl.mx_util")
+materialize_file = util_module.materialize_file
+
+
+class MaterializeFileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = self._write("src.jar", b"content")
+        os.chmod(self.src, 0o755)
+        self.dst = os.path.join(self.tmp.name, "dst.jar")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as fp:
+            fp.write(content)
+        return path
+
+    def _read(self, path):
+        with open(path, "rb") as fp:
+            return fp.read()
+
+    def _leftovers(self):
+        return sorted(set(os.listdir(self.tmp.name)) - {"src.jar", "dst.jar"})
+
+    def test_link(self):
+        strategy = materialize_file(self.src, self.dst)
+        self.assertIn(strategy, ("reflink", "hardlink"))
+        self.assertEqual(b"content", self._read(self.dst))
+        self.assertEqual(strategy == "hardlink", os.path.samefile(self.src, self.dst))
+        self.assertEqual([], self._leftovers())
+
+    def test_without_hardlink(self):
+        self._write("dst.jar", b"old")
+        strategy = materialize_file(self.src, self.dst, hardlink=False)
+        self.assertIn(strategy, ("reflink", "copy"))
+        self.assertFalse(os.path.samefile(self.src, self.dst))
+        self.assertEqual(b"content", self._read(self.dst))
+        self.assertEqual(0o755, stat.S_IMODE(os.stat(self.dst).st_mode))
+
+    def test_copy_across_file_systems(self):
+        with mock.patch.object(util_module, "_reflink", return_value=False), \
+             mock.patch.object(os, "link", side_effect=OSError(errno.EXDEV, "Invalid cross-device link")):
+            self.assertEqual("copy", materialize_file(self.src, self.dst))
+        self.assertEqual(b"content", self._read(self.dst))
+        self.assertEqual(0o755, stat.S_IMODE(os.stat(self.dst).st_mode))
+
+    def test_failure_leaves_no_temporary_file(self):
+        with mock.patch.object(util_module, "_reflink", return_value=False), \
+             mock.patch.object(os, "link", side_effect=OSError(errno.ENOENT, "No such file")):
+            with self.assertRaises(OSError):
+                materialize_file(self.src, self.dst)
+        self.assertEqual([], self._leftovers())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,319 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+import importlib
+import io
+import os
+import pathlib
+import sys
+import tempfile
+import types
+import unittest
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+mx = importlib.import_module("mx._impl.mx")
+rawzip = importlib.import_module("mx._impl.build.rawzip")
+mx_jardistribution = importlib.import_module("mx._impl.mx_jardistribution")
+fileindex_module = importlib.import_module("mx._impl.build.fileindex")
+
+
+class RawZipTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(fileindex_module, "RACY_WINDOW_NS", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_copy_entries_raw(self):
+        source, target = self._path("source.jar"), self._path("target.jar")
+        contents = {"a/A.class": b"A" * 10000, "b/B.txt": os.urandom(1000), "empty": b""}
+        with zipfile.ZipFile(source, "w") as zf:
+            zf.writestr(zipfile.ZipInfo("a/A.class"), contents["a/A.class"], compress_type=zipfile.ZIP_DEFLATED)
+            zf.writestr(zipfile.ZipInfo("b/B.txt"), contents["b/B.txt"], compress_type=zipfile.ZIP_STORED)
+            zf.writestr(zipfile.ZipInfo("empty"), b"")
+
+        with rawzip.RawZipReader(source) as reader, zipfile.ZipFile(target, "w") as zf:
+            zf.writestr("first", b"written normally", compress_type=zipfile.ZIP_DEFLATED)
+            for info in reader.infolist():
+                reader.copy_to(info, zf, date_time=(2000, 1, 1, 0, 0, 0))
+            zf.writestr("last", b"written normally")
+
+        with zipfile.ZipFile(target) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(["first", "a/A.class", "b/B.txt", "empty", "last"], zf.namelist())
+            for name, data in contents.items():
+                self.assertEqual(data, zf.read(name))
+                self.assertEqual((2000, 1, 1, 0, 0, 0), zf.getinfo(name).date_time)
+            self.assertEqual(zipfile.ZIP_DEFLATED, zf.getinfo("a/A.class").compress_type)
+            self.assertEqual(zipfile.ZIP_STORED, zf.getinfo("b/B.txt").compress_type)
+
+    def test_incremental_archive(self):
+        jar = self._path("dist.jar")
+        executor = ThreadPoolExecutor(4)
+        self.addCleanup(executor.shutdown)
+        patcher = mock.patch.object(mx, "_archive_executor", return_value=executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        def build(files):
+            archive = mx_jardistribution._Archive(None, jar, False, zipfile.ZIP_DEFLATED)
+            archive.clean()
+            for name, data in files.items():
+                staged = os.path.join(archive.staging_dir, name)
+                os.makedirs(os.path.dirname(staged), exist_ok=True)
+                if not os.path.exists(staged) or open(staged, "rb").read() != data:
+                    with open(staged, "wb") as fp:
+                        fp.write(data)
+                archive.entries[name] = mx_jardistribution._ArchiveEntry(None, name, archive, staged)
+            compressed = []
+            original = mx_jardistribution.deflate_entry
+
+            def deflate_entry(info, data):
+                compressed.append(info.filename)
+                return original(info, data)
+
+            with mock.patch.object(mx_jardistribution, "deflate_entry", deflate_entry):
+                archive.finalize_archive_or_directory({"Main-Class": "p.Main"})
+            archive.save_states()
+            with zipfile.ZipFile(jar) as zf:
+                self.assertIsNone(zf.testzip())
+                for name, data in files.items():
+                    self.assertEqual(data, zf.read(name))
+            self.assertFalse(os.path.exists(jar + ".previous"))
+            return sorted(compressed)
+
+        files = {"p/Main.class": b"main" * 100, "p/Util.class": b"util" * 100}
+        self.assertEqual(["p/Main.class", "p/Util.class"], build(files))
+        files["p/Util.class"] = b"changed" * 100
+        files["q/New.class"] = b"new"
+        self.assertEqual(["p/Util.class", "q/New.class"], build(files))
+        del files["q/New.class"]
+        self.assertEqual([], build(files))
+
+        # A jar that was modified after it was built is not reused
+        with zipfile.ZipFile(jar, "a") as zf:
+            zf.writestr("extra", b"")
+        self.assertEqual(["p/Main.class", "p/Util.class"], build(files))
+
+
+    def test_racy_entries_are_not_reused(self):
+        jar = self._path("dist.jar")
+
+        def build():
+            archive = mx_jardistribution._Archive(None, jar, False, zipfile.ZIP_DEFLATED)
+            archive.clean()
+            staged = os.path.join(archive.staging_dir, "A.class")
+            if not os.path.exists(staged):
+                with open(staged, "wb") as fp:
+                    fp.write(b"A" * 100)
+            archive.entries["A.class"] = mx_jardistribution._ArchiveEntry(None, "A.class", archive, staged)
+            with mock.patch.object(mx, "_archive_executor", return_value=None), \
+                    mock.patch.object(mx_jardistribution, "deflate_entry", wraps=mx_jardistribution.deflate_entry) as deflate_entry:
+                archive.finalize_archive_or_directory(None)
+            archive.save_states()
+            return deflate_entry.call_count
+
+        with mock.patch.object(fileindex_module, "RACY_WINDOW_NS", 60 * 1000 * 1000 * 1000):
+            self.assertEqual(1, build())
+            # The staged file could have been rewritten with the same size and mtime
+            self.assertEqual(1, build())
+
+    def test_module_jar_entries_are_reused(self):
+        jar = self._path("dist.jar")
+        files = {"p/Main.class": b"main" * 100, "p/Util.class": b"util" * 100}
+        dist = types.SimpleNamespace(
+            suite=types.SimpleNamespace(get_output_root=lambda *args: self._path("latest")),
+            original_path=lambda: jar, sourcesPath=jar, compress=True,
+            _is_exploded=lambda: False, _config_save_file=lambda: jar + ".json", _config_as_json=lambda: "{}",
+            notify_updated=lambda: None, _compliance_for_build=lambda: mx.JavaCompliance("17"), is_stripped=lambda: False)
+
+        def stage(bin_archive, src_archive, exploded):
+            for name, data in files.items():
+                staged = os.path.join(bin_archive.staging_dir, name)
+                os.makedirs(os.path.dirname(staged), exist_ok=True)
+                if not os.path.exists(staged) or open(staged, "rb").read() != data:
+                    with open(staged, "wb") as fp:
+                        fp.write(data)
+                bin_archive.entries[name] = mx_jardistribution._ArchiveEntry(None, name, bin_archive, staged)
+            bin_archive.finalize_archive_or_directory(None)
+            return types.SimpleNamespace(bin_archive=bin_archive)
+
+        def make_java_module(dist, jdk, archive, javac_daemon=None):
+            # Like mx_javamodules.make_java_module, append the module descriptor to the finished jar
+            with zipfile.ZipFile(archive.path, "a") as zf:
+                zf.writestr("module-info.class", b"module")
+
+        def build():
+            with mock.patch.object(mx, "_archive_executor", return_value=None), \
+                    mock.patch.object(mx, "get_jdk"), \
+                    mock.patch.object(mx_jardistribution, "_ArchiveStager", stage), \
+                    mock.patch.object(mx_jardistribution.mx_javamodules, "make_java_module", make_java_module), \
+                    mock.patch.object(mx_jardistribution, "deflate_entry", wraps=mx_jardistribution.deflate_entry) as deflate_entry:
+                mx_jardistribution.JARDistribution.make_archive(dist)
+            with zipfile.ZipFile(jar) as zf:
+                self.assertIsNone(zf.testzip())
+                self.assertEqual(["p/Main.class", "p/Util.class", "module-info.class"], zf.namelist())
+            return sorted(call.args[0].filename for call in deflate_entry.call_args_list)
+
+        self.assertEqual(["p/Main.class", "p/Util.class"], build())
+        files["p/Util.class"] = b"changed" * 100
+        self.assertEqual(["p/Util.class"], build())
+        self.assertEqual([], build())
+
+    def test_library_entries_are_copied(self):
+        library, jar = self._path("library.jar"), self._path("dist.jar")
+        with zipfile.ZipFile(library, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("lib/Lib.class", b"lib" * 1000)
+            zf.writestr("lib/data.txt", b"data")
+        archive = mx_jardistribution._Archive(None, jar, False, zipfile.ZIP_DEFLATED)
+        staged = os.path.join(archive.staging_dir, "p", "Main.class")
+        os.makedirs(os.path.dirname(staged))
+        with open(staged, "wb") as fp:
+            fp.write(b"main")
+        archive.entries["p/Main.class"] = mx_jardistribution._ArchiveEntry(None, "p/Main.class", archive, staged)
+        for name in ("lib/Lib.class", "lib/data.txt"):
+            entry = mx_jardistribution._ArchiveEntry(None, name, archive, library + "!" + name)
+            entry.raw = True
+            archive.entries[name] = entry
+        # A file extracted by a previous build is removed from the staging directory
+        os.makedirs(os.path.join(archive.staging_dir, "lib"))
+        with open(os.path.join(archive.staging_dir, "lib", "data.txt"), "wb") as fp:
+            fp.write(b"stale")
+
+        with mock.patch.object(mx, "_archive_executor", return_value=None), \
+                mock.patch.object(mx_jardistribution, "deflate_entry", wraps=mx_jardistribution.deflate_entry) as deflate_entry:
+            archive.finalize_archive_or_directory(None)
+        self.assertEqual(["p/Main.class"], [call.args[0].filename for call in deflate_entry.call_args_list])
+        self.assertFalse(os.path.exists(os.path.join(archive.staging_dir, "lib")))
+        with zipfile.ZipFile(jar) as zf, zipfile.ZipFile(library) as lib:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(["p/Main.class", "lib/Lib.class", "lib/data.txt"], zf.namelist())
+            for name in ("lib/Lib.class", "lib/data.txt"):
+                self.assertEqual(lib.read(name), zf.read(name))
+                self.assertEqual(lib.getinfo(name).date_time, zf.getinfo(name).date_time)
+
+
+    def test_large_files_are_streamed(self):
+        jar = self._path("dist.jar")
+        archive = mx_jardistribution._Archive(None, jar, False, zipfile.ZIP_DEFLATED)
+        contents = {"small.txt": b"small", "large.bin": os.urandom(1000) * 1000}
+        for name, data in contents.items():
+            staged = os.path.join(archive.staging_dir, name)
+            with open(staged, "wb") as fp:
+                fp.write(data)
+            archive.entries[name] = mx_jardistribution._ArchiveEntry(None, name, archive, staged)
+
+        with mock.patch.object(mx, "_archive_executor", return_value=None), \
+                mock.patch.object(mx_jardistribution, "deflate_entry", wraps=mx_jardistribution.deflate_entry) as deflate_entry:
+            archive.finalize_archive_or_directory(None)
+        self.assertEqual(["small.txt"], [call.args[0].filename for call in deflate_entry.call_args_list])
+
+        # The jar is the same as one created by ZipFile.writestr
+        expected = io.BytesIO()
+        with zipfile.ZipFile(jar) as zf, zipfile.ZipFile(expected, "w") as out:
+            self.assertIsNone(zf.testzip())
+            for info in zf.infolist():
+                self.assertEqual(contents[info.filename], zf.read(info))
+                copy = zipfile.ZipInfo(info.filename, info.date_time)
+                copy.compress_type = info.compress_type
+                copy.external_attr = info.external_attr
+                out.writestr(copy, zf.read(info))
+        with open(jar, "rb") as fp:
+            self.assertEqual(expected.getvalue(), fp.read())
+
+    def test_contents_suppliers(self):
+        path, library = self._path("file.txt"), self._path("library.jar")
+        with open(path, "wb") as fp:
+            fp.write(b"file")
+        with zipfile.ZipFile(library, "w") as zf:
+            zf.writestr("entry.txt", b"entry")
+        with zipfile.ZipFile(library) as zf:
+            suppliers = [
+                (mx_jardistribution._FileContentsSupplier(path), b"file"),
+                (mx_jardistribution._JarEntryContentsSupplier(zf, zf.getinfo("entry.txt")), b"entry"),
+            ]
+            for supplier, expected in suppliers:
+                with supplier.open() as stream:
+                    self.assertEqual(expected, stream.read())
+                self.assertIsNone(supplier.contents)
+                self.assertEqual(expected, supplier())
+                with supplier.open() as stream:
+                    self.assertEqual(expected, stream.read())
+
+
+    def test_stage_libraries_in_parallel(self):
+        def library(name, compression, entries):
+            jar = self._path(name + ".jar")
+            with zipfile.ZipFile(jar, "w", compression=compression) as zf:
+                for arcname, data in entries.items():
+                    zf.writestr(arcname, data)
+            return types.SimpleNamespace(name=name, theLicense=None, optional=False,
+                                         isLibrary=lambda: True, isJARDistribution=lambda: False, isJavaProject=lambda: False,
+                                         get_path=lambda resolve: jar, get_source_path=lambda resolve: None)
+
+        deflated = {f"a/A{i}.class": b"A" * i for i in range(50)}
+        stored = {f"b/B{i}.class": b"B" * i for i in range(50)}
+        common = {"common.txt": b"common", "META-INF/services/p.Service": b"p.Impl\n"}
+        deps = [library("a", zipfile.ZIP_DEFLATED, {**deflated, **common}), library("b", zipfile.ZIP_STORED, {**stored, **common})]
+        jar = self._path("dist.jar")
+        dist = types.SimpleNamespace(name="DIST", archiveparticipants=[], manifestEntries={}, suite=types.SimpleNamespace(),
+                                     mainClass=None, maven=False, theLicense=None, original_path=lambda: jar, archived_deps=lambda: deps)
+        bin_archive = mx_jardistribution._Archive(dist, jar, False, zipfile.ZIP_DEFLATED)
+        src_archive = mx_jardistribution._Archive(dist, self._path("dist.src.zip"), False, zipfile.ZIP_DEFLATED)
+        executor = ThreadPoolExecutor(4)
+        self.addCleanup(executor.shutdown)
+        with mock.patch.object(mx, "_archive_executor", return_value=executor), \
+                mock.patch.object(mx, "logv"), \
+                mock.patch.object(mx_jardistribution.mx_javamodules, "get_module_name", return_value=None):
+            mx_jardistribution._ArchiveStager(bin_archive, src_archive, False)
+
+        # Only the entries with a different compression method than the archive are staged
+        staged = sorted(os.path.relpath(os.path.join(root, f), bin_archive.staging_dir).replace(os.sep, "/")
+                        for root, _, files in os.walk(bin_archive.staging_dir) for f in files if f != bin_archive.jdk_8268216)
+        self.assertEqual(sorted(list(stored) + ["META-INF/services/p.Service"]), staged)
+        self.assertEqual({}, bin_archive.pending)
+        with zipfile.ZipFile(jar) as zf:
+            self.assertIsNone(zf.testzip())
+            for arcname, data in {**deflated, **stored, "common.txt": b"common"}.items():
+                self.assertEqual(data, zf.read(arcname))
+            self.assertEqual(b"p.Impl\n", zf.read("META-INF/services/p.Service"))
+            self.assertEqual(zipfile.ZIP_DEFLATED, zf.getinfo("b/B10.class").compress_type)
+            # The entry of the first library is used
+            self.assertEqual(os.path.join(self.tmp.name, "a.jar") + "!common.txt", bin_archive.entries["common.txt"].origin)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+
+import importlib
+import pathlib
+import sys
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+importlib.import_module("mx._impl.mx")
+parser = importlib.import_module("mx._impl.mx_suite_parser")
+
+_SUITE_PY = '''#
+# A comment with 'quotes' and "more quotes"
+#
+"""A docstring."""
+suite = {
+  "mxversion": "7.0.0",
+  "name": 'test', # trailing comment with a # in it
+  "url": "https://example.com/#anchor",
+  "description": """multi
+line""",
+  'escapes': "tab\\tquote\\"",
+  "numbers": [0, -1, 2.5, 1e3,],
+  "flags": {"a": True, "b": False},
+  "empty": {},
+}
+other = []
+'''
+
+
+class SuiteParserTest(unittest.TestCase):
+    def _python(self, content):
+        namespace = {}
+        exec(compile(content, "suite.py", "exec"), namespace)  # pylint: disable=exec-used
+        return namespace
+
+    def test_parse_matches_python(self):
+        variables = parser.parse_suite_file(_SUITE_PY)
+        python = self._python(_SUITE_PY)
+        self.assertEqual(python["suite"], variables["suite"])
+        self.assertEqual(python["other"], variables["other"])
+        self.assertEqual(parser.parse_suite_value(_SUITE_PY), variables["suite"])
+
+    def test_python_statements_are_rejected(self):
+        for content in [
+            "import os\nsuite = {}\n",
+            "suite = {'a': 'b' + 'c'}\n",
+            "suite = {'a': 'b' 'c'}\n",
+            "suite = {'a': None}\n",
+            "suite = {'a': ('b',)}\n",
+            "suite = {1: 'b'}\n",
+            "suite = {'a': r'b'}\n",
+            "suite = {} ; x = 1\n",
+            "suite = {'a': [1, 2}\n",
+            "  suite = {}\n",
+        ]:
+            with self.assertRaises(parser.SuiteFileSyntaxError, msg=content):
+                parser.parse_suite_file(content)
+
+    def test_value_is_parsed_when_file_has_other_statements(self):
+        content = "import os\n\nsuite = {\n  'a': [True],\n}\nprint(suite)\n"
+        self.assertEqual({"a": [True]}, parser.parse_suite_value(content))
+        self.assertIsNone(parser.parse_suite_value("other = {}\n"))
+
+    def test_error_location(self):
+        with self.assertRaises(parser.SuiteFileSyntaxError) as cm:
+            parser.parse_suite_value("suite = {\n  'a': 'b',\n  'c': len('d'),\n}\n")
+        self.assertEqual((3, 8), (cm.exception.line, cm.exception.column))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+#
+# ----------------------------------------------------------------------------------------------------
+#
+# Copyright (c) 2026, Oracle and/or its affiliates. All rights reserved.
+# DO NOT ALTER OR REMOVE COPYRIGHT NOTICES OR THIS FILE HEADER.
+#
+# This code is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 only, as
+# published by the Free Software Foundation.
+#
+# This code is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# version 2 for more details (a copy is included in the LICENSE file that
+# accompanied this code).
+#
+# You should have received a copy of the GNU General Public License version
+# 2 along with this work; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Please contact Oracle, 500 Oracle Parkway, Redwood Shores, CA 94065 USA
+# or visit www.oracle.com if you need additional information or have any
+# questions.
+#
+# ----------------------------------------------------------------------------------------------------
+#
+
+import importlib
+import os
+import pathlib
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+importlib.import_module("mx._impl.mx")
+snapshot_module = importlib.import_module("mx._impl.mx_suite_snapshot")
+SuiteFileSnapshot = snapshot_module.SuiteFileSnapshot
+
+
+class SuiteFileSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "snapshots", "suite.json")
+        self.suitePy = self._write("mx.test/suite.py", 'suite = {"name": "test"}\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, relPath, content, age=10):
+        path = os.path.join(self.tmp.name, relPath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as fp:
+            fp.write(content)
+        t = os.stat(path).st_mtime - age
+        os.utime(path, (t, t))
+        return path
+
+    def test_suite_dict_is_reused_while_file_is_unchanged(self):
+        snapshot = SuiteFileSnapshot(self.path)
+        self.assertIsNone(snapshot.suite_dict(self.suitePy))
+        snapshot.record_suite_dict(self.suitePy, snapshot.file_digest(self.suitePy), {"name": "test", "x": ["${FOO}/a"]}, True, None)
+        snapshot.save()
+
+        snapshot = SuiteFileSnapshot(self.path)
+        self.assertEqual(({"name": "test", "x": ["${FOO}/a"]}, True, None), snapshot.suite_dict(self.suitePy))
+        self.assertEqual(["FOO"], snapshot.referenced_env_vars([self.suitePy]))
+
+        # every lookup returns a fresh copy that may be expanded in place
+        snapshot.suite_dict(self.suitePy)[0]["x"].append("y")
+        self.assertEqual(["${FOO}/a"], snapshot.suite_dict(self.suitePy)[0]["x"])
+
+        self._write("mx.test/suite.py", 'suite = {"name": "test2"}\n')
+        self.assertIsNone(snapshot.suite_dict(self.suitePy))
+
+    def test_imported_suite_dict_is_not_recorded(self):
+        snapshot = SuiteFileSnapshot(self.path)
+        digest = snapshot.file_digest(self.suitePy)
+        snapshot.record_suite_dict(self.suitePy, digest, {"name": "test"}, False, "bad")
+        self.assertIsNone(snapshot.suite_dict(self.suitePy))
+        snapshot.record_suite_dict(self.suitePy, digest, {"name": "test", "x": ("a", "b")}, True, None)
+        self.assertIsNone(snapshot.suite_dict(self.suitePy))
+
+    def test_touched_file_is_rehashed(self):
+        snapshot = SuiteFileSnapshot(self.path)
+        snapshot.record_suite_dict(self.suitePy, snapshot.file_digest(self.suitePy), {"name": "test"}, True, None)
+        t = os.stat(self.suitePy).st_mtime - 5
+        os.utime(self.suitePy, (t, t))
+        self.assertEqual(({"name": "test"}, True, None), snapshot.suite_dict(self.suitePy))
+
+    def test_racy_files_are_not_cached(self):
+        snapshot = SuiteFileSnapshot(self.path)
+        path = self._write("mx.test/mx_test.py", "pass\n", age=0)
+        digest = snapshot.file_digest(path)
+        self.assertNotIn(path, snapshot._files)
+        self.assertEqual(digest, snapshot.file_digest(path))
+
+    def test_graph_key(self):
+        snapshot = SuiteFileSnapshot(self.path)
+        env = self._write("mx.test/env", "A=1\n")
+        files = [self.suitePy, env, os.path.join(self.tmp.name, "mx.test", "missing.py")]
+        key = snapshot.graph_key(files, "7.0.0", {"MX_X": "1"})
+        self.assertEqual(key, snapshot.graph_key(list(reversed(files)), "7.0.0", {"MX_X": "1"}))
+        self.assertNotEqual(key, snapshot.graph_key(files, "7.0.1", {"MX_X": "1"}))
+        self.assertNotEqual(key, snapshot.graph_key(files, "7.0.0", {"MX_X": None}))
+        self._write("mx.test/env", "A=2\n")
+        self.assertNotEqual(key, snapshot.graph_key(files, "7.0.0", {"MX_X": "1"}))
+
+    def test_acyclic_graph_is_persisted(self):
+        snapshot = SuiteFileSnapshot(self.path)
+        self.assertFalse(snapshot.is_acyclic("k1"))
+        snapshot.record_acyclic("k1")
+        snapshot.save()
+        snapshot = SuiteFileSnapshot(self.path)
+        self.assertTrue(snapshot.is_acyclic("k1"))
+        self.assertFalse(snapshot.is_acyclic("k2"))
+
+    def test_corrupt_snapshot_is_ignored(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as fp:
+            fp.write('{"version": 1, "files": [')
+        snapshot = SuiteFileSnapshot(self.path)
+        self.assertIsNone(snapshot.suite_dict(self.suitePy))
+        self.assertFalse(snapshot.is_acyclic("k1"))
+
+
+if __name__ == "__main__":
+    unittest.main()